@@ -0,0 +1,52 @@
+"""
+Compares Arc construction one by one with ArcBatch.
+
+    python -m benchmark.bench_arc_batch
+"""
+import math
+import random
+import timeit
+
+from ex02.geometry import Arc, ArcBatch, Point
+
+
+def random_arcs(size):
+    """Arcs turning at the waypoints of a random route"""
+    starts, ends, start_tangents = [], [], []
+    for _ in range(size):
+        center = Point(random.uniform(-1e3, 1e3), random.uniform(-1e3, 1e3))
+        radius = random.uniform(1, 10)
+        a0 = random.uniform(0, 2 * math.pi)
+        a1 = a0 + random.uniform(0.1, math.pi)
+        start = Point(center.x + radius * math.cos(a0), center.y + radius * math.sin(a0))
+        starts.append(start)
+        ends.append(Point(center.x + radius * math.cos(a1), center.y + radius * math.sin(a1)))
+        start_tangents.append((start - center).normal())
+    return starts, ends, start_tangents
+
+
+def build_one_by_one(starts, ends, start_tangents):
+    arcs = []
+    for arc in zip(starts, ends, start_tangents):
+        try:
+            arcs.append(Arc(*arc))
+        except (ValueError, AssertionError, ZeroDivisionError):
+            arcs.append(None)
+    return arcs
+
+
+def run(size=100_000, repeat=3):
+    starts, ends, start_tangents = random_arcs(size)
+
+    t_arc = min(timeit.repeat(lambda: build_one_by_one(starts, ends, start_tangents),
+                              number=1, repeat=repeat))
+    t_batch = min(timeit.repeat(lambda: ArcBatch(starts, ends, start_tangents), number=1, repeat=repeat))
+    batch = ArcBatch(starts, ends, start_tangents)
+    arcs = build_one_by_one(starts, ends, start_tangents)
+
+    print(f'{size} arcs, valid: Arc {sum(a is not None for a in arcs)} ArcBatch {int(batch.valid.sum())}')
+    print(f'  Arc {t_arc:.4f}s  ArcBatch {t_batch:.4f}s  x{t_arc / t_batch:.1f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,63 @@
+"""
+Latency of status queries sent to an AsyncTransmitter while the robot moves.
+
+    python -m benchmark.bench_async_transmitter
+"""
+import asyncio
+import statistics
+import time
+
+from ex02.robot import Robot, AsyncTransmitter, MotionController, Navigator, Arranger, Wheel, EnergySupplier
+from ex02.telecom import Telecom, Command
+
+
+def build_robot():
+    return Robot(transmitter=AsyncTransmitter(),
+                 motion_controller=MotionController(Wheel(), Wheel(), {}),
+                 navigator=Navigator(Arranger()),
+                 energy_supplier=EnergySupplier(quantity=1e9))
+
+
+async def query(robot, latencies):
+    start = time.perf_counter()
+    tm = await robot.exchange(Telecom(command=Command.READY_FOR_LOADING))
+    latencies.append(time.perf_counter() - start)
+    return tm.command
+
+
+async def scenario(clients):
+    robot = build_robot()
+    positions = [(0, 0), (500, 0), (500, 500), (0, 500), (0, 0)]
+    await robot.exchange(Telecom(command=Command.LOADING, payload=positions))
+
+    start = time.perf_counter()
+    move = asyncio.create_task(robot.exchange(Telecom(command=Command.MOVE)))
+    await asyncio.sleep(0)
+
+    latencies = []
+
+    async def client():
+        answers = []
+        while not move.done():
+            answers.append(await query(robot, latencies))
+            await asyncio.sleep(0)
+        return answers
+
+    answers = await asyncio.gather(*[client() for _ in range(clients)])
+    moved = await move
+    duration = time.perf_counter() - start
+    moving = sum(a == Command.MOVING for client_answers in answers for a in client_answers)
+    return moved.command, duration, latencies, moving
+
+
+def run(clients=50):
+    moved, duration, latencies, moving = asyncio.run(scenario(clients))
+    latencies.sort()
+    print(f'route answered {moved.name} in {duration:.3f}s')
+    print(f'{clients} clients, {len(latencies)} status queries during the move, {moving} answered MOVING')
+    print(f'  latency median {statistics.median(latencies) * 1e6:.0f}us  '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f}us  max {latencies[-1] * 1e6:.0f}us')
+
+
+if __name__ == '__main__':
+    run()
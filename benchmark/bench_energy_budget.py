@@ -0,0 +1,37 @@
+"""
+Energy budget check of positions: MotionController.find_unreachable_position
+against computing motions and their total distance.
+
+    python -m benchmark.bench_energy_budget
+"""
+import time
+
+import numpy as np
+
+from ex02.robot import MotionController, Navigator, Arranger, EnergySupplier, Wheel
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(size=200_000):
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(-100, 100, size=(size, 2))
+    positions = xy.tolist()
+    motion_controller = MotionController(Wheel(), Wheel(), {})
+    navigator = Navigator(Arranger())
+
+    motions, t_motions = timed(navigator.compute_motions, xy)
+    print(f'{size} positions, motions and distance {t_motions:.3f}s')
+    for budget in (1e3, 1e6, 1e9):
+        supplier = EnergySupplier(budget)
+        index, t_array = timed(motion_controller.find_unreachable_position, xy, supplier)
+        _, t_list = timed(motion_controller.find_unreachable_position, positions, supplier)
+        print(f'budget {budget:8.0e} unreachable {str(index):>7}  array {t_array:.4f}s  list {t_list:.4f}s')
+
+
+if __name__ == '__main__':
+    run()
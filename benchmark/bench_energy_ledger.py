@@ -0,0 +1,39 @@
+"""
+Energy consumption per time step with and without EnergyLedger, and ledger queries.
+
+    python -m benchmark.bench_energy_ledger
+"""
+import time
+
+import numpy as np
+
+from ex02.ledger import EnergyLedger
+from ex02.robot import EnergySupplier
+
+
+def consume(supplier, motions, steps):
+    for m in range(motions):
+        supplier.start_motion(float(m))
+        for s in range(steps):
+            supplier.consume(0.01)
+
+
+def run(motions=10_000, steps=100, queries=100_000):
+    for ledger in (None, EnergyLedger(capacity=motions)):
+        supplier = EnergySupplier(1e9, ledger=ledger)
+        start = time.perf_counter()
+        consume(supplier, motions, steps)
+        elapsed = time.perf_counter() - start
+        print(f'ledger={ledger is not None!s:5} {motions * steps} debits {elapsed:.2f}s')
+
+    rng = np.random.default_rng(0)
+    windows = np.sort(rng.uniform(0, motions, size=(queries, 2)), axis=1).tolist()
+    start = time.perf_counter()
+    for begin, end in windows:
+        ledger.consumed_between(begin, end)
+    elapsed = time.perf_counter() - start
+    print(f'{queries} time window queries {elapsed:.2f}s ({elapsed / queries * 1e6:.1f}us per query)')
+
+
+if __name__ == '__main__':
+    run()
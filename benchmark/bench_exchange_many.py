@@ -0,0 +1,32 @@
+"""
+Robot.exchange_many against Robot.exchange in a loop, on READY_FOR_LOADING telecoms.
+Fails if the batch is slower than the loop.
+
+    python -m benchmark.bench_exchange_many
+"""
+import timeit
+
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, EnergySupplier, Wheel, Arranger
+from ex02.telecom import Telecom, Command
+
+
+def run(size=100_000, repeat=5):
+    robot = Robot(transmitter=Transmitter(),
+                  motion_controller=MotionController(Wheel(), Wheel(), {}),
+                  navigator=Navigator(Arranger()),
+                  energy_supplier=EnergySupplier(quantity=1e9))
+    tcs = [Telecom(command=Command.READY_FOR_LOADING) for _ in range(size)]
+
+    t_loop = min(timeit.repeat(lambda: [robot.exchange(tc) for tc in tcs], number=1, repeat=repeat))
+    t_many = min(timeit.repeat(lambda: robot.exchange_many(tcs), number=1, repeat=repeat))
+    t_iter = min(timeit.repeat(lambda: list(robot.iter_exchange(tcs)), number=1, repeat=repeat))
+    print(f'{size} READY_FOR_LOADING telecoms')
+    print(f'  exchange loop  {t_loop:.4f}s  {t_loop / size * 1e9:6.0f} ns/telecom')
+    print(f'  exchange_many  {t_many:.4f}s  {t_many / size * 1e9:6.0f} ns/telecom')
+    print(f'  iter_exchange  {t_iter:.4f}s  {t_iter / size * 1e9:6.0f} ns/telecom')
+    assert t_many <= t_loop, 'exchange_many is slower than exchange in a loop'
+    assert t_iter <= t_loop, 'iter_exchange is slower than exchange in a loop'
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,56 @@
+"""
+Fleet of robots driven by telecoms and stepped at once, in one process or sharded.
+
+    python -m benchmark.bench_fleet
+"""
+import time
+
+import numpy as np
+
+from ex02.fleet import Fleet, ShardedFleet
+from ex02.telecom import Telecom, Command
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def load(fleet, routes):
+    for i, route in enumerate(routes):
+        robot = fleet.robot(i)
+        robot.exchange(Telecom(command=Command.LOADING, payload=route))
+        robot.exchange(Telecom(command=Command.MOVE))
+
+
+def load_batch(fleet, routes):
+    fleet.exchange_batch((i, Telecom(command=Command.LOADING, payload=route)) for i, route in enumerate(routes))
+    fleet.exchange_batch((i, Telecom(command=Command.MOVE)) for i in range(len(routes)))
+
+
+def step(fleet, steps, time_step):
+    for s in range(steps):
+        fleet.run((s + 1) * time_step)
+
+
+def run(size=10_000, steps=1_000, time_step=1.):
+    rng = np.random.default_rng(0)
+    routes = [np.cumsum(rng.uniform(-10, 10, size=(50, 2)), axis=0) for _ in range(size)]
+    configuration = {'speed': 1.}
+
+    fleet = Fleet(size, energy=1e6, configuration=configuration)
+    _, t_load = timed(load, fleet, routes)
+    _, t_steps = timed(step, fleet, steps, time_step)
+    print(f'{"Fleet":12} {size} robots, telecoms {t_load:.2f}s, '
+          f'{steps} steps {t_steps:.2f}s ({t_steps / steps * 1000:.2f}ms per step)')
+
+    with ShardedFleet(size, energy=1e6, configuration=configuration) as sharded:
+        _, t_load = timed(load_batch, sharded, routes)
+        _, t_steps = timed(step, sharded, steps, time_step)
+        print(f'{"ShardedFleet":12} {size} robots, telecoms {t_load:.2f}s, '
+              f'{steps} steps {t_steps:.2f}s ({t_steps / steps * 1000:.2f}ms per step), {sharded.workers} workers')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,38 @@
+"""
+Robot loading and moving without, with and after Instrumentation.
+
+    python -m benchmark.bench_instrumentation
+"""
+import time
+
+import numpy as np
+
+from ex02.instrumentation import Instrumentation
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.telecom import Telecom, Command
+
+
+def exchange(robot, positions):
+    start = time.perf_counter()
+    robot.exchange(Telecom(command=Command.LOADING, payload=positions))
+    robot.exchange(Telecom(command=Command.MOVE))
+    return time.perf_counter() - start
+
+
+def run(size=200):
+    rng = np.random.default_rng(0)
+    steps = rng.choice(np.array([(1., 0.), (0., 1.), (-1., 0.), (0., -1.)]), size=size)
+    positions = np.cumsum(steps * rng.integers(1, 5, size=(size, 1)), axis=0)
+    robot = Robot(Transmitter(), MotionController(Wheel(), Wheel(), {}), Navigator(Arranger()),
+                  EnergySupplier(1e9))
+
+    print(f'not attached {exchange(robot, positions):.3f}s')
+    instrumentation = Instrumentation().attach(robot)
+    print(f'attached     {exchange(robot, positions):.3f}s')
+    instrumentation.detach()
+    print(f'detached     {exchange(robot, positions):.3f}s')
+    print(instrumentation.to_prometheus())
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,53 @@
+"""
+Per time step execution against macro step execution on long routes.
+
+    python -m benchmark.bench_macro_step
+"""
+import random
+import time
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.robot import MotionController, Wheel, EnergySupplier
+
+
+class OdometerWheel(Wheel):
+    """Wheel accepting aggregated commands, accumulating driven length"""
+    MACRO_STEP = True
+
+    def __init__(self):
+        self.odometer = 0.
+
+    def run(self, length):
+        self.odometer += length
+
+    def run_steps(self, length, steps):
+        self.odometer += length
+
+
+def random_route(size):
+    points = [Point(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(size + 1)]
+    return [Translation(a, b) for a, b in zip(points, points[1:])]
+
+
+def drive(route, configuration):
+    right, left = OdometerWheel(), OdometerWheel()
+    controller = MotionController(right, left, configuration)
+    supplier = EnergySupplier(quantity=float('inf'))
+    start = time.perf_counter()
+    for translation in route:
+        controller.run_translation(translation, supplier)
+    return time.perf_counter() - start, right.odometer
+
+
+def run(size=200):
+    route = random_route(size)
+    t_step, length_step = drive(route, {})
+    t_macro, length_macro = drive(route, {'macro_step': True})
+    steps = sum(MotionController(None, None, {})._compute_step_param(t.length)[0] for t in route)
+    print(f'{size} translations, {steps} time steps, driven {length_step:.1f} / {length_macro:.1f}')
+    print(f'  per step {t_step:.4f}s  macro step {t_macro:.6f}s  x{t_step / t_macro:.0f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,40 @@
+"""
+Navigator.compute_motions on arrays against the per-object iter_motions path.
+
+    python -m benchmark.bench_navigator
+"""
+import time
+
+import numpy as np
+
+from ex02.robot import Navigator, Arranger
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(sizes=(100_000, 1_000_000), per_object_max_size=100_000):
+    navigator = Navigator(Arranger())
+    rng = np.random.default_rng(0)
+    print(f'{"positions":>10} {"path":>11} {"motions":>8} {"total length":>9}')
+    for size in sizes:
+        # a grid walk, with straight runs, corners and u-turns
+        steps = rng.choice(np.array([(1., 0.), (0., 1.), (-1., 0.), (0., -1.)]), size=size - 1)
+        steps = np.repeat(steps[::4], 4, axis=0)[:size - 1]
+        xy = np.concatenate(([(0., 0.)], np.cumsum(steps, axis=0)))
+
+        motions, t_motions = timed(navigator.compute_motions, xy)
+        _, t_total = timed(navigator.compute_total_distance, motions)
+        _, t_positions = timed(navigator.compute_positions_distance, xy)
+        print(f'{size:10} {"arrays":>11} {t_motions:7.2f}s {t_total:7.2f}s   positions distance {t_positions:.4f}s')
+        if size <= per_object_max_size:
+            motions, t_motions = timed(lambda p: list(navigator.iter_motions(p)), xy.tolist())
+            _, t_total = timed(navigator.compute_total_distance, motions)
+            print(f'{size:10} {"per object":>11} {t_motions:7.2f}s {t_total:7.2f}s')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,81 @@
+"""
+ParallelArranger scaling across worker counts, at a fixed time budget,
+and cost of passing waypoints to workers, pickled or in shared memory.
+
+    python -m benchmark.bench_parallel_arranger
+"""
+import os
+import pickle
+import time
+import timeit
+
+import numpy as np
+
+from ex02.geometry import Point
+from ex02.routing import ParallelArranger, route_cost, _SharedArrays
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_counts():
+    """1, 2, 4... up to the available cores, and at least 1 and 2 workers"""
+    cores = available_cores()
+    counts, count = [], 1
+    while count < max(cores, 2):
+        counts.append(count)
+        count *= 2
+    return counts + [max(cores, 2)]
+
+
+def print_cores():
+    cores = available_cores()
+    print(f'{cores} cores available, {worker_counts()} workers measured')
+    if cores < 2:
+        print('  with a single core, workers share it: no speedup can be measured, '
+              'results only show the overhead of workers')
+
+
+def run_transfer(size=50_000, repeat=5):
+    xy = np.random.default_rng(0).uniform(0, 1000, (size, 2))
+    points = [Point(x, y) for x, y in xy.tolist()]
+    t_pickle = min(timeit.repeat(lambda: pickle.loads(pickle.dumps(points)), number=1, repeat=repeat))
+
+    def shared():
+        with _SharedArrays(xy=xy) as arrays:
+            pickle.loads(pickle.dumps(arrays.spec))
+    t_shared = min(timeit.repeat(shared, number=1, repeat=repeat))
+    print(f'{size} waypoints to a worker: pickled Points {t_pickle:.4f}s, shared memory {t_shared:.4f}s')
+
+
+def run_scaling(sizes=(2_000, 50_000), time_budget=5.):
+    rng = np.random.default_rng(0)
+    print(f'{"waypoints":>10} {"strategy":>9} {"workers":>8} {"cost":>10} {"time":>8}')
+    for size in sizes:
+        xy = rng.uniform(0, 1000, (size, 2))
+        for strategy in (ParallelArranger.RESTARTS, ParallelArranger.PARTS):
+            for workers in worker_counts():
+                arranger = ParallelArranger(time_budget=time_budget, workers=workers, strategy=strategy)
+                start = time.perf_counter()
+                order = arranger.optimize(xy)
+                elapsed = time.perf_counter() - start
+                print(f'{size:10} {strategy:>9} {workers:8} {route_cost(xy, order):10.0f} {elapsed:7.2f}s')
+
+
+def run_many(routes=8, size=2_000, time_budget=1.):
+    rng = np.random.default_rng(0)
+    payloads = [rng.uniform(0, 1000, (size, 2)).tolist() for _ in range(routes)]
+    for workers in worker_counts():
+        start = time.perf_counter()
+        ParallelArranger(time_budget=time_budget, workers=workers).arrange_many(payloads)
+        print(f'{routes} routes of {size} waypoints, {workers} workers: {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    print_cores()
+    run_transfer()
+    run_scaling()
+    run_many()
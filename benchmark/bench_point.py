@@ -0,0 +1,54 @@
+"""
+Memory and throughput of Point compared with a __dict__ based point,
+as Point was before being tuple-backed.
+
+    python -m benchmark.bench_point
+"""
+import random
+import timeit
+import tracemalloc
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+
+
+class DictPoint:
+
+    def __init__(self, x, y=None):
+        self.x = float(x)
+        self.y = float(y)
+
+    def __sub__(self, other):
+        return DictPoint(self.x - other.x, self.y - other.y)
+
+
+def measure_memory(factory, positions):
+    tracemalloc.start()
+    points = [factory(x, y) for x, y in positions]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del points
+    return size
+
+
+def run(size=1_000_000, repeat=3):
+    positions = [(random.uniform(-1e3, 1e3), random.uniform(-1e3, 1e3)) for _ in range(size)]
+
+    for name, factory in [('dict', DictPoint), ('Point', Point), ('Point.from_floats', Point.from_floats)]:
+        memory = measure_memory(factory, positions)
+        duration = min(timeit.repeat(lambda: [factory(x, y) for x, y in positions], number=1, repeat=repeat))
+        print(f'{name:18} {memory / size:6.1f} bytes/point  {size / duration / 1e6:5.2f} Mpoints/s')
+
+    for name, points in [('dict', [DictPoint(x, y) for x, y in positions]),
+                         ('Point', [Point(x, y) for x, y in positions])]:
+        duration = min(timeit.repeat(lambda: [p.x * p.y for p in points], number=1, repeat=repeat))
+        print(f'{name + " read":18} {size / duration / 1e6:5.2f} Mpoints/s')
+
+    points = [Point(x, y) for x, y in positions]
+    duration = min(timeit.repeat(lambda: [Translation(a, b) for a, b in zip(points, points[1:])],
+                                 number=1, repeat=repeat))
+    print(f'{"Translation":18} {size / duration / 1e6:5.2f} Mtranslations/s')
+
+
+if __name__ == '__main__':
+    run()
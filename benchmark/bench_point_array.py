@@ -0,0 +1,41 @@
+"""
+Compares per-object Point operations with the batched PointArray ones.
+
+    python -m benchmark.bench_point_array
+"""
+import random
+import timeit
+
+from ex02.geometry import Point, PointArray
+
+
+def per_object(points):
+    others = [p.normal() for p in points]
+    sums = [p + o for p, o in zip(points, others)]
+    return [s.normalize() * 2. for s in sums]
+
+
+def batched(points):
+    others = points.normal()
+    return (points + others).normalize() * 2.
+
+
+def run(size=200_000, repeat=3):
+    positions = [(random.uniform(-1e3, 1e3), random.uniform(-1e3, 1e3)) for _ in range(size)]
+    objects = [Point.new(xy) for xy in positions]
+    array = PointArray.new(positions)
+
+    t_object = min(timeit.repeat(lambda: per_object(objects), number=1, repeat=repeat))
+    t_array = min(timeit.repeat(lambda: batched(array), number=1, repeat=repeat))
+    t_build_object = min(timeit.repeat(lambda: [Point.new(xy) for xy in positions], number=1, repeat=repeat))
+    t_build_array = min(timeit.repeat(lambda: PointArray.new(positions), number=1, repeat=repeat))
+
+    print(f'{size} points')
+    print(f'  construction : Point {t_build_object:.4f}s  PointArray {t_build_array:.4f}s'
+          f'  x{t_build_object / t_build_array:.1f}')
+    print(f'  operations   : Point {t_object:.4f}s  PointArray {t_array:.4f}s'
+          f'  x{t_object / t_array:.1f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,36 @@
+"""
+Re-loading an edited route: Navigator.replan against computing motions from scratch.
+
+    python -m benchmark.bench_replanning
+"""
+import time
+
+import numpy as np
+
+from ex02.robot import Navigator, Arranger
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(size=100_000, edits=(1, 10, 100)):
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(-100, 100, size=(size, 2))
+    navigator = Navigator(Arranger())
+    _, t_first = timed(navigator.compute_motions, xy)
+    print(f'{size} positions, first load {t_first * 1000:8.1f}ms')
+    print(f'{"edits":>6} {"scratch":>10} {"replan":>10}')
+    for count in edits:
+        edited = xy.copy()
+        edited[rng.integers(0, size, count)] = rng.uniform(-100, 100, size=(count, 2))
+        _, t_scratch = timed(Navigator(Arranger()).compute_motions, edited)
+        navigator.compute_motions(xy)
+        _, t_replan = timed(navigator.compute_motions, edited)
+        print(f'{count:6} {t_scratch * 1000:8.1f}ms {t_replan * 1000:8.2f}ms')
+
+
+if __name__ == '__main__':
+    run()
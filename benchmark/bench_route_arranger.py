@@ -0,0 +1,29 @@
+"""
+RouteArranger on random payloads: route cost and optimization time.
+
+    python -m benchmark.bench_route_arranger
+"""
+import time
+
+import numpy as np
+
+from ex02.routing import RouteArranger, route_cost
+
+
+def run(sizes=(1_000, 5_000, 20_000, 50_000), turn_weights=(0., 10.), time_budget=5.):
+    rng = np.random.default_rng(0)
+    print(f'{"waypoints":>10} {"turn":>5} {"payload":>12} {"arranged":>12} {"gain":>6} {"time":>8}')
+    for size in sizes:
+        xy = rng.uniform(0, 1000, (size, 2))
+        for turn_weight in turn_weights:
+            arranger = RouteArranger(turn_weight=turn_weight, time_budget=time_budget)
+            start = time.perf_counter()
+            order = arranger.optimize(xy)
+            elapsed = time.perf_counter() - start
+            before = route_cost(xy, range(size), turn_weight)
+            after = route_cost(xy, order, turn_weight)
+            print(f'{size:10} {turn_weight:5} {before:12.0f} {after:12.0f} {before / after:5.1f}x {elapsed:7.2f}s')
+
+
+if __name__ == '__main__':
+    run()
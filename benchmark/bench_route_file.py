@@ -0,0 +1,63 @@
+"""
+LOADING positions from a route file against a list payload: time to get the
+positions array, time of a full LOADING, and memory allocated while loading.
+
+    python -m benchmark.bench_route_file
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from ex02.geometry import PointArray
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.routefile import RouteFile
+from ex02.telecom import Telecom, Command
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def allocated(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def load(payload):
+    robot = Robot(Transmitter(), MotionController(Wheel(), Wheel(), {}), Navigator(Arranger()),
+                  EnergySupplier(float('inf')))
+    return robot.exchange(Telecom(command=Command.LOADING, payload=payload))
+
+
+def run(sizes=(10_000, 100_000, 1_000_000)):
+    rng = np.random.default_rng(0)
+    print(f'{"size":>9} {"array list":>11} {"array file":>11} {"LOADING list":>13} {"LOADING file":>13} '
+          f'{"MB list":>8} {"MB file":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            xy = rng.uniform(-100, 100, size=(size, 2))
+            positions = xy.tolist()
+            path = os.path.join(directory, f'route{size}.bin')
+            RouteFile.write(path, xy)
+
+            _, t_list = timed(PointArray.new, positions)
+            _, t_file = timed(RouteFile(path).open)
+            _, t_load_list = timed(load, positions)
+            _, t_load_file = timed(load, RouteFile(path))
+            peak_list = allocated(PointArray.new, positions)
+            peak_file = allocated(lambda: RouteFile(path).open().sum())
+            print(f'{size:9} {t_list * 1e3:9.2f}ms {t_file * 1e3:9.3f}ms {t_load_list * 1e3:11.1f}ms '
+                  f'{t_load_file * 1e3:11.1f}ms {peak_list / 1e6:8.1f} {peak_file / 1e6:8.3f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,38 @@
+"""
+Hours of robot operation on a SimulationClock, with and without macro steps.
+
+    python -m benchmark.bench_simulation
+"""
+import time
+
+import numpy as np
+
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.simulation import SimulationClock
+
+
+class MacroWheel(Wheel):
+    MACRO_STEP = True
+
+
+def run(size=2_000):
+    rng = np.random.default_rng(0)
+    # a grid walk, turns being right angles or u-turns
+    steps = rng.choice(np.array([(1., 0.), (0., 1.), (-1., 0.), (0., -1.)]), size=size)
+    xy = np.cumsum(steps * rng.integers(1, 10, size=(size, 1)), axis=0)
+    for macro_step in (False, True):
+        clock = SimulationClock()
+        controller = MotionController(MacroWheel(), MacroWheel(), {'macro_step': macro_step})
+        controller.use_clock(clock)
+        robot = Robot(Transmitter(), controller, Navigator(Arranger()), EnergySupplier(1e9))
+        robot.load_positions(xy)
+
+        start = time.perf_counter()
+        robot.run()
+        elapsed = time.perf_counter() - start
+        print(f'macro_step={macro_step!s:5} {len(controller.trace)} motions, '
+              f'{clock.now / 3600:6.1f}h simulated in {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    run()
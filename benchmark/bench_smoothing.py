@@ -0,0 +1,45 @@
+"""
+Smooth paths against paths with rotations on the spot: planning time, and
+duration and energy of the motions, as MotionController step plans run them.
+
+    python -m benchmark.bench_smoothing
+"""
+import time
+
+import numpy as np
+
+from ex02.robot import MotionController, Navigator, Arranger, Wheel
+from ex02.smoothing import PathSmoother
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(size=100_000, radii=(0.1, 0.5, 1.)):
+    rng = np.random.default_rng(0)
+    steps = rng.choice([[1., 0.], [0., 1.], [-1., 0.], [0., -1.]], size=size - 1) * rng.integers(1, 6, (size - 1, 1))
+    xy = np.concatenate(([[0., 0.]], np.cumsum(steps, axis=0)))
+    controller = MotionController(Wheel(), Wheel(), {'wheel_axis_length': 1.})
+
+    def totals(motions):
+        plans = [controller.get_step_plan(m) for m in motions]
+        return sum(p.steps for p in plans) * controller.time_step, sum(p.get_required_energy() for p in plans)
+
+    motions, t_sharp = timed(Navigator(Arranger()).compute_motions, xy)
+    duration, energy = totals(motions)
+    print(f'{size} positions')
+    print(f'{"radius":>8} {"planning":>10} {"on spot":>8} {"duration":>10} {"energy":>10}')
+    print(f'{"-":>8} {t_sharp * 1e3:8.1f}ms {sum(1 for m in motions if hasattr(m, "arc")):8} '
+          f'{duration:10.1f} {energy:10.1f}')
+    for radius in radii:
+        motions, t_smooth = timed(PathSmoother(radius).compute_motions, xy)
+        duration, energy = totals(motions)
+        on_spot = sum(1 for m in motions if hasattr(m, 'arc') and m.is_on_the_spot())
+        print(f'{radius:8} {t_smooth * 1e3:8.1f}ms {on_spot:8} {duration:10.1f} {energy:10.1f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,73 @@
+"""
+SegmentIndex queries on long random routes, against pairwise checks.
+
+    python -m benchmark.bench_spatial
+"""
+import math
+import random
+import time
+
+import numpy as np
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.spatial import SegmentIndex, segments_intersect
+
+
+def random_route(size):
+    """Random walk, with heading changes, as a route of Translations"""
+    x, y, heading = 0., 0., 0.
+    points = [Point(x, y)]
+    for _ in range(size):
+        heading += random.uniform(-1., 1.)
+        length = random.uniform(0.5, 2.)
+        x += length * math.cos(heading)
+        y += length * math.sin(heading)
+        points.append(Point(x, y))
+    return [Translation(a, b) for a, b in zip(points, points[1:])]
+
+
+def pairwise_self_intersections(xy):
+    """O(n^2) reference, one segment against all the following ones"""
+    count = 0
+    for i in range(len(xy) - 2):
+        others = xy[i + 2:]
+        count += int(segments_intersect(np.repeat(xy[i:i + 1], len(others), axis=0), others).sum())
+    return count
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(size=100_000, queries=1000):
+    route = random_route(size)
+
+    index, t_build = timed(SegmentIndex, route)
+    pairs, t_self = timed(index.self_intersections)
+    print(f'{size} segments, cell size {index.cell_size:.2f}')
+    print(f'  build              {t_build:.3f}s')
+    print(f'  self intersections {t_self:.3f}s  ({len(pairs)} crossings)')
+
+    probes = random.sample(route, queries)
+    _, t_intersecting = timed(lambda: [index.intersecting(s) for s in probes])
+    _, t_within = timed(lambda: [index.within(s.start, 2.) for s in probes])
+    print(f'  intersecting       {t_intersecting / queries * 1e6:.0f}us/query')
+    print(f'  within             {t_within / queries * 1e6:.0f}us/query')
+    span = float(np.max(index.extent - index.origin))
+    long_probes = [Translation(Point(*index.origin), Point(*(index.origin + span * np.array([1., u]))))
+                   for u in np.linspace(0., 1., 20)]
+    _, t_long = timed(lambda: [index.intersecting(s) for s in long_probes])
+    print(f'  intersecting long  {t_long / len(long_probes) * 1e3:.1f}ms/query  (across the whole route)')
+
+    small = 5000
+    count, t_pairwise = timed(pairwise_self_intersections, index.xy[:small])
+    small_pairs, t_indexed = timed(SegmentIndex(route[:small]).self_intersections)
+    print(f'{small} segments, self intersections: pairwise {t_pairwise:.3f}s ({count}), '
+          f'indexed {t_indexed:.3f}s ({len(small_pairs)})')
+
+
+if __name__ == '__main__':
+    run()
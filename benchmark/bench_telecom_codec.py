@@ -0,0 +1,47 @@
+"""
+Binary TelecomCodec against JSON, on LOADING telecoms.
+
+    python -m benchmark.bench_telecom_codec
+"""
+import json
+import random
+import timeit
+
+from ex02.geometry import PointArray
+from ex02.telecom import Telecom, TelecomCodec, Command
+
+
+def json_encode(tc):
+    return json.dumps({'command': tc.command.name, 'payload': tc.payload, 'errors': tc.errors}).encode()
+
+
+def json_decode(data):
+    message = json.loads(data)
+    return Telecom(command=Command[message['command']], payload=message['payload'], errors=message['errors'])
+
+
+def run(size=100_000, repeat=5):
+    positions = [(random.uniform(-1e3, 1e3), random.uniform(-1e3, 1e3)) for _ in range(size)]
+    tc = Telecom(command=Command.LOADING, payload=positions)
+
+    encoded_json = json_encode(tc)
+    print(f'LOADING of {size} positions')
+    print(f'  {"format":8} {"size":>10} {"encode":>9} {"decode":>9} {"to PointArray":>14}')
+
+    t_encode = min(timeit.repeat(lambda: json_encode(tc), number=1, repeat=repeat))
+    t_decode = min(timeit.repeat(lambda: json_decode(encoded_json), number=1, repeat=repeat))
+    t_points = min(timeit.repeat(lambda: PointArray.new(json_decode(encoded_json).payload),
+                                 number=1, repeat=repeat))
+    print(f'  {"json":8} {len(encoded_json):10} {t_encode:8.4f}s {t_decode:8.4f}s {t_points:13.4f}s')
+
+    for name, payload_type in [('float64', TelecomCodec.FLOAT64), ('float32', TelecomCodec.FLOAT32)]:
+        encoded = TelecomCodec.encode(tc, payload_type)
+        t_encode = min(timeit.repeat(lambda: TelecomCodec.encode(tc, payload_type), number=1, repeat=repeat))
+        t_decode = min(timeit.repeat(lambda: TelecomCodec.decode(encoded), number=1, repeat=repeat))
+        t_points = min(timeit.repeat(lambda: PointArray(TelecomCodec.decode(encoded).payload),
+                                     number=1, repeat=repeat))
+        print(f'  {name:8} {len(encoded):10} {t_encode:8.4f}s {t_decode:8.4f}s {t_points:13.4f}s')
+
+
+if __name__ == '__main__':
+    run()
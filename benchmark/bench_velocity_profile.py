@@ -0,0 +1,49 @@
+"""
+Velocity profiles against constant speed: planning time, running time and
+route duration, on a grid walk with rotations on the spot and on a smooth path.
+
+    python -m benchmark.bench_velocity_profile
+"""
+import time
+
+import numpy as np
+
+from ex02.robot import MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.smoothing import PathSmoother
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run_motions(controller, motions):
+    supplier = EnergySupplier(float('inf'))
+    for motion in motions:
+        controller.move(motion, supplier)
+
+
+def run(size=1_000):
+    rng = np.random.default_rng(0)
+    steps = rng.choice([[1., 0.], [0., 1.], [-1., 0.], [0., -1.]], size=size - 1) * rng.integers(1, 6, (size - 1, 1))
+    xy = np.concatenate(([[0., 0.]], np.cumsum(steps, axis=0)))
+    configuration = {'speed': 1., 'time_step': 0.01, 'wheel_axis_length': 1.}
+    print(f'{size} positions')
+    print(f'{"path":>7} {"profile":>8} {"planning":>10} {"running":>10} {"duration":>10}')
+    for name, motions in (('grid', Navigator(Arranger()).compute_motions(xy)),
+                          ('smooth', PathSmoother(0.5).compute_motions(xy))):
+        controller = MotionController(Wheel(), Wheel(), dict(configuration))
+        duration = sum(controller.get_step_plan(m).steps for m in motions) * controller.time_step
+        _, t_run = timed(run_motions, controller, motions)
+        print(f'{name:>7} {"-":>8} {"-":>10} {t_run * 1e3:8.1f}ms {duration:10.1f}')
+
+        controller = MotionController(Wheel(), Wheel(), dict(configuration, max_acceleration=0.5,
+                                                             max_lateral_acceleration=0.5))
+        profile, t_plan = timed(controller.plan_route, motions)
+        _, t_run = timed(run_motions, controller, motions)
+        print(f'{name:>7} {"trapeze":>8} {t_plan * 1e3:8.1f}ms {t_run * 1e3:8.1f}ms {profile.duration:10.1f}')
+
+
+if __name__ == '__main__':
+    run()
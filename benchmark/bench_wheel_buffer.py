@@ -0,0 +1,58 @@
+"""
+Controller hot loop with a wheel driver paying a cost per write: a write per
+wheel command against buffered commands, flushed by capacity.
+
+    python -m benchmark.bench_wheel_buffer
+"""
+import time
+
+import numpy as np
+
+from ex02.drivers import FakeWheelDriver, WheelBuffer
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.robot import MotionController, EnergySupplier, Wheel
+
+COST = 2e-6
+
+
+class DirectWheel(Wheel):
+    """Wheel writing each command to the driver"""
+
+    def __init__(self, driver, side):
+        self.driver = driver
+        self.row = np.zeros((1, 2))
+        self.side = side
+
+    def run(self, length):
+        self.row[0, self.side] = length
+        self.driver.write(self.row)
+
+
+def run_route(right, left, motions):
+    controller = MotionController(right, left, {'speed': 1., 'time_step': 0.01})
+    supplier = EnergySupplier(float('inf'))
+    start = time.perf_counter()
+    for motion in motions:
+        controller.move(motion, supplier)
+    controller.flush_wheels()
+    return time.perf_counter() - start
+
+
+def run(steps=100_000):
+    motions = [Translation(Point(0., 0.), Point(steps / 100 / 10, 0.))] * 10
+    driver = FakeWheelDriver(COST)
+    elapsed = run_route(DirectWheel(driver, 0), DirectWheel(driver, 1), motions)
+    print(f'{steps} time steps, driver cost {COST * 1e6:.1f}us per write')
+    print(f'{"wheels":>16} {"writes":>8} {"total":>10} {"per step":>10}')
+    print(f'{"direct":>16} {len(driver.flushes):8} {elapsed * 1e3:8.1f}ms {elapsed / steps * 1e6:8.2f}us')
+    for capacity in (1, 64, 1024, 16384):
+        driver = FakeWheelDriver(COST)
+        buffer = WheelBuffer(driver, capacity)
+        elapsed = run_route(buffer.right, buffer.left, motions)
+        print(f'{f"buffer {capacity}":>16} {len(driver.flushes):8} {elapsed * 1e3:8.1f}ms '
+              f'{elapsed / steps * 1e6:8.2f}us')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,244 @@
+"""
+Performance suite for geometry, motion and robot, with baselines.
+Each case is timed on inputs of increasing size, as the best time per call
+over repeats. Comparing against a baseline fails on cases slower than it by
+more than the threshold ratio.
+Timings are machine specific: save a baseline on your machine before a change,
+then compare against it; --baseline has no default, so that the reference
+baseline is neither compared against nor overwritten by mistake.
+benchmark/baseline.json, the reference baseline, was saved on one core of an
+Intel Xeon, x86_64 Linux, CPython 3.11; it is only meant to be compared against,
+or saved, on such a machine, by passing its path.
+
+    python -m benchmark.suite --save --baseline /tmp/baseline.json
+    python -m benchmark.suite --compare --baseline /tmp/baseline.json [--threshold 0.2] [--filter motion]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+from ex02.geometry import Point, Line, Arc
+from ex02.motion import Translation, Rotation
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.telecom import Telecom, Command
+
+REFERENCE_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 0.2
+
+CASES = {}
+
+
+def case(name, sizes):
+    """
+    Registers a case: function(size) prepares inputs and returns the callable timed
+    :param name: case name
+    :param sizes: input sizes
+    :return: decorator
+    """
+    def register(function):
+        CASES[name] = (function, sizes)
+        return function
+    return register
+
+
+def random_points(size, seed=0):
+    rng = random.Random(seed)
+    return [Point(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(size)]
+
+
+def grid_walk(size, seed=0):
+    """Positions turning by right angles, so that every rotation runs some time steps"""
+    rng = random.Random(seed)
+    x = y = 0.
+    positions = [(x, y)]
+    for _ in range(size - 1):
+        dx, dy = rng.choice([(1., 0.), (0., 1.), (-1., 0.), (0., -1.)])
+        length = rng.randint(1, 5)
+        x, y = x + dx * length, y + dy * length
+        positions.append((x, y))
+    return positions
+
+
+@case('point_arithmetic', sizes=(1_000, 10_000, 100_000))
+def point_arithmetic(size):
+    points = random_points(size)
+    pairs = list(zip(points, points[1:]))
+    return lambda: [((a + b) * 0.5 - a).normalize() for a, b in pairs]
+
+
+@case('line_intersection', sizes=(1_000, 10_000, 100_000))
+def line_intersection(size):
+    points = random_points(2 * size)
+    lines = [(Line(p, Point(1., 0.)), Line(q, Point(0., 1.))) for p, q in zip(points[::2], points[1::2])]
+    return lambda: [a.intersection(b) for a, b in lines]
+
+
+@case('arc_init', sizes=(1_000, 10_000))
+def arc_init(size):
+    points = random_points(size)
+    arcs = [(p, p + Point(1., 1.), Point(1., 0.), Point(0., 1.)) for p in points]
+    return lambda: [Arc(*arc) for arc in arcs]
+
+
+@case('translation_init', sizes=(1_000, 10_000, 100_000))
+def translation_init(size):
+    points = random_points(size + 1)
+    return lambda: [Translation(a, b) for a, b in zip(points, points[1:])]
+
+
+@case('rotation_init', sizes=(1_000, 10_000))
+def rotation_init(size):
+    points = random_points(size)
+    return lambda: [Rotation(p, p, Point(1., 0.), Point(0., 1.)) for p in points]
+
+
+@case('motion_lengths', sizes=(1_000, 10_000))
+def motion_lengths(size):
+    positions = grid_walk(size)
+    navigator = Navigator(Arranger())
+    return lambda: sum(m.get_length() for m in navigator.iter_motions(positions))
+
+
+def _controller():
+    return MotionController(Wheel(), Wheel(), {'speed': 1., 'time_step': 0.01}), EnergySupplier(math.inf)
+
+
+@case('run_translation', sizes=(10, 100, 1_000))
+def run_translation(size):
+    controller, supplier = _controller()
+    translation = Translation(Point(0., 0.), Point(float(size), 0.))
+    return lambda: controller.run_translation(translation, supplier)
+
+
+@case('run_rotation', sizes=(1, 10, 100))
+def run_rotation(size):
+    controller, supplier = _controller()
+    controller.configuration['wheel_axis_length'] = float(size)
+    rotation = Rotation(Point(0., 0.), Point(0., 0.), Point(1., 0.), Point(0., 1.))
+    return lambda: controller.run_rotation(rotation, supplier)
+
+
+@case('loading_move', sizes=(10, 100, 1_000))
+def loading_move(size):
+    positions = grid_walk(size)
+    controller, supplier = _controller()
+    robot = Robot(Transmitter(), controller, Navigator(Arranger()), supplier)
+
+    def exchange():
+        robot.exchange(Telecom(command=Command.LOADING, payload=positions))
+        robot.exchange(Telecom(command=Command.MOVE))
+    return exchange
+
+
+def measure(function, repeat=5, min_time=0.05) -> float:
+    """
+    Best time of a call to function, calls being grouped to last min_time at least
+    :return: seconds per call
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = number * 10 if elapsed == 0 else max(number * 2, math.ceil(number * min_time / elapsed))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run(names=None, repeat=5, min_time=0.05, sizes=None, output=None) -> dict:
+    """
+    Times cases
+    :param names: case names, all by default
+    :param repeat: timings per case and size
+    :param min_time: minimum duration of a timing
+    :param sizes: sizes overriding case ones
+    :param output: stream progress is printed to, or None
+    :return: dict of 'case[size]' to seconds per call
+    """
+    results = {}
+    for name, (function, case_sizes) in CASES.items():
+        if names is not None and name not in names:
+            continue
+        for size in sizes or case_sizes:
+            key = f'{name}[{size}]'
+            results[key] = measure(function(size), repeat, min_time)
+            if output is not None:
+                print(f'{key:28} {results[key] * 1e3:12.4f} ms', file=output)
+    return results
+
+
+def save(results: dict, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compares results to baseline
+    :param threshold: ratio of slowdown from which a case is a regression
+    :return: list of (key, baseline seconds or None, seconds, ratio or None, regression)
+    """
+    rows = []
+    for key, seconds in results.items():
+        base = baseline.get(key)
+        ratio = None if not base else seconds / base
+        rows.append((key, base, seconds, ratio, ratio is not None and ratio > 1 + threshold))
+    return rows
+
+
+def report(rows: list) -> str:
+    lines = [f'{"case":28} {"baseline ms":>12} {"now ms":>12} {"ratio":>7}']
+    for key, base, seconds, ratio, regression in rows:
+        base_text = '-' if base is None else f'{base * 1e3:12.4f}'
+        ratio_text = '-' if ratio is None else f'{ratio:7.2f}'
+        lines.append(f'{key:28} {base_text:>12} {seconds * 1e3:12.4f} {ratio_text:>7}'
+                     f'{"  REGRESSION" if regression else ""}')
+    regressions = sum(1 for row in rows if row[-1])
+    lines.append(f'{regressions} regression(s) out of {len(rows)} cases')
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', action='append', help='case names to run, all by default')
+    parser.add_argument('--baseline', help=f'baseline file, required to save or compare; '
+                                           f'the reference one is {REFERENCE_BASELINE}')
+    parser.add_argument('--save', action='store_true', help='save results as baseline')
+    parser.add_argument('--compare', action='store_true', help='compare results to baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='slowdown ratio over baseline failing the comparison')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    if (args.save or args.compare) and args.baseline is None:
+        parser.error('--save and --compare need a --baseline file')
+
+    results = run(args.filter, repeat=args.repeat, output=sys.stdout)
+    if args.save:
+        save(results, args.baseline)
+    if args.compare:
+        rows = compare(results, load(args.baseline), args.threshold)
+        print(report(rows))
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
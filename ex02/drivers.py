@@ -0,0 +1,192 @@
+"""
+Module for wheel drivers, receiving wheel commands by batches
+"""
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from ex02.robot import Wheel
+
+
+class WheelDriver(ABC):
+    """
+    Driver of both wheels, receiving commands by batches: rows of right and left
+    lengths, one row per time step
+    """
+
+    @abstractmethod
+    def write(self, commands: np.ndarray):
+        """
+        :param commands: N x 2 array of right and left lengths, only valid during the call
+        :return:
+        """
+        pass
+
+
+class FakeWheelDriver(WheelDriver):
+    """
+    Driver recording batches, paying cost seconds per batch, as a bus or system call would
+    """
+
+    def __init__(self, cost: float = 0., timer=time.perf_counter):
+        self.cost = cost
+        self.timer = timer
+        self.flushes = []
+        self.rows = 0
+
+    def write(self, commands: np.ndarray):
+        if self.cost:
+            end = self.timer() + self.cost
+            while self.timer() < end:
+                pass
+        self.flushes.append(commands.copy())
+        self.rows += len(commands)
+
+    def commands(self) -> np.ndarray:
+        """
+        Commands received so far
+        :return: N x 2 array of right and left lengths
+        """
+        return np.concatenate(self.flushes) if self.flushes else np.zeros((0, 2))
+
+
+class WheelBuffer:
+    """
+    Commands of both wheels, stored in a preallocated array of capacity rows, and
+    written to driver when it is full, or when its oldest row is older than window
+    seconds, if window is set, or on flush.
+    Rows are written by the wheels of the buffer, right then left for each time step,
+    or at once by MotionController, for all the time steps of a motion.
+    window is only checked when rows are written: rows are kept while nothing is
+    written, unless flushed. Robot.run_positions flushes buffers with a window at
+    each motion, as the next one is planned meanwhile.
+    """
+    DEFAULT_CAPACITY = 1024
+
+    def __init__(self, driver: WheelDriver, capacity: int = DEFAULT_CAPACITY, window: float = None,
+                 timer=time.monotonic):
+        self.driver = driver
+        self.capacity = capacity
+        self.window = window
+        self.timer = timer
+        self.commands = np.zeros((capacity, 2), dtype=np.float64)
+        self.count = 0
+        self.right = BufferedWheel(self, 0)
+        self.left = BufferedWheel(self, 1)
+        self._partial = [None, None]
+        self._since = None
+
+    def __len__(self):
+        return self.count
+
+    def put(self, side: int, length: float):
+        """
+        Sets the length of one wheel for the current time step; a row is complete
+        when both wheels are set, a wheel set twice leaving 0 to the other one
+        :param side: 0 for right, 1 for left
+        :param length: length
+        :return:
+        """
+        partial = self._partial
+        if partial[side] is not None:
+            self.run(*(0. if value is None else value for value in partial))
+            partial = self._partial
+        partial[side] = length
+        if partial[1 - side] is not None:
+            self.run(*partial)
+
+    def run(self, right: float, left: float):
+        """
+        Appends a row
+        :return:
+        """
+        self._partial = [None, None]
+        if self.count == 0:
+            self._since = self.timer() if self.window is not None else None
+        self.commands[self.count] = right, left
+        self.count += 1
+        if self.count == self.capacity or self._expired():
+            self.flush()
+
+    def fill(self, steps: int, right: float, left: float):
+        """
+        Appends steps identical rows
+        :return:
+        """
+        self._append(steps, right, left)
+
+    def extend(self, right, left):
+        """
+        Appends rows from arrays of right and left lengths
+        :return:
+        """
+        self._append(len(right), right, left)
+
+    def _append(self, steps, right, left):
+        self._complete_partial()
+        arrays = np.ndim(right) > 0
+        done = 0
+        while done < steps:
+            if self.count == 0:
+                self._since = self.timer() if self.window is not None else None
+            count = min(steps - done, self.capacity - self.count)
+            rows = self.commands[self.count:self.count + count]
+            if arrays:
+                rows[:, 0] = right[done:done + count]
+                rows[:, 1] = left[done:done + count]
+            else:
+                rows[:, 0] = right
+                rows[:, 1] = left
+            self.count += count
+            done += count
+            if self.count == self.capacity:
+                self.flush()
+        if self._expired():
+            self.flush()
+
+    def _complete_partial(self):
+        if self._partial != [None, None]:
+            self.run(*(0. if value is None else value for value in self._partial))
+
+    def _expired(self) -> bool:
+        return self.window is not None and self.count > 0 and self.timer() - self._since >= self.window
+
+    def flush(self):
+        """
+        Writes complete rows to the driver
+        :return:
+        """
+        if self.count:
+            self.driver.write(self.commands[:self.count])
+            self.count = 0
+
+    def close(self):
+        """
+        Writes all rows to the driver, a wheel set alone leaving 0 to the other one
+        :return:
+        """
+        self._complete_partial()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f'wheel_buffer({self.count}/{self.capacity}, window={self.window})'
+
+
+class BufferedWheel(Wheel):
+    """
+    Wheel of a WheelBuffer, side 0 being the right wheel and 1 the left one
+    """
+
+    def __init__(self, buffer: WheelBuffer, side: int):
+        self.buffer = buffer
+        self.side = side
+
+    def run(self, length):
+        self.buffer.put(self.side, length)
@@ -0,0 +1,361 @@
+import multiprocessing
+import os
+
+import numpy as np
+
+from ex02.geometry import PointArray
+from ex02.robot import Transmitter, MotionController, Navigator, Arranger, Wheel
+from ex02.telecom import Telecom, Exchanger
+
+"""
+Module for simulation of fleets of robots, with a state per robot stored in arrays
+"""
+
+
+class Fleet:
+    """
+    Simulation of size robots, their positions, energy and status being rows of arrays.
+    Robots are driven by telecoms, as Robot is, through the Transmitter of robot(i).
+    Each robot plans its motions with its own Navigator, translations and rotations
+    on the spot, from its current position: the approach to the first loaded position
+    is a motion of the route. Durations and consumption are the ones of the step plans
+    of the fleet MotionController. Robots moving are all advanced at once by run, to
+    a time of the fleet clock.
+    A MOVE is answered as soon as the robot starts moving: then the robot answers MOVING
+    until its route is run.
+    """
+    STATUS_MOTIONLESS = 0
+    STATUS_MOVING = 1
+
+    def __init__(self, size: int, energy: float = 1000., configuration=None):
+        self.motion_controller = MotionController(Wheel(), Wheel(), dict(configuration or {}))
+        self.time_step = self.motion_controller.time_step
+        self.now = 0.
+        self.positions = np.zeros((size, 2), dtype=np.float64)
+        self.energy = np.full(size, energy, dtype=np.float64)
+        self.status = np.full(size, Fleet.STATUS_MOTIONLESS, dtype=np.int8)
+        self.routes = [None] * size
+        self._robots = {}
+        self._move_start = np.zeros(size, dtype=np.float64)
+        self._move_energy = np.zeros(size, dtype=np.float64)
+        self._segments = None
+
+    def __len__(self):
+        return len(self.status)
+
+    def robot(self, index: int) -> 'FleetRobot':
+        robot = self._robots.get(index)
+        if robot is None:
+            robot = self._robots[index] = FleetRobot(self, index)
+        return robot
+
+    def is_moving(self, index: int) -> bool:
+        return self.status[index] == Fleet.STATUS_MOVING
+
+    def exchange(self, index: int, tc: Telecom) -> Telecom:
+        """
+        Exchanges telecom with robot index, through its Transmitter
+        :param index: robot index
+        :param tc: Telecom
+        :return: answer
+        """
+        return self.robot(index).exchange(tc)
+
+    def load_positions(self, index: int, positions):
+        """
+        Loads the route of robot index through positions, from its current position,
+        if there is enough energy for it
+        :param index: robot index
+        :param positions: iterable of xy pairs or Points, or N x 2 array
+        :return:
+        """
+        navigator = self.robot(index).navigator
+        route = self.compile_route(positions, self.positions[index], navigator)
+        if not route.energy < self.energy[index]:
+            raise ValueError('Not enough energy')
+        navigator.commit_route()
+        self.routes[index] = route
+
+    def start_route(self, index: int):
+        """
+        Starts running the route of robot index, if there is enough energy for it.
+        A robot that is no longer at the start of its route, having run it already,
+        is loaded it again, to approach it.
+        :param index: robot index
+        :return:
+        """
+        if self.is_moving(index):
+            raise ValueError('Robot is moving')
+        route = self.routes[index]
+        if route is None:
+            raise ValueError('Empty motion list')
+        if not np.array_equal(route.start[0], self.positions[index]):
+            self.load_positions(index, route.positions)
+        elif not route.energy < self.energy[index]:
+            raise ValueError('Not enough energy')
+        self.status[index] = Fleet.STATUS_MOVING
+        self._move_start[index] = self.now
+        self._move_energy[index] = self.energy[index]
+        self._segments = None
+
+    def compile_route(self, positions, start=None, navigator: Navigator = None) -> 'FleetRoute':
+        """
+        Motions through positions, from start if given, as arrays of timed segments.
+        Motions are computed by navigator, a new one by default, and left pending in it,
+        see Navigator.commit_route. They are timed by their step plans.
+        :param positions: iterable of xy pairs or Points, or N x 2 array
+        :param start: xy pair, position the route starts from
+        :param navigator: Navigator
+        :return: FleetRoute
+        """
+        navigator = navigator or Navigator(Arranger())
+        positions = navigator.to_point_array(positions)
+        points = positions if start is None else PointArray(np.concatenate(([start], positions.xy)))
+        motions = navigator.compute_motions(points, commit=False)
+        if not motions:
+            raise ValueError('Empty motion list')
+
+        # motions start where the previous translation ends, rotations being on the spot
+        route = navigator.pending_route
+        xy = route.xy[route.kept]
+        translation = np.zeros(len(motions), dtype=np.int64)
+        translation[route.translation_indices] = 1
+        before = np.cumsum(translation) - translation
+        plans = self.motion_controller.get_step_plans(motions)
+        durations = np.array([plan.steps for plan in plans], dtype=np.float64) * self.time_step
+        energies = np.array([plan.get_required_energy() for plan in plans], dtype=np.float64)
+        # the positions the route was computed from, copied by the route
+        positions = PointArray(route.xy if start is None else route.xy[1:])
+        return FleetRoute(xy[before], xy[before + translation], durations, energies, positions)
+
+    def step(self):
+        self.run(self.now + self.time_step)
+
+    def run(self, until: float):
+        """
+        Advances robots moving up to time until of the fleet clock
+        :param until: time
+        :return:
+        """
+        self.now = until
+        moving = np.flatnonzero(self.status == Fleet.STATUS_MOVING)
+        if not len(moving):
+            return
+        if self._segments is None:
+            self._segments = _Segments(self.routes, moving)
+        segments = self._segments
+
+        keys = segments.base + (until - self._move_start[segments.robots])
+        done = keys >= segments.end_time[segments.last]
+        robots = segments.robots[done]
+        self.positions[robots] = segments.end[segments.last[done]]
+        self.energy[robots] = self._move_energy[robots] - segments.energies[done]
+        self.status[robots] = Fleet.STATUS_MOTIONLESS
+
+        robots = segments.robots[~done]
+        keys = keys[~done]
+        s = np.searchsorted(segments.end_time, keys, side='right')
+        start_time = segments.start_time[s]
+        duration = segments.end_time[s] - start_time
+        fraction = np.divide(keys - start_time, duration, out=np.ones(len(s)), where=duration > 0)
+        self.positions[robots] = segments.start[s] + (segments.end[s] - segments.start[s]) * fraction[:, np.newaxis]
+        self.energy[robots] = self._move_energy[robots] - segments.energy_before[s] \
+            - segments.segment_energies[s] * fraction
+        if done.any():
+            self._segments = None
+
+    def __repr__(self):
+        return f'fleet(robots={len(self)}, moving={int(np.count_nonzero(self.status))}, now={self.now})'
+
+
+class FleetRoute:
+    """
+    Route of a fleet robot, as segments of start and end positions, durations and energies.
+    Rotations on the spot are segments with the same start and end.
+    positions are the ones the route was loaded with, the approach excluded.
+    """
+
+    def __init__(self, start, end, durations, energies, positions: PointArray):
+        self.start = start
+        self.end = end
+        self.durations = durations
+        self.energies = energies
+        self.duration = float(durations.sum())
+        self.energy = float(energies.sum())
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.durations)
+
+
+class _Segments:
+    """
+    Segments of the routes of moving robots, concatenated, with times made increasing
+    over all routes by offsetting each route by the total duration of the previous ones
+    """
+
+    def __init__(self, routes, robots):
+        routes = [routes[r] for r in robots.tolist()]
+        self.robots = robots
+        self.energies = np.array([route.energy for route in routes])
+        counts = np.array([len(route) for route in routes])
+        self.last = np.cumsum(counts) - 1
+        first = self.last - counts + 1
+
+        self.start = np.concatenate([route.start for route in routes])
+        self.end = np.concatenate([route.end for route in routes])
+        durations = np.concatenate([route.durations for route in routes])
+        self.end_time = np.cumsum(durations)
+        self.start_time = self.end_time - durations
+        self.base = self.start_time[first]
+        self.segment_energies = np.concatenate([route.energies for route in routes])
+        before = np.cumsum(self.segment_energies) - self.segment_energies
+        self.energy_before = before - np.repeat(before[first], counts)
+
+
+class FleetRobot(Exchanger):
+    """
+    One robot of a fleet, seen by its Transmitter and Navigator as a Robot:
+    loading and running its motions is done by the fleet
+    """
+
+    def __init__(self, fleet: Fleet, index: int):
+        self.fleet = fleet
+        self.index = index
+        self.transmitter = Transmitter()
+        self.navigator = Navigator(Arranger())
+        self.transmitter.register(self)
+        self.navigator.register(self)
+
+    def exchange(self, tc: Telecom) -> Telecom:
+        return self.transmitter.exchange(tc)
+
+    def load_positions(self, positions):
+        self.fleet.load_positions(self.index, positions)
+
+    def run(self):
+        self.fleet.start_route(self.index)
+
+    def is_moving(self) -> bool:
+        return self.fleet.is_moving(self.index)
+
+
+class ShardedFleetRobot(Exchanger):
+    """
+    Exchanger with one robot of a ShardedFleet, through the worker simulating it
+    """
+
+    def __init__(self, fleet: 'ShardedFleet', index: int):
+        self.fleet = fleet
+        self.index = index
+
+    def exchange(self, tc: Telecom) -> Telecom:
+        return self.fleet.exchange(self.index, tc)
+
+
+class ShardedFleet:
+    """
+    Fleet split in shards of consecutive robots, each one simulated in a worker process
+    it stays in. Telecoms are sent to the worker of their robot; runs, and batches of
+    exchanges, are processed by all workers in parallel.
+    Workers are stopped by close, or on leaving a with block.
+    """
+
+    def __init__(self, size: int, energy: float = 1000., configuration=None, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.bounds = np.linspace(0, size, self.workers + 1).astype(int)
+        self.now = 0.
+        self._connections = []
+        self._processes = []
+        for first, last in zip(self.bounds[:-1].tolist(), self.bounds[1:].tolist()):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard,
+                                              args=(worker_connection, last - first, energy, configuration),
+                                              daemon=True)
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def __len__(self):
+        return int(self.bounds[-1])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for connection in self._connections:
+            connection.send(('close',))
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def _locate(self, index):
+        shard = int(np.searchsorted(self.bounds, index, side='right')) - 1
+        return shard, index - int(self.bounds[shard])
+
+    def robot(self, index: int) -> ShardedFleetRobot:
+        return ShardedFleetRobot(self, index)
+
+    def exchange(self, index: int, tc: Telecom) -> Telecom:
+        shard, local = self._locate(index)
+        connection = self._connections[shard]
+        connection.send(('exchange', [(local, tc)]))
+        return connection.recv()[0]
+
+    def exchange_batch(self, exchanges) -> list:
+        """
+        Exchanges telecoms with robots, workers processing their robots' ones in parallel
+        :param exchanges: iterable of (robot index, Telecom)
+        :return: answers, in order
+        """
+        exchanges = list(exchanges)
+        batches = [[] for _ in self._connections]
+        for position, (index, tc) in enumerate(exchanges):
+            shard, local = self._locate(index)
+            batches[shard].append((position, local, tc))
+        for connection, batch in zip(self._connections, batches):
+            connection.send(('exchange', [(local, tc) for _, local, tc in batch]))
+        answers = [None] * len(exchanges)
+        for connection, batch in zip(self._connections, batches):
+            for (position, _, _), answer in zip(batch, connection.recv()):
+                answers[position] = answer
+        return answers
+
+    def run(self, until: float):
+        self._broadcast(('run', until))
+        self.now = until
+
+    def _broadcast(self, message):
+        for connection in self._connections:
+            connection.send(message)
+        return [connection.recv() for connection in self._connections]
+
+    def state(self):
+        """
+        Positions, energy and status of all robots
+        :return: N x 2 array, array of N energies, array of N statuses
+        """
+        states = self._broadcast(('state',))
+        return tuple(np.concatenate(arrays) for arrays in zip(*states))
+
+
+def _serve_shard(connection, size, energy, configuration):
+    fleet = Fleet(size, energy, configuration)
+    while True:
+        message = connection.recv()
+        if message[0] == 'exchange':
+            connection.send([fleet.exchange(index, tc) for index, tc in message[1]])
+        elif message[0] == 'run':
+            fleet.run(message[1])
+            connection.send(None)
+        elif message[0] == 'state':
+            connection.send((fleet.positions, fleet.energy, fleet.status))
+        else:
+            connection.close()
+            return
@@ -1,19 +1,42 @@
 import math
+from functools import cached_property
 from math import cos, sin, acos, asin, sqrt, isclose, fabs, pi
+import numpy as np
 
 """"
 Module for simple geometry in 2D
 """
 
 
+def _point(x: float, y: float) -> 'Point':
+    """
+    Fast Point constructor, without float conversion of coordinates
+    :param x: float
+    :param y: float
+    :return: Point
+    """
+    p = _new_object(Point)
+    _set_x(p, x)
+    _set_y(p, y)
+    return p
+
+
 class Point:
+    """
+    Immutable 2D point, with float coordinates stored in slots.
+    """
+    __slots__ = ('x', 'y')
 
     def __init__(self, x, y=None):
-        self.x = float(x)
-        self.y = float(y)
+        _set_x(self, float(x))
+        _set_y(self, float(y))
+
+    from_floats = staticmethod(_point)
 
     @classmethod
     def new(cls, xy):
+        if type(xy) is Point:
+            return xy
         return Point(xy[0], xy[1])
 
     def normal(self):
@@ -21,14 +44,14 @@ class Point:
         Make a pi/2 rotation of Point
         :return: another Point
         """
-        return Point(-self.y, self.x)
+        return _point(-self.y, self.x)
 
     def reverse(self):
         """
         Inverse Point x -> -x, y -> -y
         :return: another Point
         """
-        return Point(-self.x, -self.y)
+        return _point(-self.x, -self.y)
 
     def normalize(self, d=0):
         """
@@ -39,7 +62,7 @@ class Point:
         """
         if d == 0:
             d = sqrt(self.x * self.x + self.y * self.y)
-        return Point(self.x / d, self.y / d)
+        return _point(self.x / d, self.y / d)
 
     def scalar_product(self, other: 'Point'):
         return self.x * other.x + self.y * other.y
@@ -57,20 +80,20 @@ class Point:
     def __add__(self, other: 'Point'):
         r = NotImplemented
         if isinstance(other, Point):
-            r = Point(self.x + other.x, self.y + other.y)
+            r = _point(self.x + other.x, self.y + other.y)
         return r
 
     def __sub__(self, other: 'Point'):
         r = NotImplemented
         if isinstance(other, Point):
-            r = Point(self.x - +other.x, self.y - other.y)
+            r = _point(self.x - other.x, self.y - other.y)
         return r
 
     def __mul__(self, other):
         r = NotImplemented
         if isinstance(other, float) or isinstance(other, int):
             factor = float(other)
-            r = Point(self.x * factor, self.y * factor)
+            r = _point(self.x * factor, self.y * factor)
         return r
 
     def __eq__(self, other: 'Point'):
@@ -81,6 +104,26 @@ class Point:
             r = isclose(self.x, other.x, abs_tol=1e-9) and isclose(self.y, other.y, abs_tol=1e-9)
         return r
 
+    # equality within tolerance is not transitive: no hash can be consistent with it
+    __hash__ = None
+
+    def key(self, ndigits: int = 9) -> tuple:
+        """
+        Coordinates rounded to ndigits decimals, to key dicts or sets on Points
+        :param ndigits: number of decimals
+        :return: tuple of rounded x and y
+        """
+        return round(self.x, ndigits), round(self.y, ndigits)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, key):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return Point, (self.x, self.y)
+
     def __repr__(self):
         return f'p({self.x}, {self.y})'
 
@@ -90,6 +133,218 @@ class Point:
         dy = a.y - b.y
         return sqrt(dx * dx + dy * dy)
 
+
+_new_object = object.__new__
+_set_x = Point.x.__set__
+_set_y = Point.y.__set__
+
+
+class PointView(Point):
+    """
+    Read-only Point backed by a row of a PointArray, without copy.
+    """
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        _set_row(self, row)
+
+    @property
+    def x(self):
+        return float(self._row[0])
+
+    @property
+    def y(self):
+        return float(self._row[1])
+
+
+_set_row = PointView._row.__set__
+
+
+class PointArray:
+    """
+    Batch of Points stored as a contiguous float64 N x 2 array.
+    Operations mirror Point ones, but work on all points at once.
+    """
+    REL_TOL = 1e-9
+    ABS_TOL = 1e-9
+
+    def __init__(self, xy):
+        self.xy = np.ascontiguousarray(xy, dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def new(cls, positions):
+        """
+        Builds a PointArray from a sequence of xy pairs
+        :param positions: sequence of xy pairs or Points, N x 2 array, or PointArray
+        :return: PointArray
+        """
+        return cls(_as_xy(positions))
+
+    @classmethod
+    def from_points(cls, points):
+        xy = np.empty((len(points), 2), dtype=np.float64)
+        xy[:, 0] = [p.x for p in points]
+        xy[:, 1] = [p.y for p in points]
+        return cls(xy)
+
+    @property
+    def x(self):
+        return self.xy[:, 0]
+
+    @property
+    def y(self):
+        return self.xy[:, 1]
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return PointView(self.xy[item])
+        return PointArray(self.xy[item])
+
+    def __iter__(self):
+        for row in self.xy:
+            yield PointView(row)
+
+    def to_points(self):
+        """
+        Copies points to a list of independent Points
+        :return: list of Points
+        """
+        return [_point(x, y) for x, y in self.xy.tolist()]
+
+    def normal(self):
+        """
+        Make a pi/2 rotation of all points
+        :return: another PointArray
+        """
+        return PointArray(np.column_stack((-self.xy[:, 1], self.xy[:, 0])))
+
+    def reverse(self):
+        return PointArray(-self.xy)
+
+    def norm(self):
+        x = self.xy[:, 0]
+        y = self.xy[:, 1]
+        return np.sqrt(x * x + y * y)
+
+    def normalize(self, d=0):
+        """
+        Normalize vectors compared to distance d.
+        if d is 0, d is the norm of each Point
+        :param d: scalar or array of N distances
+        :return: another PointArray
+        """
+        if np.isscalar(d) and d == 0:
+            d = self.norm()
+        return PointArray(self.xy / np.reshape(d, (-1, 1)))
+
+    def scalar_product(self, other):
+        other = _as_xy(other)
+        return self.xy[:, 0] * other[..., 0] + self.xy[:, 1] * other[..., 1]
+
+    def vectorial_product(self, other):
+        other = _as_xy(other)
+        return self.xy[:, 0] * other[..., 1] - self.xy[:, 1] * other[..., 0]
+
+    def is_orthogonal(self, other):
+        return _isclose(self.scalar_product(other), 0., PointArray.REL_TOL, 0.)
+
+    def is_collinear(self, other):
+        return _isclose(self.vectorial_product(other), 0., PointArray.REL_TOL, 0.)
+
+    def equals(self, other):
+        """
+        Tolerance-based equality, point by point, as Point.__eq__ does
+        :param other: PointArray, Point or xy pair
+        :return: array of N booleans
+        """
+        other = _as_xy(other)
+        return _isclose(self.xy[:, 0], other[..., 0], PointArray.REL_TOL, PointArray.ABS_TOL) \
+            & _isclose(self.xy[:, 1], other[..., 1], PointArray.REL_TOL, PointArray.ABS_TOL)
+
+    def __add__(self, other):
+        if isinstance(other, (PointArray, Point)):
+            return PointArray(self.xy + _as_xy(other))
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, (PointArray, Point)):
+            return PointArray(self.xy - _as_xy(other))
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, (float, int)):
+            return PointArray(self.xy * float(other))
+        if isinstance(other, np.ndarray):
+            return PointArray(self.xy * other.reshape(-1, 1))
+        return NotImplemented
+
+    def __eq__(self, other):
+        if isinstance(other, (PointArray, Point)):
+            return bool(np.all(self.equals(other)))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'points({len(self)})'
+
+    @staticmethod
+    def distance(a, b):
+        """
+        Distances between points of a and b, point by point
+        :param a: PointArray or Point
+        :param b: PointArray or Point
+        :return: array of distances
+        """
+        d = _as_xy(a) - _as_xy(b)
+        dx = d[..., 0]
+        dy = d[..., 1]
+        return np.sqrt(dx * dx + dy * dy)
+
+
+def _as_xy(value):
+    if isinstance(value, PointArray):
+        return value.xy
+    if isinstance(value, Point):
+        return np.array((value.x, value.y), dtype=np.float64)
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], Point):
+        return PointArray.from_points(value).xy
+    return np.asarray(value, dtype=np.float64)
+
+
+def _isclose(a, b, rel_tol, abs_tol):
+    """math.isclose semantics, element-wise"""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    diff = np.abs(a - b)
+    return diff <= np.maximum(rel_tol * np.maximum(np.abs(a), np.abs(b)), abs_tol)
+
+
+def turns(vectors):
+    """
+    Turns between consecutive unit vectors, element-wise: direction changes unless
+    vectors are parallel and in the same direction, as for Navigator._is_straight,
+    by the angle of an Arc on the spot from one vector to the next
+    :param vectors: N x 2 array of unit vectors
+    :return: array of N - 1 booleans, True where direction changes, array of N - 1 angles
+    in [0, pi], 0 where direction does not change, and array of N - 1 booleans,
+    True for turns to the left
+    """
+    u, w = vectors[:-1], vectors[1:]
+    cross = u[:, 0] * -w[:, 1] + u[:, 1] * w[:, 0]
+    cos_ = u[:, 0] * w[:, 0] + u[:, 1] * w[:, 1]
+    changes = ~((cross == 0) & (cos_ > 0))
+    # unit vectors may give |cos| slightly above 1 by rounding
+    cos_ = np.where(_isclose(np.fabs(cos_), 1., 1e-9, 0.), np.copysign(1., cos_), cos_)
+    # math.acos, as Arc uses, which may differ from np.arccos by rounding
+    angles = np.zeros(len(cos_))
+    angles[changes] = list(map(acos, np.clip(cos_[changes], -1., 1.).tolist()))
+    return changes, angles, cross < 0
+
+
 class Line:
     def __init__(self, point: Point, vector: Point):
         self.point = point
@@ -98,7 +353,7 @@ class Line:
     def contains(self, point: Point):
         a = self.point
         b = point
-        v_ab = Point(a.x - b.x, a.y - b.y)
+        v_ab = _point(a.x - b.x, a.y - b.y)
         return v_ab.is_collinear(self.vector)
 
     def intersection(self, line: 'Line') -> 'Point':
@@ -131,6 +386,11 @@ class Line:
         return f'line({self.point}, {self.vector})'
 
 class Arc:
+    """
+    Arc from start to end, tangent to start_tangent at start.
+    Center and radius are computed, and checked, on construction; angle, direction
+    and length are computed on first access, then kept.
+    """
     INDIRECT = "indirect"
     DIRECT = "direct"
 
@@ -147,24 +407,60 @@ class Arc:
         self.check_center_and_tangents_coherence()
 
         self.radius = Point.distance(self.center, self.start)
-        distance = Point.distance(start, end)
+
+    @cached_property
+    def angle(self) -> float:
+        distance = Point.distance(self.start, self.end)
         if distance:
-            self.angle = 2 * asin(distance / (2 * self.radius))
+            angle = 2 * asin(distance / (2 * self.radius))
         else:
-            self.angle = acos(start_tangent.scalar_product(end_tangent))
-
-        self.direction = Arc.compute_direction(self)
+            cos_ = self.start_tangent.scalar_product(self.end_tangent)
+            if isclose(fabs(cos_), 1.):
+                # unit tangents may give |cos| slightly above 1 by rounding
+                cos_ = math.copysign(1., cos_)
+            angle = acos(cos_)
         if self.direction is Arc.INDIRECT:
-            self.angle = self.angle - 2*pi
-        self.length = math.fabs(self.angle * pi * self.radius)
+            angle = angle - 2*pi
+        return angle
+
+    @cached_property
+    def direction(self) -> str:
+        return Arc.compute_direction(self)
 
+    @cached_property
+    def length(self) -> float:
+        if self.radius == 0:
+            # arcs on the spot, no need of their angle
+            return 0.
+        # the distance along the arc
+        return math.fabs(self.angle * self.radius)
+
+    @classmethod
+    def _from_parts(cls, start, end, start_tangent, end_tangent, center, radius, angle, direction, length=None):
+        """
+        Arc from already computed attributes, without checks.
+        length, if not given, is computed on first access, as for any Arc.
+        :return: Arc
+        """
+        arc = _new_object(cls)
+        arc.start = start
+        arc.end = end
+        arc.start_tangent = start_tangent
+        arc.end_tangent = end_tangent
+        arc.center = center
+        arc.radius = radius
+        arc.angle = angle
+        arc.direction = direction
+        if length is not None:
+            arc.length = length
+        return arc
 
     @staticmethod
     def compute_center_from_both_tangents(p0, p1, tangent_p0, tangent_p1):
         try:
             center = Arc.compute_intersection_with_each_tangent(p0, p1, tangent_p0, tangent_p1)
         except ValueError:
-            center = Point((p1.x + p0.x) / 2, (p1.y + p0.y) / 2)
+            center = _point((p1.x + p0.x) / 2, (p1.y + p0.y) / 2)
 
         assert isclose(Point.distance(p0, center), Point.distance(p1, center))
         return center
@@ -195,7 +491,7 @@ class Arc:
         v = tangent
 
         distance = Point.distance(a, b)
-        u = Point(b.x - a.x, b.y - a.y)
+        u = _point(b.x - a.x, b.y - a.y)
         u = u.normalize(distance)
         v = v.normalize()
         angle = acos(u.scalar_product(v))
@@ -224,6 +520,112 @@ class Arc:
 
 
 
+class ArcBatch:
+    """
+    Vectorized construction of many Arcs at once.
+    Computes the same attributes as Arc, as arrays, but instead of raising
+    on the first bad arc, each element gets an error code in `errors`.
+    Attributes of elements in error are NaN.
+    """
+    OK = 0
+    DEGENERATE = 1
+    NOT_EQUIDISTANT = 2
+    INCOHERENT_TANGENTS = 3
+    OUT_OF_DOMAIN = 4
+
+    def __init__(self, starts, ends, start_tangents, end_tangents=None):
+        self.start = PointArray(_as_xy(starts))
+        self.end = PointArray(_as_xy(ends))
+        self.start_tangent = PointArray(_as_xy(start_tangents))
+        self.errors = np.zeros(len(self.start), dtype=np.int8)
+
+        with np.errstate(all='ignore'):
+            if end_tangents is None:
+                end_tangents = ArcBatch._get_symmetrical(self.start_tangent.xy, self.start.xy - self.end.xy)
+            self.end_tangent = PointArray(_as_xy(end_tangents))
+            self._compute()
+
+        failed = self.errors != ArcBatch.OK
+        for values in (self.center.xy, self.radius, self.angle, self.length):
+            values[failed] = np.nan
+
+    def _compute(self):
+        sx, sy = self.start.x, self.start.y
+        ex, ey = self.end.x, self.end.y
+        stx, sty = self.start_tangent.x, self.start_tangent.y
+        etx, ety = self.end_tangent.x, self.end_tangent.y
+
+        # center, as intersection of radial lines
+        n0 = np.sqrt(sty * sty + stx * stx)
+        n1 = np.sqrt(ety * ety + etx * etx)
+        v0x, v0y = -sty / n0, stx / n0
+        v1x, v1y = -ety / n1, etx / n1
+        degenerate = ~(np.isfinite(v0x) & np.isfinite(v0y) & np.isfinite(v1x) & np.isfinite(v1y))
+
+        v1_v0 = v1x * v0x + v1y * v0y
+        dpx, dpy = ex - sx, ey - sy
+        dp_v0 = dpx * v0x + dpy * v0y
+        dp_v1 = dpx * v1x + dpy * v1y
+        parallel = _isclose(np.fabs(v1_v0), 1., 1e-9, 0.)
+        coef0 = (dp_v0 - dp_v1 * v1_v0) / (1 - v1_v0 * v1_v0)
+        cx = np.where(parallel, (ex + sx) / 2, v0x * coef0 + sx)
+        cy = np.where(parallel, (ey + sy) / 2, v0y * coef0 + sy)
+        self.center = PointArray(np.column_stack((cx, cy)))
+
+        self.radius = PointArray.distance(self.center, self.start)
+        not_equidistant = ~_isclose(PointArray.distance(self.start, self.center),
+                                    PointArray.distance(self.end, self.center), 1e-9, 0.)
+
+        v_start = (sx - cx) * sty - (sy - cy) * stx
+        v_end = (ex - cx) * ety - (ey - cy) * etx
+        incoherent = ~_isclose(v_start, v_end, 1e-9, 0.)
+
+        # angle, from chord if any, else from tangents
+        distance = PointArray.distance(self.start, self.end)
+        sine = distance / (2 * self.radius)
+        cosine = stx * etx + sty * ety
+        cosine = np.where(_isclose(np.fabs(cosine), 1., 1e-9, 0.), np.copysign(1., cosine), cosine)
+        chord = distance != 0
+        out_of_domain = np.where(chord, np.fabs(sine) > 1, np.fabs(cosine) > 1)
+        angle = np.where(chord, 2 * np.arcsin(sine), np.arccos(cosine))
+
+        v = (cx - sx) * sty - (cy - sy) * stx
+        self.indirect = v > 0
+        self.angle = np.where(self.indirect, angle - 2 * pi, angle)
+        self.length = np.fabs(self.angle * self.radius)
+
+        # first failing check wins, as Arc raises on the first one
+        self.errors[out_of_domain] = ArcBatch.OUT_OF_DOMAIN
+        self.errors[incoherent] = ArcBatch.INCOHERENT_TANGENTS
+        self.errors[not_equidistant] = ArcBatch.NOT_EQUIDISTANT
+        self.errors[degenerate] = ArcBatch.DEGENERATE
+
+    @staticmethod
+    def _get_symmetrical(vectors, axes):
+        """Vectorized Geometry.get_symmetrical"""
+        ax, ay = axes[:, 0], axes[:, 1]
+        norm = np.sqrt(ax * ax + ay * ay)
+        cos_, sin_ = ax / norm, ay / norm
+        vx, vy = vectors[:, 0], vectors[:, 1]
+        x = vx * cos_ + vy * sin_
+        y = -(- vx * sin_ + vy * cos_)
+        return np.column_stack((x * cos_ + y * -sin_, - x * -sin_ + y * cos_))
+
+    @property
+    def direction(self):
+        return np.where(self.indirect, Arc.INDIRECT, Arc.DIRECT)
+
+    @property
+    def valid(self):
+        return self.errors == ArcBatch.OK
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __repr__(self):
+        return f'arcs({len(self)}, errors={int(np.count_nonzero(self.errors))})'
+
+
 class Geometry:
 
     @staticmethod
@@ -233,14 +635,14 @@ class Geometry:
         sin_ = reference.y
         x = vector.x * cos_ + vector.y * sin_
         y = - vector.x * sin_ + vector.y * cos_
-        return Point(x, y)
+        return _point(x, y)
 
 
     @staticmethod
     def get_symmetrical(vector, axe):
         symmetrical = Geometry.transpose_rotation_relative_to(vector, axe)
-        symmetrical = Point(symmetrical.x, -symmetrical.y)
-        return Geometry.transpose_rotation_relative_to(symmetrical, Point(axe.x, - axe.y))
+        symmetrical = _point(symmetrical.x, -symmetrical.y)
+        return Geometry.transpose_rotation_relative_to(symmetrical, _point(axe.x, - axe.y))
 
 
 
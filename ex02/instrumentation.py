@@ -0,0 +1,323 @@
+import bisect
+import inspect
+import math
+import time
+
+from ex02.motion import Translation
+
+"""
+Module for opt-in instrumentation of robots: latencies, steps and call counts
+"""
+
+
+class Histogram:
+    """
+    Distribution of observed values in buckets of upper bounds, as Prometheus histograms
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self):
+        """
+        Counts of values lower or equal to each bucket bound, then to +Inf
+        :return: list of (bound, count)
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class Counter:
+
+    def __init__(self):
+        self.count = 0
+
+    def inc(self, value: int = 1):
+        self.count += value
+
+
+class Instrumentation:
+    """
+    Records, for the robots it is attached to:
+    - command_latency_seconds: exchange latency per telecom command
+    - load_positions_seconds, compute_motions_seconds: loading latencies
+    - motion_seconds, motion_steps: wall time and time steps per motion, per kind
+    - wheel_runs_total, wheel_steps_total: wheel commands and the time steps they run, per wheel,
+      with wheel_runs_per_second since attach; commands written to a WheelBuffer at once, for
+      all the time steps of a motion, count as one per wheel
+    Instrumented methods are wrapped on the components instances by attach, and restored by
+    detach, so that components not attached run as they are, without any overhead. Plans run
+    are recorded by a MotionController plan listener. A robot is instrumented once at a time.
+    """
+    PREFIX = 'ex02_'
+    LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1., 10., 100.)
+    STEP_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+    def __init__(self, timer=time.perf_counter):
+        self.timer = timer
+        self.histograms = {}
+        self.counters = {}
+        self.attached_at = None
+        self._patches = []
+        self._listeners = []
+
+    def histogram(self, name: str, buckets=LATENCY_BUCKETS, **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(buckets)
+        return histogram
+
+    def counter(self, name: str, **labels) -> Counter:
+        key = (name, tuple(sorted(labels.items())))
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = Counter()
+        return counter
+
+    def attach(self, robot: 'Robot'):
+        """
+        Instruments robot and its components
+        :param robot: Robot
+        :return: self, to be used in a with block detaching it on exit
+        """
+        if getattr(robot, '_instrumentation', None) is not None:
+            raise ValueError(f'{robot} is already instrumented, detach its instrumentation first')
+        self._patch(robot, '_instrumentation', self)
+        if self.attached_at is None:
+            self.attached_at = self.timer()
+        self._patch(robot, 'load_positions', self._timed(robot.load_positions,
+                                                         self.histogram('load_positions_seconds')))
+        navigator = robot.navigator
+        self._patch(navigator, 'compute_motions', self._timed(navigator.compute_motions,
+                                                              self.histogram('compute_motions_seconds')))
+        self._attach_transmitter(robot.transmitter)
+        self._attach_motion_controller(robot.motion_controller)
+        return self
+
+    def _attach_transmitter(self, transmitter):
+        for attribute in ('_handlers', '_async_handlers'):
+            handlers = getattr(transmitter, attribute, None)
+            if handlers is None:
+                continue
+            for name, handler in list(handlers.items()):
+                histogram = self.histogram('command_latency_seconds', command=name)
+                if inspect.iscoroutinefunction(handler):
+                    wrapper = self._timed_async(handler, histogram)
+                else:
+                    wrapper = self._timed(handler, histogram)
+                self._patch_item(handlers, name, wrapper)
+
+    def _attach_motion_controller(self, motion_controller):
+        move = motion_controller.move
+        timer = self.timer
+
+        seconds = {kind: self.histogram('motion_seconds', kind=kind) for kind in _KINDS}
+        steps = {kind: self.histogram('motion_steps', Instrumentation.STEP_BUCKETS, kind=kind) for kind in _KINDS}
+
+        def instrumented_move(motion, energy_supplier):
+            start = timer()
+            try:
+                return move(motion, energy_supplier)
+            finally:
+                seconds[_kind(motion)].observe(timer() - start)
+
+        def observe_plan(plan, motion):
+            steps[_kind(motion)].observe(plan.steps)
+
+        self._patch(motion_controller, 'move', instrumented_move)
+        motion_controller.add_plan_listener(observe_plan)
+        self._listeners.append((motion_controller, observe_plan))
+        for name, wheel in (('right', motion_controller.right_wheel), ('left', motion_controller.left_wheel)):
+            self._attach_wheel(wheel, name)
+        buffer = motion_controller.wheel_buffer()
+        if buffer is not None:
+            self._attach_wheel_buffer(buffer)
+
+    def _attach_wheel_buffer(self, buffer):
+        fill = buffer.fill
+        extend = buffer.extend
+        counters = [(self.counter('wheel_runs_total', wheel=name), self.counter('wheel_steps_total', wheel=name))
+                    for name in ('right', 'left')]
+
+        def count(steps):
+            for runs, wheel_steps in counters:
+                runs.count += 1
+                wheel_steps.count += steps
+
+        def instrumented_fill(steps, right, left):
+            count(steps)
+            return fill(steps, right, left)
+
+        def instrumented_extend(right, left):
+            count(len(right))
+            return extend(right, left)
+
+        self._patch(buffer, 'fill', instrumented_fill)
+        self._patch(buffer, 'extend', instrumented_extend)
+
+    def _attach_wheel(self, wheel, name):
+        run = wheel.run
+        run_steps = wheel.run_steps
+        runs = self.counter('wheel_runs_total', wheel=name)
+        steps = self.counter('wheel_steps_total', wheel=name)
+
+        in_run_steps = False
+
+        def instrumented_run(length):
+            if not in_run_steps:
+                runs.count += 1
+                steps.count += 1
+            return run(length)
+
+        # Wheel.run_steps runs steps with run, that are not counted again
+        def instrumented_run_steps(length, count):
+            nonlocal in_run_steps
+            runs.count += 1
+            steps.count += count
+            in_run_steps = True
+            try:
+                return run_steps(length, count)
+            finally:
+                in_run_steps = False
+
+        self._patch(wheel, 'run', instrumented_run)
+        self._patch(wheel, 'run_steps', instrumented_run_steps)
+
+    def detach(self):
+        """
+        Restores instrumented methods, keeping recorded metrics
+        :return:
+        """
+        for motion_controller, listener in self._listeners:
+            motion_controller.remove_plan_listener(listener)
+        for owner, name, original in reversed(self._patches):
+            if isinstance(owner, dict):
+                owner[name] = original
+            elif original is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._listeners = []
+        self._patches = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.detach()
+
+    def _patch(self, owner, name, wrapper):
+        self._patches.append((owner, name, vars(owner).get(name, _MISSING)))
+        setattr(owner, name, wrapper)
+
+    def _patch_item(self, owner: dict, name, wrapper):
+        self._patches.append((owner, name, owner[name]))
+        owner[name] = wrapper
+
+    def _timed(self, function, histogram):
+        timer = self.timer
+        observe = histogram.observe
+
+        def timed(*args, **kwargs):
+            start = timer()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(timer() - start)
+        return timed
+
+    def _timed_async(self, function, histogram):
+        timer = self.timer
+        observe = histogram.observe
+
+        async def timed(*args, **kwargs):
+            start = timer()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                observe(timer() - start)
+        return timed
+
+    def snapshot(self) -> dict:
+        """
+        Metrics recorded so far
+        :return: dict of metric name to list of series, with their labels
+        """
+        metrics = {}
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            metrics.setdefault(name, []).append({
+                'labels': dict(labels),
+                'count': histogram.count,
+                'sum': histogram.sum,
+                'buckets': histogram.cumulative_counts(),
+            })
+        elapsed = None if self.attached_at is None else self.timer() - self.attached_at
+        for (name, labels), counter in sorted(self.counters.items()):
+            metrics.setdefault(name, []).append({'labels': dict(labels), 'value': counter.count})
+            if name == 'wheel_runs_total' and elapsed:
+                metrics.setdefault('wheel_runs_per_second', []).append(
+                    {'labels': dict(labels), 'value': counter.count / elapsed})
+        return metrics
+
+    def to_prometheus(self) -> str:
+        """
+        Metrics in Prometheus text exposition format
+        :return: str
+        """
+        lines = []
+        for name, series in self.snapshot().items():
+            metric = Instrumentation.PREFIX + name
+            if 'buckets' in series[0]:
+                lines.append(f'# TYPE {metric} histogram')
+                for s in series:
+                    for bound, count in s['buckets']:
+                        le = '+Inf' if bound == math.inf else repr(float(bound))
+                        lines.append(f'{metric}_bucket{_labels(s["labels"], le=le)} {count}')
+                    lines.append(f'{metric}_sum{_labels(s["labels"])} {s["sum"]!r}')
+                    lines.append(f'{metric}_count{_labels(s["labels"])} {s["count"]}')
+            else:
+                lines.append(f'# TYPE {metric} {"counter" if name.endswith("_total") else "gauge"}')
+                for s in series:
+                    lines.append(f'{metric}{_labels(s["labels"])} {s["value"]!r}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Writes metrics to a file, for a node exporter textfile collector
+        :param path: file path
+        :return:
+        """
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus())
+
+
+_MISSING = object()
+_KINDS = ('translation', 'rotation_on_spot', 'rotation_on_center', 'unknown')
+
+
+def _kind(motion) -> str:
+    if isinstance(motion, Translation):
+        return 'translation'
+    if motion is None:
+        return 'unknown'
+    return 'rotation_on_spot' if motion.is_on_the_spot() else 'rotation_on_center'
+
+
+def _labels(labels: dict, **extra) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
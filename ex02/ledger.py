@@ -0,0 +1,151 @@
+import time
+
+import numpy as np
+
+"""
+Module for energy consumption history
+"""
+
+
+class EnergyLedger:
+    """
+    Energy consumed per motion, kept in a ring buffer of capacity entries, the
+    oldest ones being overwritten. Entries are stored as arrays of start times,
+    quantities and cumulative quantities, so that consumption over a range of
+    motions or a time window is a difference of cumulative quantities.
+    Debits go to the entry of the current motion, opened by open: they are
+    summed in a float, and stored when the entry is read or the next one opened.
+    Motions are numbered from 0 in opening order, including overwritten ones.
+    """
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, timer=time.monotonic):
+        self.capacity = capacity
+        self.timer = timer
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.quantities = np.zeros(capacity, dtype=np.float64)
+        self.cumulative = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+        self.total = 0.
+        self._pending = 0.
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def first(self) -> int:
+        """Index of the oldest motion still in the ledger"""
+        return self.count - len(self)
+
+    def open(self, at: float = None):
+        """
+        Opens the entry of a new motion
+        :param at: start time of the motion, timer time by default
+        :return: index of the motion
+        """
+        self._flush()
+        slot = self.count % self.capacity
+        self.times[slot] = self.timer() if at is None else at
+        self.quantities[slot] = 0.
+        self.cumulative[slot] = self.total
+        self.count += 1
+        return self.count - 1
+
+    def debit(self, quantity: float):
+        """
+        Debits quantity to the current motion, opening one if there is none
+        :param quantity: consumed energy, possibly aggregated over many time steps
+        :return:
+        """
+        if self.count == 0:
+            self.open()
+        self._pending += quantity
+        self.total += quantity
+
+    def extend(self, quantities, times):
+        """
+        Records motions at once, as open and debit would one by one
+        :param quantities: array of energies consumed by motions
+        :param times: array of their start times, in increasing order
+        :return:
+        """
+        self._flush()
+        quantities = np.asarray(quantities, dtype=np.float64)
+        times = np.asarray(times, dtype=np.float64)
+        cumulative = np.cumsum(quantities) + self.total
+        kept = slice(max(len(quantities) - self.capacity, 0), len(quantities))
+        slots = (self.count + np.arange(len(quantities))[kept]) % self.capacity
+        self.times[slots] = times[kept]
+        self.quantities[slots] = quantities[kept]
+        self.cumulative[slots] = cumulative[kept]
+        self.count += len(quantities)
+        if len(cumulative):
+            self.total = float(cumulative[-1])
+
+    def _flush(self):
+        if self._pending:
+            slot = (self.count - 1) % self.capacity
+            self.quantities[slot] += self._pending
+            self.cumulative[slot] = self.total
+            self._pending = 0.
+
+    def _slot(self, motion: int) -> int:
+        if not self.first <= motion < self.count:
+            raise IndexError(f'motion {motion} is not in ledger, from {self.first} to {self.count - 1}')
+        return motion % self.capacity
+
+    def _before(self, motion: int) -> float:
+        """Cumulative quantity before motion"""
+        if motion == self.count:
+            return self.total
+        slot = self._slot(motion)
+        return float(self.cumulative[slot] - self.quantities[slot])
+
+    def consumed(self, first: int, last: int = None) -> float:
+        """
+        Energy consumed by motions from first to last excluded
+        :param first: motion index
+        :param last: motion index, or None for up to the current one included
+        :return: energy
+        """
+        self._flush()
+        if last is None:
+            last = self.count
+        return self._before(last) - self._before(first)
+
+    def find(self, at: float) -> int:
+        """
+        First motion started at or after time at
+        :param at: time
+        :return: motion index, count if there is none
+        """
+        self._flush()
+        size = len(self)
+        head = self.first % self.capacity
+        older = self.times[head:min(head + size, self.capacity)]
+        i = int(np.searchsorted(older, at))
+        if i < len(older):
+            return self.first + i
+        newer = self.times[:max(head + size - self.capacity, 0)]
+        return self.first + len(older) + int(np.searchsorted(newer, at))
+
+    def consumed_between(self, start: float, end: float) -> float:
+        """
+        Energy consumed by motions started in time window [start, end[
+        :param start: time
+        :param end: time
+        :return: energy
+        """
+        return self.consumed(self.find(start), self.find(end))
+
+    def history(self):
+        """
+        Motions of the ledger, oldest first
+        :return: arrays of motion indices, start times and quantities
+        """
+        self._flush()
+        slots = np.arange(self.first, self.count) % self.capacity
+        return np.arange(self.first, self.count), self.times[slots], self.quantities[slots]
+
+    def __repr__(self):
+        return f'ledger(motions={self.count}, kept={len(self)}/{self.capacity}, total={self.total})'
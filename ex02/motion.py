@@ -1,13 +1,38 @@
+from functools import cached_property
+
 from ex02.geometry import Point, Arc
 
 
 class Translation:
+    """
+    Translation from start to end. Its length and unit vector are computed
+    on first access, then kept, so that summing lengths does not normalize vectors.
+    """
 
     def __init__(self, start, end):
         self.start = start
         self.end = end
-        self.length = self._get_length()
-        self.vector = (end - start).normalize()
+
+    @cached_property
+    def length(self) -> float:
+        return self._get_length()
+
+    @cached_property
+    def vector(self) -> Point:
+        return (self.end - self.start).normalize()
+
+    @classmethod
+    def _from_parts(cls, start, end, length, vector):
+        """
+        Translation from already computed length and unit vector
+        :return: Translation
+        """
+        translation = object.__new__(cls)
+        translation.start = start
+        translation.end = end
+        translation.length = length
+        translation.vector = vector
+        return translation
 
     def _get_length(self):
         return Point.distance(self.start, self.end)
@@ -27,6 +52,16 @@ class Rotation:
     def __init__(self, start: Point, end: Point, start_vector: Point, end_vector: Point):
         self.arc = Arc(start, end, start_vector, end_vector)
 
+    @classmethod
+    def _from_arc(cls, arc: Arc):
+        """
+        Rotation along an already built arc
+        :return: Rotation
+        """
+        rotation = object.__new__(cls)
+        rotation.arc = arc
+        return rotation
+
     def get_length(self):
         return self.arc.length
 
@@ -0,0 +1,164 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+"""
+Module for precomputed execution plans of motions
+"""
+
+
+class StepPlan:
+    """
+    Compiled execution of a motion: the wheels run right_len_step and
+    left_len_step, and consumption_per_step energy is consumed, steps times.
+    """
+
+    def __init__(self, steps: int, right_len_step: float, left_len_step: float, consumption_per_step: float):
+        self.steps = steps
+        self.right_len_step = right_len_step
+        self.left_len_step = left_len_step
+        self.consumption_per_step = consumption_per_step
+
+    def get_required_energy(self) -> float:
+        return self.steps * self.consumption_per_step
+
+    def __repr__(self):
+        return f'plan(steps={self.steps}, right={self.right_len_step}, left={self.left_len_step}, ' \
+               f'consumption={self.consumption_per_step})'
+
+
+class ProfilePlan:
+    """
+    Compiled execution of a motion following a velocity profile: at time step i,
+    the wheels run right_len_steps[i] and left_len_steps[i], and consumptions[i]
+    energy is consumed.
+    """
+
+    def __init__(self, right_len_steps, left_len_steps, consumptions):
+        self.right_len_steps = right_len_steps
+        self.left_len_steps = left_len_steps
+        self.consumptions = consumptions
+
+    @property
+    def steps(self) -> int:
+        return len(self.consumptions)
+
+    def get_required_energy(self) -> float:
+        return float(self.consumptions.sum())
+
+    def __repr__(self):
+        return f'profile(steps={self.steps}, right={float(self.right_len_steps.sum())}, ' \
+               f'left={float(self.left_len_steps.sum())}, consumption={self.get_required_energy()})'
+
+
+class RouteProfile:
+    """
+    Execution plans of the motions of a route, with the route duration
+    """
+
+    def __init__(self, plans, time_step: float):
+        self.plans = plans
+        self.duration = sum(plan.steps for plan in plans) * time_step
+
+    def get_required_energy(self) -> float:
+        return sum(plan.get_required_energy() for plan in self.plans)
+
+    def __repr__(self):
+        return f'route_profile(motions={len(self.plans)}, duration={self.duration})'
+
+
+def trapezoidal_profile(length: float, start_speed: float, end_speed: float, max_speed: float,
+                        acceleration: float, time_step: float):
+    """
+    Lengths run at each time step by a trapezoidal velocity profile: accelerating from
+    start_speed up to max_speed at most, cruising, and decelerating to end_speed.
+    Speeds have to be reachable from each other over length; the last step is
+    shorter when length is run before its end.
+    :param length: length to run
+    :param start_speed: speed at start
+    :param end_speed: speed at end
+    :param max_speed: speed limit
+    :param acceleration: acceleration and deceleration
+    :param time_step: time step
+    :return: array of lengths, summing to length
+    """
+    for name, value in (('max_speed', max_speed), ('acceleration', acceleration), ('time_step', time_step)):
+        if not value > 0:
+            raise ValueError(f'{name} {value} is not positive')
+    if length <= 0:
+        return np.zeros(0)
+    peak = min(max_speed, math.sqrt((2 * acceleration * length + start_speed ** 2 + end_speed ** 2) / 2))
+    peak = max(peak, start_speed, end_speed)
+    accelerating = (peak - start_speed) / acceleration
+    decelerating = (peak - end_speed) / acceleration
+    accelerating_length = (peak ** 2 - start_speed ** 2) / (2 * acceleration)
+    decelerating_length = (peak ** 2 - end_speed ** 2) / (2 * acceleration)
+    cruising_length = max(length - accelerating_length - decelerating_length, 0.)
+    cruising = cruising_length / peak
+    duration = accelerating + cruising + decelerating
+
+    steps = max(math.ceil(duration / time_step - 1e-9), 1)
+    t = np.minimum(np.arange(1, steps + 1) * time_step, duration)
+    braking = t - accelerating - cruising
+    run = np.where(t <= accelerating, start_speed * t + acceleration * t * t / 2,
+                   np.where(braking <= 0, accelerating_length + peak * (t - accelerating),
+                            accelerating_length + cruising_length + peak * braking
+                            - acceleration * braking * braking / 2))
+    run[-1] = length
+    return np.diff(run, prepend=0.)
+
+
+class StepPlanCache:
+    """
+    LRU cache of StepPlans, keyed on motion geometry.
+    Plans depend on the motion controller configuration too: the cache is
+    cleared whenever the configuration it is used with changes.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.configuration = None
+        self._plans = OrderedDict()
+
+    def get(self, key):
+        """
+        Gets plan for key, or None
+        :param key: motion geometry key
+        :return: StepPlan, or None
+        """
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._plans.move_to_end(key)
+        return plan
+
+    def put(self, key, plan: StepPlan):
+        if self.max_size <= 0:
+            return
+        self._plans[key] = plan
+        if len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+
+    def use_configuration(self, configuration: tuple):
+        """
+        Sets configuration plans are computed with, clearing plans if it changed
+        :param configuration: hashable configuration values
+        :return:
+        """
+        if configuration != self.configuration:
+            self.clear()
+            self.configuration = configuration
+
+    def clear(self):
+        self._plans.clear()
+
+    def __len__(self):
+        return len(self._plans)
+
+    def __repr__(self):
+        return f'plans({len(self)}/{self.max_size}, hits={self.hits}, misses={self.misses})'
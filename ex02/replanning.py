@@ -0,0 +1,78 @@
+import numpy as np
+
+"""
+Module for incremental re-planning of motions, when loaded positions are edited
+"""
+
+
+class Route:
+    """
+    Motions computed from positions, with what is needed to splice them when
+    positions change:
+    - xy: N x 2 array, a snapshot of the positions, see snapshot
+    - kept: indices in xy of the points translations go through, repeated points being skipped
+    - translation_indices: index in motions of each translation, from kept[i] to kept[i + 1]
+    - lengths: array of the lengths of motions, and total_length, their sum, summed again
+      for each route so that it does not drift as routes are spliced
+    """
+
+    def __init__(self, xy, motions, kept, translation_indices, lengths):
+        self.xy = xy
+        self.motions = motions
+        self.kept = kept
+        self.translation_indices = translation_indices
+        self.lengths = lengths
+        self.total_length = float(lengths.sum())
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __repr__(self):
+        return f'route(positions={len(self.xy)}, motions={len(self.motions)}, length={self.total_length})'
+
+
+def diff_positions(old, new):
+    """
+    Lengths of the common prefix and suffix of two positions arrays, compared exactly.
+    Prefix and suffix do not overlap, in either array.
+    :param old: N x 2 array
+    :param new: M x 2 array
+    :return: prefix, suffix
+    """
+    old = _rows(old)
+    new = _rows(new)
+    n = min(len(old), len(new))
+    different = np.flatnonzero(old[:n] != new[:n])
+    prefix = int(different[0]) if len(different) else n
+
+    rest = n - prefix
+    if rest == 0:
+        return prefix, 0
+    different = np.flatnonzero(old[len(old) - rest:] != new[len(new) - rest:])
+    suffix = rest - 1 - int(different[-1]) if len(different) else rest
+    return prefix, suffix
+
+
+def changed_positions(old, new):
+    """
+    Indices of positions differing between two positions arrays of the same length
+    :param old: N x 2 array
+    :param new: N x 2 array
+    :return: array of indices
+    """
+    return np.flatnonzero(_rows(old) != _rows(new))
+
+
+def snapshot(xy):
+    """
+    Positions kept by a route: a copy, so that changes of the positions a route was
+    computed from, in place in a memory mapped route file included, do not change it
+    :param xy: N x 2 array
+    :return: N x 2 array
+    """
+    return np.array(xy, dtype=np.float64)
+
+
+def _rows(xy):
+    """xy pairs as complex numbers, compared in one operation"""
+    return np.ascontiguousarray(xy, dtype=np.float64).view(np.complex128).reshape(-1)
@@ -1,10 +1,20 @@
+import asyncio
+import heapq
 import inspect
 import math
+from collections import deque
 
-from ex02.geometry import Arc
+import numpy as np
+
+from ex02.geometry import Arc, Point, PointArray, turns
+from ex02.ledger import EnergyLedger
 from ex02.motion import Translation, Rotation
-from ex02.telecom import Telecom, Exchanger, Command
-from typing import List
+from ex02.planning import StepPlan, StepPlanCache, ProfilePlan, RouteProfile, trapezoidal_profile
+from ex02.replanning import Route, diff_positions, changed_positions, snapshot
+from ex02.routefile import RouteFile
+from ex02.simulation import SimulationClock, MotionRecord
+from ex02.telecom import Telecom, Exchanger, AsyncExchanger, Command
+from typing import List, Iterable, Iterator, AsyncIterator
 
 
 class RobotComponent:
@@ -41,67 +51,267 @@ class Transmitter(RobotComponent, Exchanger):
         method = self._handlers[cmd.name]
         return method(tc)
 
+    def exchange_many(self, tcs: Iterable[Telecom]) -> List[Telecom]:
+        """
+        Exchanges telecoms in order, as exchange does one by one.
+        Telecoms are dispatched to handlers directly, handler lookup being skipped
+        while commands repeat and short-circuit commands compared by identity, as
+        Enum hashing is slow, unless a subclass overrides exchange: then telecoms
+        go through exchange, as in Exchanger.exchange_many.
+        :param tcs: telecoms
+        :return: answers, up to the short-circuiting one
+        """
+        if not self._dispatches_directly():
+            return Exchanger.exchange_many(self, tcs)
+        handlers = self._handlers
+        moving = Command.MOVING
+        loaded_invalid = Command.LOADED_INVALID
+        answers = []
+        append = answers.append
+        command = handler = None
+        for tc in tcs:
+            if tc.command is not command:
+                command = tc.command
+                handler = handlers[command.name]
+            answer = handler(tc)
+            append(answer)
+            if answer.command is moving or answer.command is loaded_invalid:
+                break
+        return answers
+
+    def iter_exchange(self, tcs: Iterable[Telecom]) -> Iterator[Telecom]:
+        if not self._dispatches_directly():
+            return Exchanger.iter_exchange(self, tcs)
+        return self._dispatch(tcs)
+
+    def _dispatches_directly(self) -> bool:
+        return type(self).exchange is Transmitter.exchange
+
+    def _dispatch(self, tcs):
+        """
+        Answers of handlers, up to the short-circuiting one, as exchange_many
+        """
+        handlers = self._handlers
+        moving = Command.MOVING
+        loaded_invalid = Command.LOADED_INVALID
+        command = handler = None
+        for tc in tcs:
+            if tc.command is not command:
+                command = tc.command
+                handler = handlers[command.name]
+            answer = handler(tc)
+            yield answer
+            if answer.command is moving or answer.command is loaded_invalid:
+                return
+
+    def _is_moving(self) -> bool:
+        return self.robot.is_moving()
+
     def on_READY_FOR_LOADING(self, tc: Telecom) -> Telecom:
-        if self.robot.is_moving():
+        if self._is_moving():
             return Telecom(command=Command.MOVING)
         return Telecom(command=tc.command)
 
     def on_LOADING(self, tc: Telecom) -> Telecom:
-        if self.robot.is_moving():
+        if self._is_moving():
             return Telecom(command=Command.MOVING)
 
-        if not tc.payload:
+        try:
+            positions = RouteFile.resolve(tc.payload)
+        except (OSError, ValueError) as e:
+            return Telecom(command=Command.LOADED_INVALID, errors=[str(e)])
+        if positions is None or len(positions) == 0:
             return Telecom(command=Command.LOADED_INVALID, errors=['no payload'])
 
         try:
-            self.robot.load_positions(tc.payload)
+            self.robot.load_positions(positions)
             return Telecom(command=Command.LOADED_OK)
         except Exception as e:
             return Telecom(command=Command.LOADED_INVALID, errors=[str(e)])
 
     def on_MOVE(self, tc: Telecom) -> Telecom:
+        # the robot's own state: an AsyncTransmitter calls on_MOVE from its move task
+        if self.robot.is_moving():
+            return Telecom(command=Command.MOVING)
         try:
             self.robot.run()
             return Telecom(command=Command.MOVED)
         except Exception as e:
             return Telecom(command=Command.INVALID, errors=[str(e)])
 
+
+class AsyncTransmitter(Transmitter, AsyncExchanger):
+    """
+    Transmitter for asyncio ground links: exchange is a coroutine, so
+    robot.exchange(tc) has to be awaited.
+    MOVE and LOADING run in a worker thread, so that other telecoms are
+    answered while the robot moves, READY_FOR_LOADING with MOVING.
+    """
+    def __init__(self):
+        super().__init__()
+        self._move_task = None
+        self._lock = asyncio.Lock()
+        self._async_handlers = {
+            'LOADING': getattr(self, 'on_LOADING_async'),
+            'MOVE': getattr(self, 'on_MOVE_async')
+        }
+
+    async def exchange(self, tc: Telecom) -> Telecom:
+        cmd = tc.command
+        method = self._async_handlers.get(cmd.name)
+        if method is None:
+            return self._handlers[cmd.name](tc)
+        return await method(tc)
+
+    async def exchange_many(self, tcs: Iterable[Telecom]) -> List[Telecom]:
+        return await AsyncExchanger.exchange_many(self, tcs)
+
+    def iter_exchange(self, tcs: Iterable[Telecom]) -> AsyncIterator[Telecom]:
+        return AsyncExchanger.iter_exchange(self, tcs)
+
+    def _is_moving(self) -> bool:
+        if self._move_task is not None and not self._move_task.done():
+            return True
+        return super()._is_moving()
+
+    async def on_LOADING_async(self, tc: Telecom) -> Telecom:
+        if self._is_moving():
+            return Telecom(command=Command.MOVING)
+        async with self._lock:
+            # a MOVE may have been accepted while waiting for the lock
+            if self._is_moving():
+                return Telecom(command=Command.MOVING)
+            return await asyncio.to_thread(self.on_LOADING, tc)
+
+    async def on_MOVE_async(self, tc: Telecom) -> Telecom:
+        if self._is_moving():
+            return Telecom(command=Command.MOVING)
+        # the move is accepted before waiting for the lock, so that telecoms received meanwhile answer MOVING
+        self._move_task = asyncio.create_task(self._move(tc))
+        return await self._move_task
+
+    async def _move(self, tc: Telecom) -> Telecom:
+        async with self._lock:
+            if super()._is_moving():
+                return Telecom(command=Command.MOVING)
+            return await asyncio.to_thread(self.on_MOVE, tc)
+
+
 class Wheel:
+    """
+    Wheel driver.
+    A wheel declaring MACRO_STEP receives one run_steps command per motion,
+    instead of one run command per time step.
+    """
+    MACRO_STEP = False
 
     def run(self, length):
         pass
 
+    def run_steps(self, length, steps):
+        """
+        Runs length in steps equal time steps, as a single command
+        :param length: total length
+        :param steps: number of time steps
+        :return:
+        """
+        length_step = length / steps
+        for s in range(steps):
+            self.run(length_step)
+
 
 class EnergySupplier(RobotComponent):
-    """Energy supplier is an energy tank"""
+    """
+    Energy supplier is an energy tank.
+    With a ledger, consumption is recorded per motion.
+    """
+    MACRO_STEP = True
 
-    def __init__(self, quantity: float = 1000.0):
+    def __init__(self, quantity: float = 1000.0, ledger: EnergyLedger = None):
         self.quantity = quantity
+        self.ledger = ledger
 
     def consume(self, quantity: float) -> float:
         self.quantity = self.quantity - quantity
+        if self.ledger is not None:
+            self.ledger.debit(quantity)
+
+    def start_motion(self, at: float = None):
+        """
+        Opens the ledger entry of a motion starting
+        :param at: start time, ledger timer time by default
+        :return:
+        """
+        if self.ledger is not None:
+            self.ledger.open(at)
+
+    def consume_steps(self, quantity: float, steps: int):
+        """
+        Consumes quantity over steps time steps, as a single debit
+        :param quantity: total quantity
+        :param steps: number of time steps
+        :return:
+        """
+        self.consume(quantity)
 
     def has_enough(self, quantity: float) -> float:
         return quantity < self.quantity
 
 
+class EnergyBudgetExceeded(ValueError):
+    """
+    Raised when positions can not all be reached with the energy left,
+    index being the one of the first unreachable position.
+    """
+
+    def __init__(self, index: int):
+        super().__init__(f"Not enough energy to reach position {index}")
+        self.index = index
+
+
 class MotionController(RobotComponent):
     CONSUMPTION_PER_LENGTH_UNIT = 1
     DEFAULT_WHEEL_AXIS_LENGTH = 1
     DEFAULT_TIME_STEP = 0.1
     DEFAULT_SPEED = 0.1
+    DEFAULT_STEP_PLAN_CACHE_SIZE = 1024
+    CONFIGURATION_KEYS = ('speed', 'time_step', 'consumption_per_length_unit', 'wheel_axis_length', 'macro_step',
+                          'max_acceleration', 'max_lateral_acceleration')
 
     def __init__(self, right_wheel: Wheel, left_wheel: Wheel, configuration):
         self.right_wheel = right_wheel
         self.left_wheel = left_wheel
-
-        self.speed = configuration.get('speed', MotionController.DEFAULT_SPEED)
-        self.time_step = configuration.get('time_step', MotionController.DEFAULT_TIME_STEP)
-        self.consumption_per_length_unit = configuration.get('consumption_per_length_unit',
-                                                             MotionController.CONSUMPTION_PER_LENGTH_UNIT)
         self.configuration = configuration
+        self._configuration_values = None
+        self._read_configuration()
+        self.step_plans = StepPlanCache(configuration.get('step_plan_cache_size',
+                                                          MotionController.DEFAULT_STEP_PLAN_CACHE_SIZE))
+        self.clock = None
+        self.trace = []
+        self.plan_listeners = []
         super().__init__()
 
+    def _read_configuration(self):
+        """
+        (Re)reads configuration values, when configuration dict has changed.
+        Public entry points call it first, as the configuration dict may be changed at any time.
+        :return:
+        """
+        values = tuple(self.configuration.get(key) for key in MotionController.CONFIGURATION_KEYS)
+        if values == self._configuration_values:
+            return
+        self._configuration_values = values
+        self.speed = self.configuration.get('speed', MotionController.DEFAULT_SPEED)
+        self.time_step = self.configuration.get('time_step', MotionController.DEFAULT_TIME_STEP)
+        self.consumption_per_length_unit = self.configuration.get('consumption_per_length_unit',
+                                                                  MotionController.CONSUMPTION_PER_LENGTH_UNIT)
+        self.wheel_axis_length = self.configuration.get('wheel_axis_length',
+                                                        MotionController.DEFAULT_WHEEL_AXIS_LENGTH)
+        self.macro_step = self.configuration.get('macro_step', False)
+        self.max_acceleration = self.configuration.get('max_acceleration')
+        self.max_lateral_acceleration = self.configuration.get('max_lateral_acceleration')
+        self.profiles = {}
+
     def run_translation(self, translation: 'Translation', energy_supplier: 'EnergySupplier'):
         """
         Runs translation
@@ -109,14 +319,7 @@ class MotionController(RobotComponent):
         :param energy_supplier: EnergySupplier to supply energy for translation
         :return:
         """
-        length = translation.length
-        steps, length_step, duration = self._compute_step_param(length)
-        consumption_per_step = self.get_required_energy_for(length_step)
-
-        for s in range(steps):
-            self.right_wheel.run(length_step)
-            self.left_wheel.run(length_step)
-            energy_supplier.consume(2 * consumption_per_step)
+        self._run_plan(self.get_step_plan(translation), energy_supplier, translation)
 
     def run_rotation(self, rotation: 'Rotation', energy_supplier: 'EnergySupplier'):
         """
@@ -125,16 +328,57 @@ class MotionController(RobotComponent):
         :param energy_supplier:
         :return:
         """
-        wheel_axis = self.configuration.get('wheel_axis_length', MotionController.DEFAULT_WHEEL_AXIS_LENGTH)
+        self._run_plan(self.get_step_plan(rotation), energy_supplier, rotation)
+
+    def get_step_plan(self, motion) -> StepPlan:
+        """
+        Gets the execution plan of motion, from cache when the same motion
+        geometry was already planned with the same configuration
+        :param motion: Translation or Rotation
+        :return: StepPlan
+        """
+        self._read_configuration()
+        return self._step_plan(motion)
+
+    def get_step_plans(self, motions) -> List[StepPlan]:
+        """
+        Gets the execution plans of motions, as get_step_plan
+        :param motions: iterable of Translations and Rotations
+        :return: list of StepPlans
+        """
+        self._read_configuration()
+        return [self._step_plan(motion) for motion in motions]
 
-        if rotation.is_on_the_spot():
-            self._run_rotation_on_spot(rotation, wheel_axis, energy_supplier)
+    def _step_plan(self, motion) -> StepPlan:
+        profile = self.profiles.get(id(motion))
+        if profile is not None and profile[0] is motion:
+            return profile[1]
+        self.step_plans.use_configuration((self.speed, self.time_step,
+                                           self.consumption_per_length_unit, self.wheel_axis_length))
+        if isinstance(motion, Translation):
+            key = ('translation', motion.length)
+        elif motion.is_on_the_spot():
+            key = ('on_spot', motion.arc.angle)
         else:
-            self._run_rotation_on_center(rotation, wheel_axis, energy_supplier)
+            key = ('on_center', motion.arc.angle, motion.arc.radius, motion.arc.direction)
+
+        plan = self.step_plans.get(key)
+        if plan is None:
+            plan = self._compile(motion)
+            self.step_plans.put(key, plan)
+        return plan
+
+    def _compile(self, motion) -> StepPlan:
+        if isinstance(motion, Translation):
+            return self._compile_translation(motion)
+        if motion.is_on_the_spot():
+            return self._compile_rotation_on_spot(motion, self.wheel_axis_length)
+        return self._compile_rotation_on_center(motion, self.wheel_axis_length)
 
     def _compute_step_param(self, length):
         duration = math.fabs(length) / self.speed
-        steps = math.floor(duration / self.time_step)
+        # motions shorter than a time step are run in one step
+        steps = max(math.floor(duration / self.time_step), 1)
         length_step = length / steps
         return steps, length_step, duration
 
@@ -146,18 +390,22 @@ class MotionController(RobotComponent):
         else:
             raise ValueError(f"Motion {motion} can not be understood")
 
-    def _run_rotation_on_spot(self, rotation, wheel_axis, energy_supplier):
+    def _compile_translation(self, translation):
+        length = translation.length
+        steps, length_step, duration = self._compute_step_param(length)
+        consumption_per_step = self._energy_for(length_step)
+
+        return StepPlan(steps, length_step, length_step, 2 * consumption_per_step)
+
+    def _compile_rotation_on_spot(self, rotation, wheel_axis):
         angle = rotation.arc.angle
         length = angle * wheel_axis / 2
         steps, length_step, duration = self._compute_step_param(length)
-        consumption_per_step = self.get_required_energy_for(length_step)
+        consumption_per_step = self._energy_for(length_step)
 
-        for s in range(steps):
-            self.right_wheel.run(length_step)
-            self.left_wheel.run(-length_step)
-            energy_supplier.consume(2 * consumption_per_step)
+        return StepPlan(steps, length_step, -length_step, 2 * consumption_per_step)
 
-    def _run_rotation_on_center(self, rotation, wheel_axis, energy_supplier):
+    def _compile_rotation_on_center(self, rotation, wheel_axis):
         angle = rotation.arc.angle
         radius = rotation.arc.radius
 
@@ -178,47 +426,771 @@ class MotionController(RobotComponent):
         else:
             right_len_step = ratio * length_step
 
-        consumption_per_step = self.get_required_energy_for(left_len_step) \
-                               + self.get_required_energy_for(right_len_step)
+        consumption_per_step = self._energy_for(left_len_step) \
+                               + self._energy_for(right_len_step)
 
-        for s in range(steps):
-            self.right_wheel.run(right_len_step)
-            self.left_wheel.run(left_len_step)
-            energy_supplier.consume(consumption_per_step)
+        return StepPlan(steps, right_len_step, left_len_step, consumption_per_step)
+
+    def add_plan_listener(self, listener):
+        """
+        Calls listener(plan, motion) before running each plan, e.g. to record it
+        :param listener: callable
+        :return:
+        """
+        self.plan_listeners.append(listener)
+
+    def remove_plan_listener(self, listener):
+        self.plan_listeners.remove(listener)
+
+    def _run_plan(self, plan: StepPlan, energy_supplier, motion=None):
+        for listener in self.plan_listeners:
+            listener(plan, motion)
+        start_motion = getattr(energy_supplier, 'start_motion', None)
+        if start_motion is not None:
+            start_motion(None if self.clock is None else self.clock.now)
+        if self.clock is not None:
+            self._simulate_plan(plan, energy_supplier, motion)
+            return
+        if isinstance(plan, ProfilePlan):
+            self._run_profile(plan, energy_supplier)
+            return
+        self._run_steps(plan.steps, plan.right_len_step, plan.left_len_step, plan.consumption_per_step,
+                        energy_supplier)
+
+    def _run_steps(self, steps, right_len_step, left_len_step, consumption_per_step, energy_supplier):
+        """
+        Drives wheels and consumes energy for each time step.
+        In macro step mode, components declaring MACRO_STEP get a single
+        aggregated command, the other ones are still driven step by step.
+        Wheels of a same buffer get the commands of all time steps at once.
+        :return:
+        """
+        buffer = self.wheel_buffer()
+        if buffer is not None:
+            buffer.fill(steps, right_len_step, left_len_step)
+            if self.macro_step and MotionController._supports_macro_step(energy_supplier):
+                energy_supplier.consume_steps(consumption_per_step * steps, steps)
+            else:
+                consume = energy_supplier.consume
+                for s in range(steps):
+                    consume(consumption_per_step)
+            return
+        if not self.macro_step:
+            for s in range(steps):
+                self.right_wheel.run(right_len_step)
+                self.left_wheel.run(left_len_step)
+                energy_supplier.consume(consumption_per_step)
+            return
+
+        macro, per_step = self._split_commands(steps, right_len_step, left_len_step, consumption_per_step,
+                                               energy_supplier)
+        for command, args in macro:
+            command(*args)
+        if per_step:
+            for s in range(steps):
+                for command, value in per_step:
+                    command(value)
+
+    def _split_commands(self, steps, right_len_step, left_len_step, consumption_per_step, energy_supplier):
+        """
+        Commands of components, as a single command for those supporting macro
+        steps in macro step mode, or as a command per time step
+        :return: list of (command, args), list of (command, value per time step)
+        """
+        components = ((self.right_wheel, 'run', 'run_steps', right_len_step),
+                      (self.left_wheel, 'run', 'run_steps', left_len_step),
+                      (energy_supplier, 'consume', 'consume_steps', consumption_per_step))
+        macro = []
+        per_step = []
+        for component, command, macro_command, value in components:
+            if self.macro_step and MotionController._supports_macro_step(component):
+                macro.append((getattr(component, macro_command), (value * steps, steps)))
+            else:
+                per_step.append((getattr(component, command), value))
+        return macro, per_step
+
+    def _run_profile(self, plan: ProfilePlan, energy_supplier):
+        """
+        Drives wheels and consumes energy for each time step, with the values of plan.
+        In macro step mode, components declaring MACRO_STEP get a single
+        aggregated command, the other ones are still driven step by step.
+        Wheels of a same buffer get the commands of all time steps at once.
+        :return:
+        """
+        buffer = self.wheel_buffer()
+        if buffer is not None:
+            buffer.extend(plan.right_len_steps, plan.left_len_steps)
+            if self.macro_step and MotionController._supports_macro_step(energy_supplier):
+                energy_supplier.consume_steps(plan.get_required_energy(), plan.steps)
+            else:
+                consume = energy_supplier.consume
+                for consumption in plan.consumptions.tolist():
+                    consume(consumption)
+            return
+        if not self.macro_step:
+            run_right = self.right_wheel.run
+            run_left = self.left_wheel.run
+            consume = energy_supplier.consume
+            for right, left, consumption in zip(plan.right_len_steps.tolist(), plan.left_len_steps.tolist(),
+                                                plan.consumptions.tolist()):
+                run_right(right)
+                run_left(left)
+                consume(consumption)
+            return
+
+        macro, per_step = self._split_profile(plan, energy_supplier)
+        for command, args in macro:
+            command(*args)
+        if per_step:
+            commands = [command for command, _ in per_step]
+            for values in zip(*(values for _, values in per_step)):
+                for command, value in zip(commands, values):
+                    command(value)
+
+    def _split_profile(self, plan: ProfilePlan, energy_supplier):
+        """
+        Commands of components for a profile plan, as _split_commands
+        :return: list of (command, args), list of (command, list of values per time step)
+        """
+        components = ((self.right_wheel, 'run', 'run_steps', plan.right_len_steps),
+                      (self.left_wheel, 'run', 'run_steps', plan.left_len_steps),
+                      (energy_supplier, 'consume', 'consume_steps', plan.consumptions))
+        macro = []
+        per_step = []
+        for component, command, macro_command, values in components:
+            if self.macro_step and MotionController._supports_macro_step(component):
+                macro.append((getattr(component, macro_command), (float(values.sum()), plan.steps)))
+            else:
+                per_step.append((getattr(component, command), values.tolist()))
+        return macro, per_step
+
+    def use_clock(self, clock: 'SimulationClock'):
+        """
+        Runs motions on a simulation clock, as events, recording them in trace.
+        A motion is run when move returns, the clock being at its end.
+        :param clock: SimulationClock, or None to run motions directly
+        :return:
+        """
+        self.clock = clock
+        self.trace = []
+
+    def _simulate_plan(self, plan: StepPlan, energy_supplier, motion):
+        clock = self.clock
+        start = clock.now
+        end = start + plan.steps * self.time_step
+        if isinstance(plan, ProfilePlan):
+            macro, per_step = self._split_profile(plan, energy_supplier)
+            tick = self._tick_profile, per_step, 0
+        else:
+            macro, per_step = self._split_commands(plan.steps, plan.right_len_step, plan.left_len_step,
+                                                   plan.consumption_per_step, energy_supplier)
+            tick = self._tick, per_step, plan.steps
+        for command, args in macro:
+            clock.schedule_at(start, command, *args)
+        if per_step and plan.steps > 0:
+            clock.schedule_at(start, *tick)
+        clock.schedule_at(end, self.trace.append, MotionRecord(start, end, motion, plan))
+        clock.run(until=end)
+
+    def _tick(self, per_step, remaining):
+        for command, value in per_step:
+            command(value)
+        if remaining > 1:
+            self.clock.schedule(self.time_step, self._tick, per_step, remaining - 1)
+
+    def _tick_profile(self, per_step, step):
+        for command, values in per_step:
+            command(values[step])
+        if step + 1 < len(per_step[0][1]):
+            self.clock.schedule(self.time_step, self._tick_profile, per_step, step + 1)
+
+    def flush_wheels(self):
+        """
+        Writes wheel commands still buffered, if wheels are buffered
+        :return:
+        """
+        buffer = self.wheel_buffer()
+        if buffer is not None:
+            buffer.close()
+
+    def flush_windowed_wheels(self):
+        """
+        Writes wheel commands still buffered, if wheels are buffered with a window:
+        as the window is only checked on writes, rows would otherwise wait for the
+        next motion
+        :return:
+        """
+        buffer = self.wheel_buffer()
+        if buffer is not None and buffer.window is not None:
+            buffer.flush()
+
+    def wheel_buffer(self):
+        """
+        Buffer of the wheels, if they are the right and left wheels of a same WheelBuffer
+        :return: WheelBuffer, or None
+        """
+        buffer = getattr(self.right_wheel, 'buffer', None)
+        if buffer is not None and self.right_wheel is buffer.right and self.left_wheel is buffer.left:
+            return buffer
+        return None
+
+    @staticmethod
+    def _supports_macro_step(component) -> bool:
+        return getattr(component, 'MACRO_STEP', False) is True
 
     def get_required_energy_for(self, length: float):
+        self._read_configuration()
+        return self._energy_for(length)
+
+    def _energy_for(self, length):
         return self.consumption_per_length_unit * length
 
+    def plan_route(self, motions) -> RouteProfile:
+        """
+        Plans motions with trapezoidal velocity profiles, when max_acceleration is configured:
+        wheels accelerate and decelerate by max_acceleration at most, up to speed, instead
+        of running at speed from start to end. The robot stops for rotations on the spot and
+        direction changes, and keeps moving through arcs and straight lines, on arcs at a
+        speed limited by max_lateral_acceleration, if configured.
+        Profiles are computed per motion, as arrays of values per time step; get_step_plan
+        returns them for the motions of the last route planned, with the same configuration.
+        :param motions: list of Translations and Rotations, in running order
+        :return: RouteProfile, with the route duration, or None if max_acceleration is not configured
+        """
+        self._read_configuration()
+        self.profiles = {}
+        if self.max_acceleration is None:
+            return None
+        geometry = [self._profile_geometry(motion) for motion in motions]
+        speeds = self._junction_speeds(motions, geometry)
+        plans = []
+        for motion, (length, factor, limit), start, end in zip(motions, geometry, speeds, speeds[1:]):
+            plan = self._compile_profile(motion, length, factor, limit, start, end)
+            self.profiles[id(motion)] = (motion, plan)
+            plans.append(plan)
+        return RouteProfile(plans, self.time_step)
+
+    def _profile_geometry(self, motion):
+        """
+        Length profiled for motion, factor from speed along it to the speed of the fastest wheel,
+        and limit of the speed along it
+        :return: length, factor or None for rotations on the spot, speed limit
+        """
+        if isinstance(motion, Translation):
+            return motion.length, 1., self.speed
+        angle = math.fabs(motion.arc.angle)
+        if motion.is_on_the_spot():
+            # along the wheels
+            return angle * self.wheel_axis_length / 2, None, self.speed
+        radius = motion.arc.radius
+        factor = (radius + self.wheel_axis_length / 2) / radius
+        limit = self.speed / factor
+        if self.max_lateral_acceleration is not None:
+            limit = min(limit, math.sqrt(self.max_lateral_acceleration * radius))
+        return radius * angle, factor, limit
+
+    def _junction_speeds(self, motions, geometry):
+        """
+        Speeds at the start of each motion and at the end of the last one, as high as speed
+        limits and accelerations allow, with a forward and a backward pass
+        :return: list of speeds
+        """
+        speeds = [0.] * (len(motions) + 1)
+        for i in range(1, len(motions)):
+            (_, before, before_limit), (_, after, after_limit) = geometry[i - 1], geometry[i]
+            if before is None or after is None:
+                continue
+            if isinstance(motions[i - 1], Translation) and isinstance(motions[i], Translation) \
+                    and not Navigator._is_straight(motions[i - 1], motions[i]):
+                continue
+            speeds[i] = min(before_limit, after_limit)
+        reachable = [None if factor is None else 2 * self.max_acceleration / factor * length
+                     for length, factor, _ in geometry]
+        for i, gain in enumerate(reachable):
+            if gain is not None:
+                speeds[i + 1] = min(speeds[i + 1], math.sqrt(speeds[i] ** 2 + gain))
+        for i, gain in reversed(list(enumerate(reachable))):
+            if gain is not None:
+                speeds[i] = min(speeds[i], math.sqrt(speeds[i + 1] ** 2 + gain))
+        return speeds
+
+    def _compile_profile(self, motion, length, factor, limit, start, end) -> ProfilePlan:
+        """
+        Profile plan of motion, consuming as _compile plans do
+        """
+        if factor is None:
+            steps = trapezoidal_profile(length, 0., 0., limit, self.max_acceleration, self.time_step)
+            right = math.copysign(1., motion.arc.angle) * steps
+            return ProfilePlan(right, -right, 2 * self._energy_for(np.fabs(right)))
+        steps = trapezoidal_profile(length, start, end, limit, self.max_acceleration / factor, self.time_step)
+        if isinstance(motion, Translation):
+            return ProfilePlan(steps, steps, 2 * self._energy_for(steps))
+        radius = motion.arc.radius
+        outer = steps * factor
+        inner = outer * (radius - self.wheel_axis_length / 2) / (radius + self.wheel_axis_length / 2)
+        right, left = (outer, inner) if motion.arc.direction == Arc.DIRECT else (inner, outer)
+        return ProfilePlan(right, left, self._energy_for(left) + self._energy_for(right))
+
+    def get_required_energy_for_motion(self, motion) -> float:
+        """
+        Energy consumed by both wheels running motion, as its step plan does, in closed form
+        :param motion: Translation or Rotation
+        :return: energy
+        """
+        self._read_configuration()
+        if isinstance(motion, Translation):
+            return 2 * self._energy_for(motion.length)
+        return self._rotation_energy(motion.arc.angle, motion.arc.radius)
+
+    def get_required_energy_for_motions(self, motions) -> float:
+        """
+        Energy consumed running motions, as get_required_energy_for_motion
+        :param motions: iterable of Translations and Rotations
+        :return: energy
+        """
+        self._read_configuration()
+        per_length = 2 * self._energy_for(1.)
+        length = angle = 0.
+        energy = 0.
+        for motion in motions:
+            if isinstance(motion, Translation):
+                length += motion.length
+            elif motion.is_on_the_spot():
+                angle += motion.arc.angle
+            else:
+                energy += self._rotation_energy(motion.arc.angle, motion.arc.radius)
+        return per_length * length + self._rotation_energy(angle) + energy
+
+    def get_required_energy_for_rotation(self, angle: float, radius: float = 0.) -> float:
+        self._read_configuration()
+        return self._rotation_energy(angle, radius)
+
+    def _rotation_energy(self, angle: float, radius: float = 0.) -> float:
+        wheel_axis = self.wheel_axis_length
+        if radius == 0:
+            return 2 * self._energy_for(angle * wheel_axis / 2)
+        big_radius = (radius + wheel_axis / 2)
+        ratio = (radius - wheel_axis / 2) / big_radius
+        big_length = math.fabs(big_radius * angle)
+        return self._energy_for(big_length) + self._energy_for(ratio * big_length)
+
+    def find_unreachable_position(self, positions, energy_supplier: 'EnergySupplier'):
+        """
+        First position the robot can not reach with the energy of energy_supplier,
+        going through positions with translations and rotations on the spot, as
+        planned by Navigator, without computing motions.
+        Iterables are walked with running totals, up to the first unreachable
+        position; arrays are summed in one pass.
+        :param positions: sequence of xy pairs or Points, N x 2 array or PointArray
+        :param energy_supplier: EnergySupplier
+        :return: index of the position, or None if all of them are reachable
+        """
+        self._read_configuration()
+        quantity = energy_supplier.quantity
+        per_length = 2 * self._energy_for(1.)
+        per_angle = self._rotation_energy(1.)
+        if isinstance(positions, (np.ndarray, PointArray)):
+            return MotionController._find_unreachable_in_array(PointArray.new(positions), quantity,
+                                                               per_length, per_angle)
+
+        energy = 0.
+        last_x = last_y = ux = uy = None
+        for i, xy in enumerate(positions):
+            if isinstance(xy, Point):
+                x, y = xy.x, xy.y
+            else:
+                x, y = xy[0], xy[1]
+            if last_x is None:
+                last_x, last_y = x, y
+                continue
+            if math.isclose(x, last_x, abs_tol=1e-9) and math.isclose(y, last_y, abs_tol=1e-9):
+                continue
+            dx = x - last_x
+            dy = y - last_y
+            length = math.sqrt(dx * dx + dy * dy)
+            wx = dx / length
+            wy = dy / length
+            if ux is not None:
+                cross = ux * -wy + uy * wx
+                cos_ = ux * wx + uy * wy
+                if not (cross == 0 and cos_ > 0):
+                    energy += per_angle * math.acos(max(-1., min(1., cos_)))
+            energy += per_length * length
+            if not energy < quantity:
+                return i
+            last_x, last_y, ux, uy = x, y, wx, wy
+        return None
+
+    @staticmethod
+    def _find_unreachable_in_array(points: PointArray, quantity, per_length, per_angle):
+        kept = np.flatnonzero(Navigator._kept(points))
+        xy = points.xy[kept]
+        d = xy[1:] - xy[:-1]
+        lengths = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])
+        _, angles, _ = turns(d / lengths[:, np.newaxis])
+
+        energies = per_length * lengths
+        energies[1:] += per_angle * angles
+        unreachable = np.flatnonzero(~(np.cumsum(energies) < quantity))
+        if not len(unreachable):
+            return None
+        return int(kept[unreachable[0] + 1])
+
 
 class Navigator(RobotComponent):
 
+    REPLAN_MARGIN = 64
+
     def __init__(self, arranger: 'Arranger'):
         self.arranger = arranger
+        self.route = None
+        self.pending_route = None
 
-    def compute_motions(self, positions):
-        pass
+    def compute_motions(self, positions, commit: bool = True):
+        """
+        Motions through positions, in the order given by the arranger.
+        Unless the arranger reorders them, motions are computed on arrays,
+        with the same results as iter_motions, and only where positions
+        differ from the ones of the route: see replan.
+        Returned motions are shared with the route, they must not be modified.
+        :param positions: iterable of xy pairs or Points, or N x 2 array
+        :param commit: if False, the new route is only kept as pending_route, until
+        commit_route makes it the route, e.g. once there is enough energy for it
+        :return: list of motions
+        """
+        points = self.to_point_array(positions)
+        if not self.keeps_order():
+            route = None
+            translations = self._translations(points)[0]
+            motions = list(self.iter_joined_motions(self.arrange_translations(translations)))
+        else:
+            route = self.new_route(points) if self.route is None else self.replan(self.route, points)
+            motions = route.motions
+        self.pending_route = route
+        if commit:
+            self.commit_route()
+        return motions
+
+    def commit_route(self):
+        """
+        Makes the pending route the route, that the next motions are replanned from
+        :return:
+        """
+        self.route = self.pending_route
+        self.pending_route = None
+
+    def keeps_order(self) -> bool:
+        """
+        Whether motions are run in payload order, i.e. the arranger does not override Arranger.arrange
+        :return: bool
+        """
+        return type(self.arranger).arrange is Arranger.arrange
+
+    def plans_from_positions(self) -> bool:
+        """
+        Whether motions are translations between positions in payload order, joined
+        by rotations on the spot, i.e. neither compute_motions nor the arranger's
+        arrange are overridden: then their energy can be estimated from positions,
+        see MotionController.find_unreachable_position
+        :return: bool
+        """
+        return type(self).compute_motions is Navigator.compute_motions and self.keeps_order()
 
     def compute_total_distance(self, motions):
-        return super(len(m) for m in motions)
+        for route in (self.pending_route, self.route):
+            if route is not None and motions is route.motions:
+                return route.total_length
+        # summed as Route.total_length, for the same results
+        return float(np.sum([m.get_length() for m in motions]))
+
+    def new_route(self, points: PointArray) -> Route:
+        translations, vectors, kept = Navigator._translations(points)
+        motions, translation_indices = Navigator._join(translations, vectors)
+        return Route(snapshot(points.xy), motions, kept, translation_indices,
+                     np.array([m.get_length() for m in motions], dtype=np.float64))
+
+    def replan(self, route: Route, points: PointArray) -> Route:
+        """
+        Route through points, reusing the motions of route where positions are unchanged.
+        Motions are recomputed from the second kept point before the first changed
+        position, so that rotations around the change are recomputed too, up to
+        a point of the unchanged suffix kept in both routes: from there, both
+        routes go the same way. The suffix is searched by windows growing from
+        REPLAN_MARGIN positions after the change.
+        When positions are moved but none is inserted or removed, changes far
+        from each other are replanned one after the other.
+        Motions are only computed for the changed window, but splicing them copies
+        the motion list and index arrays of the route, in O(N) but without geometry.
+        :param route: previous Route
+        :param points: PointArray
+        :return: Route
+        """
+        xy = points.xy
+        if len(route) == len(xy):
+            changed = changed_positions(route.xy, xy)
+            gaps = np.flatnonzero(np.diff(changed) > 4 * Navigator.REPLAN_MARGIN)
+            for g in gaps.tolist():
+                partial = route.xy.copy()
+                partial[:changed[g] + 1] = xy[:changed[g] + 1]
+                route = self._replan_change(route, partial)
+        return self._replan_change(route, xy)
+
+    def _replan_change(self, route: Route, xy) -> Route:
+        prefix, suffix = diff_positions(route.xy, xy)
+        if prefix == len(route) == len(xy):
+            return route
+        kept = route.kept
+        if len(kept) < 2 or len(xy) < 2:
+            return self.new_route(PointArray(xy))
+
+        a = max(int(np.searchsorted(kept, prefix)) - 2, 0)
+        lo = int(kept[a])
+        start = int(route.translation_indices[a])
+        offset = len(xy) - len(route)
+        unchanged = len(xy) - suffix
+        margin = Navigator.REPLAN_MARGIN
+        while True:
+            hi = min(unchanged + margin, len(xy))
+            translations, vectors, window_kept = Navigator._translations(PointArray(xy[lo:hi]))
+            motions, translation_indices = Navigator._join(translations, vectors)
+            window_kept += lo
+
+            # a point of the suffix kept in both routes, with a translation from it in the window
+            candidates = np.flatnonzero(window_kept[:-1] >= unchanged)
+            previous = window_kept[candidates] - offset
+            found = np.searchsorted(kept, previous)
+            same = kept[np.minimum(found, len(kept) - 1)] == previous
+            if same.any():
+                j = int(candidates[same.argmax()])
+                b = int(found[same.argmax()])
+                end = int(route.translation_indices[b])
+                cut = int(translation_indices[j])
+                added = motions[:cut]
+                new_motions = list(route.motions)
+                new_motions[start:end] = added
+                new_kept = np.concatenate((kept[:a], window_kept[:j], kept[b:] + offset))
+                new_translation_indices = np.concatenate((route.translation_indices[:a],
+                                                          translation_indices[:j] + start,
+                                                          route.translation_indices[b:] - end + start + cut))
+                break
+            if hi == len(xy):
+                end = len(route.motions)
+                added = motions
+                new_motions = route.motions[:start] + added
+                new_kept = np.concatenate((kept[:a], window_kept))
+                new_translation_indices = np.concatenate((route.translation_indices[:a],
+                                                          translation_indices + start))
+                break
+            margin *= 2
+
+        added_lengths = np.array([m.get_length() for m in added], dtype=np.float64)
+        new_lengths = np.concatenate((route.lengths[:start], added_lengths, route.lengths[end:]))
+        return Route(snapshot(xy), new_motions, new_kept, new_translation_indices, new_lengths)
+
+    def compute_positions_distance(self, positions):
+        """
+        Streaming total distance of positions, without building motions.
+        Rotations between translations are on the spot, so they add no distance.
+        Arrays are summed in one pass.
+        :param positions: iterable of xy pairs or Points, N x 2 array or PointArray
+        :return: total distance
+        """
+        if isinstance(positions, (np.ndarray, PointArray)):
+            xy = PointArray.new(positions).xy
+            d = xy[1:] - xy[:-1]
+            return float(np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]).sum())
+        total = 0.
+        previous = None
+        for xy in positions:
+            if isinstance(xy, Point):
+                x, y = xy.x, xy.y
+            else:
+                x, y = xy[0], xy[1]
+            if previous is not None:
+                dx = x - previous[0]
+                dy = y - previous[1]
+                total += math.sqrt(dx * dx + dy * dy)
+            previous = (x, y)
+        return total
 
     def arrange_translations(self, translations):
         return self.arranger.arrange(translations)
 
     def to_points(self, positions):
-        return list([Point.new(xy) for xy in positions])
+        return list(self.iter_points(positions))
 
     def to_translations(self, points):
-        pass
+        return self._translations(self.to_point_array(points))[0]
+
+    def to_point_array(self, positions) -> PointArray:
+        if not isinstance(positions, (list, tuple, np.ndarray, PointArray)):
+            positions = list(positions)
+        try:
+            return PointArray.new(positions)
+        except (TypeError, ValueError):
+            return PointArray.from_points(self.to_points(positions))
+
+    @staticmethod
+    def _translations(points: PointArray):
+        """
+        Translations between consecutive points, skipping repeated points, as iter_translations
+        :param points: PointArray
+        :return: list of Translations, N x 2 array of their vectors, indices of the points they go through
+        """
+        kept = np.flatnonzero(Navigator._kept(points))
+        xy = points.xy[kept]
+        waypoints = [Point.from_floats(x, y) for x, y in xy.tolist()]
+        d = xy[1:] - xy[:-1]
+        dx, dy = d[:, 0], d[:, 1]
+        # same operations as Point.distance and Point.normalize, for the same results
+        lengths = np.sqrt(dx * dx + dy * dy)
+        vectors = d / lengths[:, np.newaxis]
+        translations = [Translation._from_parts(start, end, length, Point.from_floats(vx, vy))
+                        for start, end, length, (vx, vy)
+                        in zip(waypoints, waypoints[1:], lengths.tolist(), vectors.tolist())]
+        return translations, vectors, kept
+
+    @staticmethod
+    def _kept(points: PointArray):
+        """
+        Points kept by iter_translations, i.e. different from the last kept point
+        :param points: PointArray
+        :return: array of booleans
+        """
+        xy = points.xy
+        keep = np.ones(len(xy), dtype=bool)
+        if len(xy) < 2:
+            return keep
+        keep[1:] = ~PointArray(xy[1:]).equals(xy[:-1])
+        skipped = np.flatnonzero(~keep)
+        if not len(skipped):
+            return keep
+
+        # after a skipped point, the point is compared to the last kept one, not its predecessor
+        checked = np.union1d(skipped, skipped + 1)
+        heap = checked[checked < len(xy)].tolist()
+        queued = set(heap)
+        last_kept = last_checked = 0
+        while heap:
+            i = heapq.heappop(heap)
+            if i - 1 > last_checked:
+                last_kept = i - 1
+            kept = not (math.isclose(xy[i, 0], xy[last_kept, 0], abs_tol=PointArray.ABS_TOL)
+                        and math.isclose(xy[i, 1], xy[last_kept, 1], abs_tol=PointArray.ABS_TOL))
+            if kept != keep[i] and i + 1 < len(xy) and i + 1 not in queued:
+                queued.add(i + 1)
+                heapq.heappush(heap, i + 1)
+            keep[i] = kept
+            if kept:
+                last_kept = i
+            last_checked = i
+        return keep
+
+    @staticmethod
+    def _join(translations, vectors):
+        """
+        Consecutive translations joined by rotations on the spot when direction changes,
+        as iter_joined_motions
+        :param translations: list of consecutive Translations
+        :param vectors: N x 2 array of their vectors
+        :return: list of motions, indices of translations in it
+        """
+        changes, angles, _ = turns(vectors)
+        corners = np.flatnonzero(changes)
+        angles = angles[corners].tolist()
+
+        new_arc = Arc._from_parts
+        new_rotation = Rotation._from_arc
+        direct = Arc.DIRECT
+        rotations = [new_rotation(new_arc(before.end, after.start, before.vector, after.vector,
+                                          before.end, 0., angle, direct, 0.))
+                     for before, after, angle
+                     in zip(map(translations.__getitem__, corners.tolist()),
+                            map(translations.__getitem__, (corners + 1).tolist()), angles)]
+
+        # interleaving, rotation k goes before translation corners[k] + 1
+        motions = np.empty(len(translations) + len(rotations), dtype=object)
+        shift = np.zeros(len(translations), dtype=np.int64)
+        shift[corners + 1] = 1
+        translation_positions = np.arange(len(translations)) + np.cumsum(shift)
+        motions[translation_positions] = translations
+        motions[translation_positions[corners + 1] - 1] = rotations
+        return motions.tolist(), translation_positions
+
+    def iter_points(self, positions):
+        for xy in positions:
+            yield Point.new(xy)
+
+    def iter_translations(self, points):
+        """
+        Translations between consecutive points, skipping repeated points
+        :param points: iterable of Points
+        :return: generator of Translations
+        """
+        previous = None
+        for point in points:
+            if previous is None:
+                previous = point
+            elif point != previous:
+                yield Translation(previous, point)
+                previous = point
+
+    def iter_motions(self, positions):
+        """
+        Translations between positions, joined by rotations when direction changes.
+        Positions are streamed, so they are kept in payload order.
+        :param positions: iterable of xy pairs
+        :return: generator of motions
+        """
+        return self.iter_joined_motions(self.iter_translations(self.iter_points(positions)))
+
+    def iter_joined_motions(self, translations):
+        """
+        Translations joined by rotations when direction changes
+        :param translations: iterable of consecutive Translations
+        :return: generator of motions
+        """
+        previous = None
+        for translation in translations:
+            if previous is not None and not Navigator._is_straight(previous, translation):
+                yield Rotation.new_from_translations(previous, translation)
+            yield translation
+            previous = translation
+
+    def plan(self, positions, lookahead: int):
+        """
+        Plans motions incrementally, up to lookahead motions ahead of the one yielded
+        :param positions: iterable of xy pairs
+        :param lookahead: number of motions planned in advance
+        :return: generator of motions
+        """
+        planned = deque()
+        for motion in self.iter_motions(positions):
+            planned.append(motion)
+            if len(planned) > lookahead:
+                yield planned.popleft()
+        while planned:
+            yield planned.popleft()
+
+    @staticmethod
+    def _is_straight(previous: Translation, translation: Translation) -> bool:
+        return previous.is_parallel_with(translation) \
+               and previous.vector.scalar_product(translation.vector) > 0
 
 
 class Arranger:
+    """
+    Orders motions before they are run, keeping them as given.
+    Subclasses overriding arrange are expected to reorder motions.
+    """
 
     def arrange(self, motions: List) -> List:
-        pass
+        return list(motions)
 
 class Robot(Exchanger):
     STATUS_MOTIONLESS = 'motionless'
     STATUS_MOVING = 'moving'
+    DEFAULT_LOOKAHEAD = 16
 
     def __init__(self, transmitter: Transmitter,
                  motion_controller: MotionController,
@@ -231,6 +1203,7 @@ class Robot(Exchanger):
         self._register_components()
         self.status = None
         self.motions = []
+        self.route_profile = None
 
     def _register_components(self):
         self.transmitter.register(self)
@@ -241,22 +1214,75 @@ class Robot(Exchanger):
     def exchange(self, tc: Telecom) -> Telecom:
         return self.transmitter.exchange(tc)
 
+    def exchange_many(self, tcs: Iterable[Telecom]) -> List[Telecom]:
+        return self.transmitter.exchange_many(tcs)
+
+    def iter_exchange(self, tcs: Iterable[Telecom]) -> Iterator[Telecom]:
+        return self.transmitter.iter_exchange(tcs)
+
     def load_positions(self, positions: List):
-        motions = self.navigator.compute_motions(positions)
-        total_length = self.navigator.compute_total_distance(motions)
-        total_energy = self.motion_controller.get_required_energy_for(total_length)
+        """
+        Loads motions through positions, if there is enough energy for them.
+        The navigator replans only the motions around positions that changed
+        since its previous computation.
+        When the navigator plans translations between positions in payload order,
+        with rotations on the spot, energy is first estimated from positions, so
+        that routes out of budget are rejected before motions are computed.
+        Energy is then checked on motions, with the same model, see
+        MotionController.get_required_energy_for_motions.
+        Motions are then planned by the motion controller, with velocity
+        profiles if configured, see MotionController.plan_route.
+        :param positions: iterable of xy pairs or Points, or N x 2 array
+        :return:
+        """
+        points = self.navigator.to_point_array(positions)
+        if self.navigator.plans_from_positions():
+            unreachable = self.motion_controller.find_unreachable_position(points, self.energy_supplier)
+            if unreachable is not None:
+                raise EnergyBudgetExceeded(unreachable)
+        motions = self.navigator.compute_motions(points, commit=False)
+        total_energy = self.motion_controller.get_required_energy_for_motions(motions)
         if not self.energy_supplier.has_enough(total_energy):
             raise ValueError("Not enough energy")
+        self.navigator.commit_route()
         self.motions = motions
+        self.route_profile = self.motion_controller.plan_route(motions)
 
     def run(self):
         if len(self.motions) > 0:
             self.status = Robot.STATUS_MOVING
-            for motion in self.motions:
-                self.motion_controller.move(motion)
-            self.status = Robot.STATUS_MOTIONLESS
+            try:
+                for motion in self.motions:
+                    self.motion_controller.move(motion, self.energy_supplier)
+            finally:
+                self.motion_controller.flush_wheels()
+                self.status = Robot.STATUS_MOTIONLESS
         else:
             raise ValueError("Empty motion list")
 
+    def run_positions(self, positions: List, lookahead: int = DEFAULT_LOOKAHEAD):
+        """
+        Plans and runs motions incrementally, without loading them all first.
+        Energy is checked up front, with a streaming pass over positions, for
+        translations and rotations on the spot as load_positions does, see
+        MotionController.find_unreachable_position: positions has to be
+        iterable twice.
+        :param positions: xy pairs or Points
+        :param lookahead: number of motions planned ahead of the running one
+        :return:
+        """
+        unreachable = self.motion_controller.find_unreachable_position(positions, self.energy_supplier)
+        if unreachable is not None:
+            raise EnergyBudgetExceeded(unreachable)
+
+        self.status = Robot.STATUS_MOVING
+        try:
+            for motion in self.navigator.plan(positions, lookahead):
+                self.motion_controller.move(motion, self.energy_supplier)
+                self.motion_controller.flush_windowed_wheels()
+        finally:
+            self.motion_controller.flush_wheels()
+            self.status = Robot.STATUS_MOTIONLESS
+
     def is_moving(self) -> bool :
         return self.status == Robot.STATUS_MOVING
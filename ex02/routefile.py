@@ -0,0 +1,106 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from ex02.geometry import PointArray
+
+"""
+Module for route files, positions stored in binary to be read without copy
+"""
+
+
+class RouteFile:
+    """
+    Reference to a route file, usable as LOADING payload instead of a list of positions.
+    Layout, little-endian:
+    - header: magic (4 bytes), version (uint16), reserved (uint16), position count (uint64)
+    - positions: count x,y pairs of float64
+    The header is 16 bytes long, so positions are aligned for reading without copy.
+    The file is memory mapped when opened: positions are a read-only N x 2 array
+    backed by the file, paged in as they are read. The mapping is released once the
+    route file and all arrays from it are released.
+    As the file may be modified in place, routes loaded from it copy its positions,
+    see replanning.snapshot, and Navigator builds a Translation per position: mapping
+    only saves reading the file, memory and load time still grow with its size.
+    """
+    MAGIC = b'EX2R'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHQ')
+    DTYPE = np.dtype('<f8')
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._xy = None
+
+    @staticmethod
+    def write(path, positions) -> 'RouteFile':
+        """
+        Writes positions to a route file, replacing any previous one at once, so
+        that arrays from the previous file keep its positions
+        :param path: file path
+        :param positions: sequence of xy pairs or Points, N x 2 array or PointArray
+        :return: RouteFile
+        """
+        xy = PointArray.new(positions).xy.astype(RouteFile.DTYPE, copy=False)
+        temporary = f'{os.fspath(path)}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(RouteFile.HEADER.pack(RouteFile.MAGIC, RouteFile.VERSION, 0, len(xy)))
+            xy.tofile(f)
+        os.replace(temporary, path)
+        return RouteFile(path)
+
+    def open(self) -> np.ndarray:
+        """
+        Maps the file in memory, once
+        :return: read-only N x 2 array of positions
+        """
+        if self._xy is None:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < RouteFile.HEADER.size:
+                    raise ValueError(f'{self.path} is not a route file')
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                magic, version, _, count = RouteFile.HEADER.unpack_from(mapping)
+                if magic != RouteFile.MAGIC or version != RouteFile.VERSION:
+                    raise ValueError(f'{self.path} is not a route file version {RouteFile.VERSION}')
+                if size != RouteFile.HEADER.size + 2 * count * RouteFile.DTYPE.itemsize:
+                    raise ValueError(f'{self.path} has not {count} positions')
+            except ValueError:
+                mapping.close()
+                raise
+            self._xy = np.frombuffer(mapping, dtype=RouteFile.DTYPE, count=2 * count,
+                                     offset=RouteFile.HEADER.size).reshape(count, 2)
+        return self._xy
+
+    @staticmethod
+    def resolve(payload):
+        """
+        Positions of a LOADING payload
+        :param payload: RouteFile, or positions
+        :return: array of the route file positions, or payload
+        """
+        if isinstance(payload, RouteFile):
+            return payload.open()
+        return payload
+
+    def close(self):
+        """
+        Releases the array of positions; the mapping is closed with the last array from it
+        :return:
+        """
+        self._xy = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.open())
+
+    def __repr__(self):
+        return f'route_file({self.path!r})'
@@ -0,0 +1,502 @@
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ex02.geometry import Point, PointArray
+from ex02.motion import Translation
+from ex02.robot import Arranger
+from ex02.spatial import PointIndex
+
+"""
+Module for route optimization: ordering of waypoints
+"""
+
+
+class RouteArranger(Arranger):
+    """
+    Reorders waypoints to minimise route length plus turn cost.
+    The first waypoint, where the robot stands, stays first and the route is open.
+    A nearest neighbour route is improved by 2-opt and Or-opt moves towards near
+    waypoints, until no move improves it or the time budget is spent.
+    turn_weight is the length equivalent of a turn of one radian, e.g. the wheel
+    axis length to weigh rotations on the spot by their energy.
+    """
+    DEFAULT_NEIGHBOURS = 8
+    MATRIX_MAX_SIZE = 2048
+
+    def __init__(self, turn_weight: float = 0., time_budget: float = 1., neighbours: int = DEFAULT_NEIGHBOURS):
+        self.turn_weight = turn_weight
+        self.time_budget = time_budget
+        self.neighbours = neighbours
+
+    def arrange(self, motions):
+        """
+        Reorders waypoints
+        :param motions: Translations of a route, or waypoints as Points or xy pairs
+        :return: Translations between reordered waypoints, or reordered waypoints
+        """
+        motions = list(motions)
+        waypoints, xy = RouteArranger._waypoints(motions)
+        return RouteArranger._arranged(motions, waypoints, self.optimize(xy))
+
+    @staticmethod
+    def _waypoints(motions):
+        if motions and isinstance(motions[0], Translation):
+            waypoints = [motions[0].start] + [t.end for t in motions]
+            return waypoints, PointArray.from_points(waypoints).xy
+        if motions and isinstance(motions[0], Point):
+            return motions, PointArray.from_points(motions).xy
+        return motions, PointArray.new(motions).xy
+
+    @staticmethod
+    def _arranged(motions, waypoints, order):
+        waypoints = [waypoints[i] for i in order]
+        if motions and isinstance(motions[0], Translation):
+            return [Translation(a, b) for a, b in zip(waypoints, waypoints[1:]) if a != b]
+        return waypoints
+
+    def optimize(self, xy) -> list:
+        """
+        Computes order of waypoints
+        :param xy: N x 2 array of waypoints
+        :return: list of waypoint indices, starting with 0
+        """
+        deadline = time.perf_counter() + self.time_budget
+        xy = np.ascontiguousarray(xy, dtype=np.float64).reshape(-1, 2)
+        if len(xy) < 3:
+            return list(range(len(xy)))
+        order, neighbours = self._seed(xy)
+        route = _Route(xy, order, self.turn_weight)
+        route.improve(neighbours, deadline)
+        return route.order
+
+    def _seed(self, xy):
+        """
+        Nearest neighbour route, and neighbour lists
+        :param xy: N x 2 array of waypoints
+        :return: list of waypoint indices, list of neighbour lists
+        """
+        if len(xy) <= RouteArranger.MATRIX_MAX_SIZE:
+            return self._seed_with_matrix(xy)
+        return self._seed_with_index(xy)
+
+    def _seed_with_matrix(self, xy):
+        """Nearest neighbour route and neighbour lists, from the distance matrix"""
+        d = xy[:, np.newaxis, :] - xy[np.newaxis, :, :]
+        distances = np.hypot(d[..., 0], d[..., 1])
+        np.fill_diagonal(distances, np.inf)
+        k = min(self.neighbours, len(xy) - 1)
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest = np.take_along_axis(nearest, np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1), axis=1)
+
+        order = [0]
+        distances[:, 0] = np.inf
+        current = 0
+        for _ in range(len(xy) - 1):
+            current = int(np.argmin(distances[current]))
+            distances[:, current] = np.inf
+            order.append(current)
+        return order, nearest.tolist()
+
+    def _seed_with_index(self, xy):
+        """Nearest neighbour route and neighbour lists, from a grid index"""
+        index = PointIndex(xy)
+        nearest = index.nearest_neighbours(self.neighbours).tolist()
+        remaining = np.ones(len(xy), dtype=bool)
+        remaining[0] = False
+        order = [0]
+        current = 0
+        for _ in range(len(xy) - 1):
+            for candidate in nearest[current]:
+                if remaining[candidate]:
+                    current = candidate
+                    break
+            else:
+                current = index.nearest(Point(*xy[current]), 1, mask=remaining)[0]
+            remaining[current] = False
+            order.append(current)
+        return order, nearest
+
+
+class ParallelArranger(RouteArranger):
+    """
+    RouteArranger spreading its work over worker processes, with one of strategies:
+    - RESTARTS: workers run iterated local searches from perturbed copies of the seed route,
+      the best route is kept
+    - PARTS: workers improve consecutive parts of the seed route with their ends fixed,
+      then joints between parts are improved
+    By default, PARTS is used from PARTS_MIN_SIZE waypoints.
+    Waypoints, seed route and neighbour lists are passed to workers in shared memory.
+    """
+    RESTARTS = 'restarts'
+    PARTS = 'parts'
+    PARTS_MIN_SIZE = 10000
+    JOINTS_BUDGET_RATIO = 0.2
+
+    def __init__(self, turn_weight: float = 0., time_budget: float = 1.,
+                 neighbours: int = RouteArranger.DEFAULT_NEIGHBOURS,
+                 workers: int = None, strategy: str = None, executor: Executor = None):
+        super().__init__(turn_weight, time_budget, neighbours)
+        if strategy not in (None, ParallelArranger.RESTARTS, ParallelArranger.PARTS):
+            raise ValueError(f'Unknown strategy {strategy}')
+        self.workers = workers or os.cpu_count() or 1
+        self.strategy = strategy
+        self.executor = executor
+
+    def _pool(self):
+        if self.executor is not None:
+            return nullcontext(self.executor)
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def optimize(self, xy) -> list:
+        deadline = time.perf_counter() + self.time_budget
+        xy = np.ascontiguousarray(xy, dtype=np.float64).reshape(-1, 2)
+        if len(xy) < 3:
+            return list(range(len(xy)))
+        order, neighbours = self._seed(xy)
+        strategy = self.strategy
+        if strategy is None:
+            strategy = ParallelArranger.PARTS if len(xy) >= ParallelArranger.PARTS_MIN_SIZE \
+                else ParallelArranger.RESTARTS
+
+        with _SharedArrays(xy=xy, order=np.asarray(order, dtype=np.int64),
+                           neighbours=np.asarray(neighbours, dtype=np.int64)) as shared, self._pool() as executor:
+            if strategy == ParallelArranger.PARTS:
+                return self._optimize_parts(xy, order, neighbours, shared, executor, deadline)
+            return self._optimize_restarts(shared, executor, deadline)
+
+    def _optimize_restarts(self, shared, executor, deadline):
+        budget = deadline - time.perf_counter()
+        futures = [executor.submit(_restart, shared.spec, seed, self.turn_weight, budget)
+                   for seed in range(self.workers)]
+        cost, order = min(future.result() for future in futures)
+        return order
+
+    def _optimize_parts(self, xy, order, neighbours, shared, executor, deadline):
+        budget = (deadline - time.perf_counter()) * (1 - ParallelArranger.JOINTS_BUDGET_RATIO)
+        bounds = np.linspace(0, len(order) - 1, self.workers + 1).astype(int).tolist()
+        futures = [executor.submit(_improve_part, shared.spec, first, last, last < len(order) - 1,
+                                   self.turn_weight, budget)
+                   for first, last in zip(bounds, bounds[1:]) if last > first]
+        order = [order[0]]
+        for future in futures:
+            order.extend(future.result()[1:])
+
+        route = _Route(xy, order, self.turn_weight)
+        route.improve(neighbours, deadline, waypoints=[order[p] for p in bounds])
+        return route.order
+
+    def arrange_many(self, routes) -> list:
+        """
+        Reorders waypoints of several routes, in parallel.
+        Each route is optimized within the time budget.
+        :param routes: list of routes, as arrange takes them
+        :return: list of arranged routes
+        """
+        routes = [list(motions) for motions in routes]
+        waypoints, xys = zip(*[RouteArranger._waypoints(motions) for motions in routes]) if routes else ((), ())
+        bounds = np.cumsum([0] + [len(xy) for xy in xys]).tolist()
+        with _SharedArrays(xy=np.concatenate(xys or [np.empty((0, 2))])) as shared, self._pool() as executor:
+            futures = [executor.submit(_optimize_route, shared.spec, first, last,
+                                       self.turn_weight, self.time_budget, self.neighbours)
+                       for first, last in zip(bounds, bounds[1:])]
+            return [RouteArranger._arranged(motions, route_waypoints, future.result())
+                    for motions, route_waypoints, future in zip(routes, waypoints, futures)]
+
+
+class _SharedArrays:
+    """
+    Copies of arrays in shared memory, described to workers by a picklable spec
+    """
+
+    def __init__(self, **arrays):
+        self.spec = {}
+        self._blocks = []
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+
+@contextmanager
+def _attached(spec):
+    """
+    Attaches shared arrays in a worker. Arrays are only valid in the context,
+    so anything kept from them has to be copied.
+    """
+    blocks = {name: shared_memory.SharedMemory(name=block_name) for name, (block_name, _, _) in spec.items()}
+    arrays = {name: np.ndarray(shape, dtype, buffer=blocks[name].buf) for name, (_, shape, dtype) in spec.items()}
+    try:
+        yield arrays
+    finally:
+        arrays.clear()
+        for block in blocks.values():
+            block.close()
+
+
+def _restart(spec, seed, turn_weight, budget):
+    """
+    Worker: iterated local search from the seed route, perturbed unless seed is 0.
+    The best route is perturbed and improved again until the budget is spent.
+    """
+    deadline = time.perf_counter() + budget
+    with _attached(spec) as arrays:
+        xy = arrays['xy'].copy()
+        order = arrays['order'].tolist()
+        neighbours = arrays['neighbours'].tolist()
+    rng = random.Random(seed)
+    if seed and len(order) > 3:
+        for _ in range(1 + len(order) // 1000):
+            order, _ = _double_bridge(order, rng)
+    route = _Route(xy, order, turn_weight)
+    route.improve(neighbours, deadline)
+    best, best_cost = route.order, route_cost(xy, route.order, turn_weight)
+    while len(best) > 3 and time.perf_counter() < deadline:
+        order, touched = _double_bridge(best, rng)
+        route = _Route(xy, order, turn_weight)
+        route.improve(neighbours, deadline, waypoints=touched)
+        cost = route_cost(xy, route.order, turn_weight)
+        if cost < best_cost:
+            best, best_cost = route.order, cost
+    return best_cost, best
+
+
+def _double_bridge(order, rng):
+    """
+    Perturbation swapping two consecutive parts of the route
+    :return: perturbed route, waypoints at the changed edges
+    """
+    a, b, c = sorted(rng.sample(range(1, len(order)), 3))
+    touched = [order[p] for p in (a - 1, a, b - 1, b, c - 1, c) if p < len(order)]
+    return order[:a] + order[b:c] + order[a:b] + order[c:], touched
+
+
+def _improve_part(spec, first, last, fixed_end, turn_weight, budget):
+    """Worker: improves part first..last of the seed route, keeping its first waypoint"""
+    deadline = time.perf_counter() + budget
+    with _attached(spec) as arrays:
+        part = arrays['order'][first:last + 1].copy()
+        xy = arrays['xy'][part]
+        neighbours = arrays['neighbours'][part]
+        local = np.full(len(arrays['xy']), -1, dtype=np.int64)
+    local[part] = np.arange(len(part))
+    neighbours = [[v for v in row if v >= 0] for row in local[neighbours].tolist()]
+    route = _Route(xy, range(len(part)), turn_weight, fixed_end)
+    route.improve(neighbours, deadline)
+    return part[route.order].tolist()
+
+
+def _optimize_route(spec, first, last, turn_weight, budget, neighbours):
+    """Worker: optimizes a whole route, from waypoints first to last excluded"""
+    with _attached(spec) as arrays:
+        xy = arrays['xy'][first:last].copy()
+    return RouteArranger(turn_weight, budget, neighbours).optimize(xy)
+
+
+class _Route:
+    """
+    Open route under improvement, with moves evaluated on the edges they
+    remove and add. Turn at a waypoint only depends on its two neighbours,
+    so turn cost changes are limited to the end waypoints of these edges.
+    With fixed_end, the last waypoint stays last, as the first one does.
+    """
+    MIN_GAIN = 1e-9
+    OR_OPT_MAX_SEGMENT = 3
+    CLOCK_PERIOD = 64
+
+    def __init__(self, xy, order, turn_weight, fixed_end=False):
+        self.fixed_end = fixed_end
+        self.xs = xy[:, 0].tolist()
+        self.ys = xy[:, 1].tolist()
+        self.order = list(order)
+        self.pos = [0] * len(self.order)
+        self._update_pos(0, len(self.order))
+        self.turn_weight = turn_weight
+
+    def _update_pos(self, first, last):
+        order, pos = self.order, self.pos
+        for p in range(max(first, 0), min(last, len(order))):
+            pos[order[p]] = p
+
+    def _at(self, p):
+        return self.order[p] if 0 <= p < len(self.order) else None
+
+    def distance(self, a, b):
+        return math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+
+    def turn(self, v, a, b):
+        """Turn angle at v, between a and b"""
+        xs, ys = self.xs, self.ys
+        ux, uy = xs[v] - xs[a], ys[v] - ys[a]
+        wx, wy = xs[b] - xs[v], ys[b] - ys[v]
+        return math.atan2(math.fabs(ux * wy - uy * wx), ux * wx + uy * wy)
+
+    def _turn_of(self, v, neighbours):
+        return self.turn(v, neighbours[0], neighbours[1]) if len(neighbours) == 2 else 0.
+
+    def delta(self, removed, added):
+        """
+        Cost change of replacing removed edges by added ones
+        :param removed: list of (a, b) edges
+        :param added: list of (a, b) edges
+        :return: cost change, negative if the route is improved
+        """
+        result = 0.
+        for a, b in added:
+            result += self.distance(a, b)
+        for a, b in removed:
+            result -= self.distance(a, b)
+        # each end waypoint of added edges changes its turn by pi at most
+        if self.turn_weight and result < 2 * len(added) * math.pi * self.turn_weight:
+            result += self.turn_weight * self._turn_delta(removed, added)
+        return result
+
+    def _turn_delta(self, removed, added):
+        changed = {}
+        for a, b in removed + added:
+            for v in (a, b):
+                if v not in changed:
+                    p = self.pos[v]
+                    changed[v] = [n for n in (self._at(p - 1), self._at(p + 1)) if n is not None]
+        old = {v: self._turn_of(v, neighbours) for v, neighbours in changed.items()}
+        for a, b in removed:
+            changed[a].remove(b)
+            changed[b].remove(a)
+        for a, b in added:
+            changed[a].append(b)
+            changed[b].append(a)
+        return sum(self._turn_of(v, neighbours) - old[v] for v, neighbours in changed.items())
+
+    def improve(self, neighbours, deadline, waypoints=None):
+        """
+        Applies improving moves, nearest waypoints first, until none is found or deadline
+        :param neighbours: list of neighbour lists of each waypoint
+        :param deadline: time.perf_counter() value
+        :param waypoints: waypoints to start from, all by default
+        :return:
+        """
+        queue = deque(self.order if waypoints is None else waypoints)
+        queued = [False] * len(self.order)
+        for v in queue:
+            queued[v] = True
+        count = 0
+        while queue:
+            count += 1
+            if count % _Route.CLOCK_PERIOD == 0 and time.perf_counter() > deadline:
+                return
+            a = queue.popleft()
+            queued[a] = False
+            touched = self._two_opt(a, neighbours[a]) or self._or_opt(a, neighbours[a])
+            if touched:
+                for v in touched:
+                    if not queued[v]:
+                        queued[v] = True
+                        queue.append(v)
+                if not queued[a]:
+                    queued[a] = True
+                    queue.append(a)
+
+    def _two_opt(self, a, candidates):
+        """Reverses a part of the route so that a and a candidate are linked"""
+        order, pos, at = self.order, self.pos, self._at
+        for c in candidates:
+            lo, hi = sorted((pos[a], pos[c]))
+            if hi - lo < 2:
+                continue
+            # a part starting after lo, or ending before hi
+            for first, last in ((lo + 1, hi), (lo, hi - 1)):
+                before, after = at(first - 1), at(last + 1)
+                if before is None or after is None and self.fixed_end:
+                    continue
+                removed = [(before, order[first])]
+                added = [(before, order[last])]
+                if after is not None:
+                    removed.append((order[last], after))
+                    added.append((order[first], after))
+                if self.delta(removed, added) < -_Route.MIN_GAIN:
+                    order[first:last + 1] = order[first:last + 1][::-1]
+                    self._update_pos(first, last + 1)
+                    return [v for edge in added for v in edge]
+        return None
+
+    def _or_opt(self, a, candidates):
+        """Moves a short part of the route starting at a next to a candidate"""
+        order, pos, at = self.order, self.pos, self._at
+        i = pos[a]
+        if i == 0:
+            return None
+        for length in range(1, _Route.OR_OPT_MAX_SEGMENT + 1):
+            last = i + length - 1
+            if last >= len(order) - self.fixed_end:
+                return None
+            part = order[i:last + 1]
+            p, q = order[i - 1], at(last + 1)
+            for c in candidates:
+                j = pos[c]
+                if i <= j <= last:
+                    continue
+                # insertion between c and its successor, or its predecessor and c
+                for left, right in ((c, at(j + 1)), (at(j - 1), c)):
+                    if left is None or left == p and right == a or left == part[-1] \
+                            or right is None and self.fixed_end:
+                        continue
+                    for head, tail in ((part[0], part[-1]), (part[-1], part[0])):
+                        removed = [(p, a)]
+                        added = [(left, head)]
+                        if q is not None:
+                            removed.append((part[-1], q))
+                            added.append((p, q))
+                        if right is not None:
+                            removed.append((left, right))
+                            added.append((tail, right))
+                        if self.delta(removed, added) < -_Route.MIN_GAIN:
+                            self._move(i, last, left, head != part[0])
+                            return [v for edge in added for v in edge]
+        return None
+
+    def _move(self, first, last, left, reverse):
+        """Moves part first..last of the route after waypoint left"""
+        order = self.order
+        part = order[first:last + 1]
+        if reverse:
+            part.reverse()
+        del order[first:last + 1]
+        j = self.pos[left]
+        target = j + 1 if j < first else j + 1 - len(part)
+        order[target:target] = part
+        self._update_pos(min(first, target), max(last + 1, target + len(part)))
+
+
+def route_cost(xy, order, turn_weight: float = 0.) -> float:
+    """
+    Cost of an open route: length plus turn_weight times the sum of turn angles
+    :param xy: N x 2 array of waypoints
+    :param order: waypoint indices
+    :param turn_weight: length equivalent of a turn of one radian
+    :return: cost
+    """
+    points = np.asarray(xy, dtype=np.float64)[np.asarray(order)]
+    vectors = np.diff(points, axis=0)
+    cost = float(np.hypot(vectors[:, 0], vectors[:, 1]).sum())
+    if turn_weight and len(vectors) > 1:
+        u, w = vectors[:-1], vectors[1:]
+        cross = u[:, 0] * w[:, 1] - u[:, 1] * w[:, 0]
+        dot = u[:, 0] * w[:, 0] + u[:, 1] * w[:, 1]
+        cost += turn_weight * float(np.arctan2(np.fabs(cross), dot).sum())
+    return cost
@@ -0,0 +1,88 @@
+import heapq
+import time
+
+"""
+Module for discrete event simulation of robot operation, on a virtual clock
+"""
+
+
+class SimulationClock:
+    """
+    Virtual clock running scheduled events in time order, events at the same
+    time in scheduling order.
+    With pace None, the clock runs as fast as possible. Otherwise it is
+    paced on wall time, pace virtual seconds per wall second, e.g. 1 for
+    realtime or 60 for a minute per second.
+    """
+
+    def __init__(self, pace: float = None, timer=time.perf_counter, sleep=time.sleep):
+        self.now = 0.
+        self.pace = pace
+        self.timer = timer
+        self.sleep = sleep
+        self._events = []
+        self._count = 0
+
+    def schedule_at(self, at: float, action, *args):
+        """
+        Schedules action(*args) at virtual time at
+        :param at: virtual time, not before now
+        :param action: callable
+        :return:
+        """
+        if at < self.now:
+            raise ValueError(f'event at {at} is in the past of {self.now}')
+        heapq.heappush(self._events, (at, self._count, action, args))
+        self._count += 1
+
+    def schedule(self, delay: float, action, *args):
+        self.schedule_at(self.now + delay, action, *args)
+
+    def run(self, until: float = None):
+        """
+        Runs events up to virtual time until included, or all of them
+        :param until: virtual time the clock is at when returning, or None
+        :return:
+        """
+        events = self._events
+        start_time = self.now
+        start_wall = self.timer()
+        while events and (until is None or events[0][0] <= until):
+            at, _, action, args = heapq.heappop(events)
+            self._wait(at, start_time, start_wall)
+            self.now = at
+            action(*args)
+        if until is not None:
+            self._wait(until, start_time, start_wall)
+            self.now = until
+
+    def _wait(self, at, start_time, start_wall):
+        if self.pace is None:
+            return
+        delay = start_wall + (at - start_time) / self.pace - self.timer()
+        if delay > 0:
+            self.sleep(delay)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __repr__(self):
+        return f'clock(now={self.now}, events={len(self)})'
+
+
+class MotionRecord:
+    """
+    Timestamped trace of a motion run on a simulation clock
+    """
+
+    def __init__(self, start: float, end: float, motion, plan):
+        self.start = start
+        self.end = end
+        self.motion = motion
+        self.plan = plan
+
+    def get_required_energy(self) -> float:
+        return self.plan.get_required_energy()
+
+    def __repr__(self):
+        return f'record(start={self.start}, end={self.end}, motion={type(self.motion).__name__}, {self.plan})'
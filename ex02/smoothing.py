@@ -0,0 +1,109 @@
+import numpy as np
+
+from ex02.geometry import Arc, Point, PointArray, turns
+from ex02.motion import Translation, Rotation
+from ex02.robot import Navigator, Arranger
+
+"""
+Module for smooth paths: corners rounded by arcs tangent to the translations they join
+"""
+
+
+class PathSmoother:
+    """
+    Motions through positions where corners are rounded by fillet arcs of min_radius,
+    tangent to both translations, which are trimmed to the arc ends. The robot then turns
+    while moving forward instead of stopping for a rotation on the spot.
+    A corner is rounded only if its arc ends fit in the halves of both translations it
+    joins; other corners, such as U-turns or corners between short translations, keep a
+    rotation on the spot, as Navigator plans it. Translations trimmed to nothing, i.e. to
+    less than PointArray.ABS_TOL, are removed.
+    Fillet arcs have the center, radius and direction Arc computes for them, and the
+    angle they sweep, -θ for indirect ones turning by θ: Arc would give them θ - 2π,
+    the rest of their circle, which the motion controller would run.
+    """
+
+    def __init__(self, min_radius: float):
+        if not min_radius > 0:
+            raise ValueError(f'min_radius {min_radius} is not positive')
+        self.min_radius = min_radius
+
+    def compute_motions(self, positions):
+        """
+        :param positions: sequence of xy pairs or Points, N x 2 array or PointArray
+        :return: list of Translations and Rotations
+        """
+        points = PointArray.new(positions)
+        xy = points.xy[Navigator._kept(points)]
+        if len(xy) < 2:
+            return []
+        d = xy[1:] - xy[:-1]
+        lengths = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])
+        u = d / lengths[:, np.newaxis]
+
+        # corners, as Navigator._join
+        before = u[:-1]
+        corners, angles, left = turns(u)
+
+        # fillet of corner k from translation k, at distance trim[k] of their common point
+        with np.errstate(over='ignore', invalid='ignore'):
+            trim = self.min_radius * np.tan(angles / 2)
+        room = np.minimum(lengths[:-1], lengths[1:]) / 2
+        rounded = corners & (trim <= room)
+        trim = np.where(rounded, trim, 0.)
+
+        trim_start = np.concatenate(([0.], trim))
+        trim_end = np.concatenate((trim, [0.]))
+        starts = xy[:-1] + u * trim_start[:, np.newaxis]
+        ends = xy[1:] - u * trim_end[:, np.newaxis]
+        translation_lengths = lengths - trim_start - trim_end
+
+        # centers on the left of translations turning left, on the right otherwise
+        side = np.where(left, 1., -1.)[:, np.newaxis]
+        normals = np.stack((-before[:, 1], before[:, 0]), axis=1) * side
+        arc_starts = ends[:-1]
+        centers = arc_starts + normals * self.min_radius
+        # as Arc.compute_direction
+        r = centers - arc_starts
+        indirect = r[:, 0] * before[:, 1] - r[:, 1] * before[:, 0] > 0
+        # the angle swept from start to end, not Arc's complement θ - 2π
+        arc_angles = np.where(indirect, -angles, angles)
+
+        vectors = [Point.from_floats(x, y) for x, y in u.tolist()]
+        starts = [Point.from_floats(x, y) for x, y in starts.tolist()]
+        ends = [Point.from_floats(x, y) for x, y in ends.tolist()]
+        centers = centers.tolist()
+        translations = [Translation._from_parts(start, end, length, vector)
+                        for start, end, length, vector
+                        in zip(starts, ends, translation_lengths.tolist(), vectors)]
+        rotations = {}
+        for k in np.flatnonzero(corners).tolist():
+            if rounded[k]:
+                arc = Arc._from_parts(ends[k], starts[k + 1], vectors[k], vectors[k + 1],
+                                      Point.from_floats(*centers[k]), self.min_radius, float(arc_angles[k]),
+                                      Arc.INDIRECT if indirect[k] else Arc.DIRECT)
+            else:
+                arc = Arc._from_parts(ends[k], starts[k + 1], vectors[k], vectors[k + 1],
+                                      ends[k], 0., float(angles[k]), Arc.DIRECT)
+            rotations[k + 1] = Rotation._from_arc(arc)
+
+        motions = []
+        for i, translation in enumerate(translations):
+            if i in rotations:
+                motions.append(rotations[i])
+            if translation.length > PointArray.ABS_TOL:
+                motions.append(translation)
+        return motions
+
+
+class SmoothNavigator(Navigator):
+    """
+    Navigator planning smooth paths with a PathSmoother, positions being kept in payload order
+    """
+
+    def __init__(self, min_radius: float):
+        super().__init__(Arranger())
+        self.smoother = PathSmoother(min_radius)
+
+    def compute_motions(self, positions, commit: bool = True):
+        return self.smoother.compute_motions(self.to_point_array(positions))
@@ -0,0 +1,384 @@
+import itertools
+import math
+
+import numpy as np
+
+from ex02.geometry import Line
+
+"""
+Module for spatial indexing of segments in 2D
+"""
+
+
+class SegmentIndex:
+    """
+    Uniform grid index over segments, i.e. objects with `start` and `end`
+    Points such as Translations.
+    A Line has no extent so it can not be indexed, but it can be queried.
+    """
+    MAX_CELLS_PER_AXIS = 1 << 20
+    # in cells, distance to a grid line under which both cells around it are crossed
+    TOLERANCE = 1e-9
+    # queries with bounding boxes of more cells look up the cells they cross only
+    MAX_BOX_CELLS = 16
+
+    def __init__(self, segments, cell_size: float = None):
+        self.segments = list(segments)
+        xy = np.empty((len(self.segments), 4), dtype=np.float64)
+        for i, s in enumerate(self.segments):
+            xy[i] = (s.start.x, s.start.y, s.end.x, s.end.y)
+        self.xy = xy
+
+        lower = np.minimum(xy[:, :2], xy[:, 2:])
+        upper = np.maximum(xy[:, :2], xy[:, 2:])
+        if len(xy):
+            self.origin = lower.min(axis=0)
+            self.extent = upper.max(axis=0)
+        else:
+            self.origin = self.extent = np.zeros(2)
+
+        if cell_size is None:
+            cell_size = SegmentIndex._default_cell_size(xy, self.origin, self.extent)
+        self.cell_size = cell_size
+        self.shape = (np.floor((self.extent - self.origin) / cell_size).astype(np.int64) + 1)
+
+        self._build(*self._walk(xy))
+
+    @staticmethod
+    def _default_cell_size(xy, origin, extent):
+        if not len(xy):
+            return 1.
+        # about one segment per cell, with a bounded number of cells per axis
+        lengths = np.hypot(xy[:, 2] - xy[:, 0], xy[:, 3] - xy[:, 1])
+        size = max(float(lengths.mean()), float(np.max(extent - origin)) / SegmentIndex.MAX_CELLS_PER_AXIS)
+        return size or 1.
+
+    def _cell_ranges(self, lower, upper):
+        first = np.floor((lower - self.origin) / self.cell_size).astype(np.int64)
+        last = np.floor((upper - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(first, 0, self.shape - 1), np.clip(last, 0, self.shape - 1)
+
+    def _walk(self, xy):
+        """
+        Cells crossed by segments, supercover like: the cells of both ends, and
+        both cells on each side of every grid line a segment crosses, so that
+        segments through a cell corner are in the 4 cells around it
+        :param xy: array of segments as (x0, y0, x1, y1) rows
+        :return: array of segment ids, and array of cell keys, a cell key for each segment id
+        """
+        lower = np.minimum(xy[:, :2], xy[:, 2:])
+        upper = np.maximum(xy[:, :2], xy[:, 2:])
+        first, last = self._cell_ranges(lower, upper)
+        segment_ids = [np.arange(len(xy))] * 2
+        cells = [self._cell_ranges(xy[:, :2], xy[:, 2:])[0], self._cell_ranges(xy[:, 2:], xy[:, :2])[0]]
+        for axis in range(2):
+            other = 1 - axis
+            crossings = last[:, axis] - first[:, axis]
+            ids = np.repeat(np.arange(len(xy)), crossings)
+            local = np.arange(len(ids)) - np.repeat(np.cumsum(crossings) - crossings, crossings)
+            line = first[ids, axis] + 1 + local
+            start, end = xy[ids, axis], xy[ids, axis + 2]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = (self.origin[axis] + line * self.cell_size - start) / (end - start)
+            t = np.clip(np.nan_to_num(t), 0., 1.)
+            position = xy[ids, other] + t * (xy[ids, other + 2] - xy[ids, other])
+            # both rows around position when it is within rounding errors of a grid line
+            scaled = (position - self.origin[other]) / self.cell_size
+            for offset in (-SegmentIndex.TOLERANCE, SegmentIndex.TOLERANCE):
+                across = np.clip(np.floor(scaled + offset).astype(np.int64), 0, self.shape[other] - 1)
+                for side in (line - 1, line):
+                    crossed = np.empty((len(ids), 2), dtype=np.int64)
+                    crossed[:, axis] = side
+                    crossed[:, other] = across
+                    segment_ids.append(ids)
+                    cells.append(crossed)
+        segment_ids = np.concatenate(segment_ids)
+        cells = np.concatenate(cells)
+        return segment_ids, cells[:, 0] * self.shape[1] + cells[:, 1]
+
+    def _build(self, segment_ids, keys):
+        """
+        Stores segment ids sorted by cell key, CSR like:
+        ids of segments in cell keys[k] are ids[starts[k]:starts[k + 1]]
+        """
+        order = np.lexsort((segment_ids, keys))
+        keys, segment_ids = keys[order], segment_ids[order]
+        unique = np.ones(len(keys), dtype=bool)
+        unique[1:] = (keys[1:] != keys[:-1]) | (segment_ids[1:] != segment_ids[:-1])
+        keys = keys[unique]
+        self.ids = segment_ids[unique]
+        self.keys, self.starts = np.unique(keys, return_index=True)
+        self.starts = np.append(self.starts, len(keys))
+
+    def _in_cells(self, keys):
+        """ids of segments in cells of keys"""
+        keys = np.unique(keys)
+        k = np.searchsorted(self.keys, keys)
+        k = k[k < len(self.keys)]
+        k = k[np.isin(self.keys[k], keys)]
+        if not len(k):
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.ids[self.starts[i]:self.starts[i + 1]] for i in k]))
+
+    def _candidates(self, lower, upper):
+        """ids of segments in cells overlapping box [lower, upper]"""
+        if not len(self.segments):
+            return np.empty(0, dtype=np.int64)
+        if np.any(upper < self.origin) or np.any(lower > self.extent):
+            return np.empty(0, dtype=np.int64)
+        first, last = self._cell_ranges(np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64))
+        cx, cy = np.meshgrid(np.arange(first[0], last[0] + 1), np.arange(first[1], last[1] + 1), indexing='ij')
+        return self._in_cells((cx * self.shape[1] + cy).ravel())
+
+    def intersecting(self, segment) -> list:
+        """
+        Finds indexed segments intersecting a segment or a Line
+        :param segment: object with start and end Points, or Line
+        :return: sorted list of segment indices
+        """
+        if not len(self.segments):
+            return []
+        if isinstance(segment, Line):
+            clipped = self._clip((segment.point.x, segment.point.y), (segment.vector.x, segment.vector.y),
+                                 -math.inf, math.inf)
+        else:
+            clipped = self._clip((segment.start.x, segment.start.y),
+                                 (segment.end.x - segment.start.x, segment.end.y - segment.start.y), 0., 1.)
+        if clipped is None:
+            return []
+        query = np.array(clipped, dtype=np.float64)
+        lower, upper = np.minimum(query[:2], query[2:]), np.maximum(query[:2], query[2:])
+        first, last = self._cell_ranges(lower, upper)
+        if np.prod(last - first + 1) <= SegmentIndex.MAX_BOX_CELLS:
+            candidates = self._candidates(lower, upper)
+        else:
+            candidates = self._in_cells(self._walk(query[np.newaxis, :])[1])
+        hits = segments_intersect(self.xy[candidates], query[np.newaxis, :])
+        return candidates[hits].tolist()
+
+    def within(self, point, distance: float) -> list:
+        """
+        Finds indexed segments at a distance lower or equal to distance from point
+        :param point: Point
+        :param distance: float
+        :return: sorted list of segment indices
+        """
+        center = np.array((point.x, point.y), dtype=np.float64)
+        candidates = self._candidates(center - distance, center + distance)
+        distances = distance_to_segments(center, self.xy[candidates])
+        return candidates[distances <= distance].tolist()
+
+    def self_intersections(self, path: bool = True) -> list:
+        """
+        Finds all pairs of intersecting indexed segments
+        :param path: if True, segments are consecutive moves of a path and
+        consecutive segments are not reported, as they always touch
+        :return: sorted list of (i, j) pairs, with i < j
+        """
+        sizes = np.diff(self.starts)
+        crowded = sizes > 1
+        sizes = sizes[crowded]
+        group_starts = self.starts[:-1][crowded]
+        if not len(sizes):
+            return []
+
+        # all (a, b) couples within each cell
+        pair_counts = sizes * sizes
+        group = np.repeat(np.arange(len(sizes)), pair_counts)
+        local = np.arange(len(group)) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        a = self.ids[group_starts[group] + local // sizes[group]]
+        b = self.ids[group_starts[group] + local % sizes[group]]
+        keep = a < b
+        if path:
+            keep &= b != a + 1
+        pairs = np.unique(a[keep] * len(self.segments) + b[keep])
+        a, b = np.divmod(pairs, len(self.segments))
+
+        hits = segments_intersect(self.xy[a], self.xy[b])
+        return list(zip(a[hits].tolist(), b[hits].tolist()))
+
+    def _clip(self, point, vector, t_min, t_max):
+        """Clips segment from point + t_min * vector to point + t_max * vector to index extent, slab method"""
+        p = np.array(point, dtype=np.float64)
+        v = np.array(vector, dtype=np.float64)
+        for axis in range(2):
+            if v[axis] == 0:
+                if not self.origin[axis] <= p[axis] <= self.extent[axis]:
+                    return None
+                continue
+            t0 = (self.origin[axis] - p[axis]) / v[axis]
+            t1 = (self.extent[axis] - p[axis]) / v[axis]
+            t_min = max(t_min, min(t0, t1))
+            t_max = min(t_max, max(t0, t1))
+        if t_min > t_max:
+            return None
+        return (*(p + t_min * v), *(p + t_max * v))
+
+    def __len__(self):
+        return len(self.segments)
+
+
+class PointIndex:
+    """
+    Uniform grid index over points, for nearest neighbours queries.
+    """
+    MAX_CELLS_PER_AXIS = 1 << 20
+
+    def __init__(self, xy, cell_size: float = None):
+        self.xy = np.ascontiguousarray(xy, dtype=np.float64).reshape(-1, 2)
+        if len(self.xy):
+            self.origin = self.xy.min(axis=0)
+            self.extent = self.xy.max(axis=0)
+        else:
+            self.origin = self.extent = np.zeros(2)
+
+        if cell_size is None:
+            cell_size = PointIndex._default_cell_size(len(self.xy), self.origin, self.extent)
+        self.cell_size = cell_size
+        self.shape = (np.floor((self.extent - self.origin) / cell_size).astype(np.int64) + 1)
+
+        self.cells = self._cells(self.xy)
+        keys = self.cells[:, 0] * self.shape[1] + self.cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        self.ids = order
+        self.keys, self.starts = np.unique(keys[order], return_index=True)
+        self.starts = np.append(self.starts, len(keys))
+
+    @staticmethod
+    def _default_cell_size(count, origin, extent):
+        # about two points per cell, with a bounded number of cells per axis
+        width, height = (float(v) for v in extent - origin)
+        size = math.sqrt(2 * width * height / count) if count and width and height else max(width, height) / 2
+        size = max(size, max(width, height) / PointIndex.MAX_CELLS_PER_AXIS)
+        return size or 1.
+
+    def _cells(self, xy):
+        cells = np.floor((xy - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.shape - 1)
+
+    def _in_cells(self, first, last):
+        """ids of points in cells of [first, last] box of cell coordinates"""
+        first = np.maximum(first, 0)
+        last = np.minimum(last, self.shape - 1)
+        if np.any(first > last):
+            return np.empty(0, dtype=np.int64)
+        cx, cy = np.meshgrid(np.arange(first[0], last[0] + 1), np.arange(first[1], last[1] + 1), indexing='ij')
+        keys = (cx * self.shape[1] + cy).ravel()
+        k = np.searchsorted(self.keys, keys)
+        found = k < len(self.keys)
+        found[found] = self.keys[k[found]] == keys[found]
+        k = k[found]
+        starts = self.starts[k]
+        counts = self.starts[k + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return self.ids[offsets + np.arange(len(offsets))]
+
+    def nearest(self, point, k: int = 1, mask=None) -> list:
+        """
+        Finds the k nearest indexed points
+        :param point: Point
+        :param k: number of points
+        :param mask: optional array of booleans, only points where it is True are considered
+        :return: list of point indices, nearest first
+        """
+        center = np.array((point.x, point.y), dtype=np.float64)
+        cell = self._cells(center)
+        available = len(self.xy) if mask is None else int(np.count_nonzero(mask))
+        k = min(k, available)
+        if k <= 0:
+            return []
+        # distance from center to the outside of the ring r box
+        margin = min(float(np.min(center - self.origin - cell * self.cell_size)),
+                     float(np.min(self.origin + (cell + 1) * self.cell_size - center)))
+        max_ring = int(np.max(self.shape))
+        for ring in itertools.count():
+            ids = self._in_cells(cell - ring, cell + ring)
+            if mask is not None:
+                ids = ids[mask[ids]]
+            if len(ids) >= k:
+                distances = np.hypot(self.xy[ids, 0] - center[0], self.xy[ids, 1] - center[1])
+                nearest = np.argsort(distances, kind='stable')[:k]
+                if distances[nearest[-1]] <= margin + ring * self.cell_size or ring >= max_ring:
+                    return ids[nearest].tolist()
+
+    def nearest_neighbours(self, k: int):
+        """
+        Finds the k nearest other points of every indexed point
+        :param k: number of neighbours, bounded by the number of other points
+        :return: N x k array of point indices, nearest first
+        """
+        count = len(self.xy)
+        k = min(k, count - 1)
+        neighbours = np.empty((count, max(k, 0)), dtype=np.int64)
+        if k <= 0:
+            return neighbours
+        if count / len(self.keys) < k / 2:
+            # cells are processed one by one, so coarser cells of about k points are faster
+            cell_size = self.cell_size * math.sqrt(k * len(self.keys) / count)
+            return PointIndex(self.xy, cell_size)._nearest_neighbours(k, neighbours)
+        return self._nearest_neighbours(k, neighbours)
+
+    def _nearest_neighbours(self, k, neighbours):
+        max_ring = int(np.max(self.shape))
+        for i in range(len(self.keys)):
+            members = self.ids[self.starts[i]:self.starts[i + 1]]
+            cell = self.cells[members[0]]
+            points = self.xy[members]
+            # distance from points to the outside of the ring r box
+            margin = np.minimum(points - self.origin - cell * self.cell_size,
+                                self.origin + (cell + 1) * self.cell_size - points).min(axis=1)
+            for ring in itertools.count(1):
+                ids = self._in_cells(cell - ring, cell + ring)
+                if len(ids) <= k:
+                    continue
+                d = points[:, np.newaxis, :] - self.xy[np.newaxis, ids, :]
+                distances = np.hypot(d[..., 0], d[..., 1])
+                distances[members[:, np.newaxis] == ids[np.newaxis, :]] = np.inf
+                nearest = np.argsort(distances, axis=1, kind='stable')[:, :k]
+                kth = np.take_along_axis(distances, nearest[:, -1:], axis=1)[:, 0]
+                if np.all(kth <= margin + ring * self.cell_size) or ring >= max_ring:
+                    neighbours[members] = ids[nearest]
+                    break
+        return neighbours
+
+    def __len__(self):
+        return len(self.xy)
+
+
+def segments_intersect(a, b):
+    """
+    Intersection test between segments, element-wise
+    :param a: array of segments as (x0, y0, x1, y1) rows
+    :param b: array of segments as (x0, y0, x1, y1) rows
+    :return: array of booleans
+    """
+    ax, ay, adx, ady = a[:, 0], a[:, 1], a[:, 2] - a[:, 0], a[:, 3] - a[:, 1]
+    bx, by, bdx, bdy = b[:, 0], b[:, 1], b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]
+
+    o1 = adx * (by - ay) - ady * (bx - ax)
+    o2 = adx * (b[:, 3] - ay) - ady * (b[:, 2] - ax)
+    o3 = bdx * (ay - by) - bdy * (ax - bx)
+    o4 = bdx * (a[:, 3] - by) - bdy * (a[:, 2] - bx)
+
+    overlap = (np.minimum(a[:, 0], a[:, 2]) <= np.maximum(b[:, 0], b[:, 2])) \
+        & (np.minimum(b[:, 0], b[:, 2]) <= np.maximum(a[:, 0], a[:, 2])) \
+        & (np.minimum(a[:, 1], a[:, 3]) <= np.maximum(b[:, 1], b[:, 3])) \
+        & (np.minimum(b[:, 1], b[:, 3]) <= np.maximum(a[:, 1], a[:, 3]))
+    return (o1 * o2 <= 0) & (o3 * o4 <= 0) & overlap
+
+
+def distance_to_segments(point, segments):
+    """
+    Distances from a point to segments
+    :param point: xy array
+    :param segments: array of segments as (x0, y0, x1, y1) rows
+    :return: array of distances
+    """
+    start = segments[:, :2]
+    d = segments[:, 2:] - start
+    square_length = np.einsum('ij,ij->i', d, d)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.einsum('ij,ij->i', point - start, d) / square_length
+    t = np.clip(np.nan_to_num(t), 0., 1.)
+    closest = start + t[:, np.newaxis] * d
+    return np.hypot(closest[:, 0] - point[0], closest[:, 1] - point[1])
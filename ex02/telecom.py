@@ -1,6 +1,11 @@
+import struct
 from abc import ABC, abstractmethod
 from enum import (Enum)
-from typing import Dict
+from typing import Dict, Iterable, Iterator, AsyncIterator, List
+
+import numpy as np
+
+from ex02.geometry import Point, PointArray
 
 
 class Command(Enum):
@@ -26,8 +31,170 @@ class Telecom(object):
         self.errors= errors
 
 
+class TelecomCodec:
+    """
+    Compact binary wire format for Telecoms, little-endian:
+    - header: magic, version, command code, payload type (uint8 each), position count (uint32)
+    - positions: count x,y pairs, float32 or float64 according to payload type
+    - errors: count (uint16), then each error as length (uint16) and utf-8 bytes
+    The header is 8 bytes long, so positions are aligned for decoding without copy.
+    """
+    MAGIC = 0x54
+    VERSION = 1
+    HEADER = struct.Struct('<BBBBI')
+    LENGTH = struct.Struct('<H')
+
+    COMMAND_CODES = {
+        Command.READY_FOR_LOADING: 1,
+        Command.MOVING: 2,
+        Command.LOADING: 3,
+        Command.LOADED_OK: 4,
+        Command.LOADED_INVALID: 5,
+        Command.MOVE: 6,
+        Command.MOVED: 7,
+        Command.INVALID: 8,
+    }
+    COMMANDS = {code: command for command, code in COMMAND_CODES.items()}
+
+    NO_PAYLOAD = 0
+    FLOAT32 = 1
+    FLOAT64 = 2
+    DTYPES = {FLOAT32: np.dtype('<f4'), FLOAT64: np.dtype('<f8')}
+
+    @staticmethod
+    def encode(tc: Telecom, payload_type: int = FLOAT64) -> bytes:
+        """
+        Encodes telecom
+        :param tc: Telecom, with positions as payload if any
+        :param payload_type: FLOAT32 or FLOAT64
+        :return: bytes
+        """
+        chunks = [b'']
+        count = 0
+        if tc.payload is None:
+            payload_type = TelecomCodec.NO_PAYLOAD
+        else:
+            positions = tc.payload
+            if isinstance(positions, PointArray):
+                positions = positions.xy
+            elif isinstance(positions, list) and positions and isinstance(positions[0], Point):
+                positions = PointArray.from_points(positions).xy
+            try:
+                xy = np.asarray(positions, dtype=TelecomCodec.DTYPES[payload_type])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f'payload is not a list of positions: {e}')
+            if xy.size and (xy.ndim != 2 or xy.shape[1] != 2):
+                raise ValueError(f'payload is not a list of positions: shape {xy.shape}')
+            count = len(xy)
+            chunks.append(xy.tobytes())
+
+        errors = tc.errors or []
+        chunks.append(TelecomCodec.LENGTH.pack(len(errors)))
+        for error in errors:
+            data = str(error).encode('utf-8')
+            chunks.append(TelecomCodec.LENGTH.pack(len(data)))
+            chunks.append(data)
+
+        chunks[0] = TelecomCodec.HEADER.pack(TelecomCodec.MAGIC, TelecomCodec.VERSION,
+                                             TelecomCodec.COMMAND_CODES[tc.command], payload_type, count)
+        return b''.join(chunks)
+
+    @staticmethod
+    def decode(data) -> Telecom:
+        """
+        Decodes telecom. Positions are a N x 2 array sharing memory with data:
+        PointArray wraps float64 positions without copy, but converts, thus copies, float32 ones.
+        :param data: bytes-like object
+        :return: Telecom
+        :raise ValueError: if data is not an encoded telecom, e.g. truncated or oversized
+        """
+        view = memoryview(data).cast('B')
+        size = len(view)
+        TelecomCodec._check_size(size, TelecomCodec.HEADER.size, 'header')
+        magic, version, code, payload_type, count = TelecomCodec.HEADER.unpack_from(view)
+        if magic != TelecomCodec.MAGIC or version != TelecomCodec.VERSION:
+            raise ValueError(f'unknown telecom format {magic:#x} version {version}')
+        if code not in TelecomCodec.COMMANDS:
+            raise ValueError(f'unknown command code {code}')
+        if payload_type != TelecomCodec.NO_PAYLOAD and payload_type not in TelecomCodec.DTYPES:
+            raise ValueError(f'unknown payload type {payload_type}')
+
+        offset = TelecomCodec.HEADER.size
+        payload = None
+        if payload_type != TelecomCodec.NO_PAYLOAD:
+            dtype = TelecomCodec.DTYPES[payload_type]
+            end = offset + 2 * count * dtype.itemsize
+            TelecomCodec._check_size(size, end, f'{count} positions')
+            payload = np.frombuffer(view[offset:end], dtype=dtype).reshape(count, 2)
+            offset = end
+
+        errors = []
+        TelecomCodec._check_size(size, offset + TelecomCodec.LENGTH.size, 'error count')
+        error_count, = TelecomCodec.LENGTH.unpack_from(view, offset)
+        offset += TelecomCodec.LENGTH.size
+        for _ in range(error_count):
+            TelecomCodec._check_size(size, offset + TelecomCodec.LENGTH.size, 'error length')
+            length, = TelecomCodec.LENGTH.unpack_from(view, offset)
+            offset += TelecomCodec.LENGTH.size
+            TelecomCodec._check_size(size, offset + length, 'error')
+            errors.append(str(view[offset:offset + length], 'utf-8'))
+            offset += length
+        if offset != size:
+            raise ValueError(f'telecom of {offset} bytes followed by {size - offset} more bytes')
+
+        return Telecom(command=TelecomCodec.COMMANDS[code], payload=payload, errors=errors or None)
+
+    @staticmethod
+    def _check_size(size: int, end: int, what: str):
+        if end > size:
+            raise ValueError(f'telecom truncated: {what} up to byte {end} of {size}')
+
+
 class Exchanger(ABC):
+    """
+    Exchanges telecoms, one by one or by batches.
+    A batch stops at the first answer in SHORT_CIRCUIT: following telecoms,
+    e.g. a MOVE after a rejected LOADING, are not processed.
+    """
+    SHORT_CIRCUIT = frozenset([Command.MOVING, Command.LOADED_INVALID])
 
     @abstractmethod
     def exchange(self, tm: Telecom) -> Telecom:
         pass
+
+    def iter_exchange(self, tms: Iterable[Telecom]) -> Iterator[Telecom]:
+        """
+        Exchanges telecoms in order, streaming answers
+        :param tms: telecoms
+        :return: generator of answers
+        """
+        for tm in tms:
+            answer = self.exchange(tm)
+            yield answer
+            if answer.command in Exchanger.SHORT_CIRCUIT:
+                return
+
+    def exchange_many(self, tms: Iterable[Telecom]) -> List[Telecom]:
+        """
+        Exchanges telecoms in order
+        :param tms: telecoms
+        :return: answers, up to the short-circuiting one
+        """
+        return list(self.iter_exchange(tms))
+
+
+class AsyncExchanger(ABC):
+
+    @abstractmethod
+    async def exchange(self, tm: Telecom) -> Telecom:
+        pass
+
+    async def iter_exchange(self, tms: Iterable[Telecom]) -> AsyncIterator[Telecom]:
+        for tm in tms:
+            answer = await self.exchange(tm)
+            yield answer
+            if answer.command in Exchanger.SHORT_CIRCUIT:
+                return
+
+    async def exchange_many(self, tms: Iterable[Telecom]) -> List[Telecom]:
+        return [answer async for answer in self.iter_exchange(tms)]
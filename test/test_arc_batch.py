@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+import pytest
+
+from ex02.geometry import Arc, ArcBatch, Point
+
+ARCS = [
+    (Point(1, 0), Point(0, 1), Point(0, 1), None),
+    (Point(1, 0), Point(0, 1), Point(0, -1), None),
+    (Point(10, 0), Point(0, 10), Point(0, 1), Point(-1, 0)),
+    (Point(0, 5), Point(0, 0), Point(1, -1), Point(-1, -1)),
+    (Point(1, 0), Point(1, 0), Point(0, 1), Point(-1, 0)),
+    (Point(0, 0), Point(4, 0), Point(1, 0), Point(1, 0)),
+]
+
+
+def build(arcs):
+    starts, ends, start_tangents, end_tangents = zip(*arcs)
+    if any(t is None for t in end_tangents):
+        end_tangents = [t if t is not None else Arc(*a[:3]).end_tangent for t, a in zip(end_tangents, arcs)]
+    return ArcBatch(starts, ends, start_tangents, end_tangents)
+
+
+def test_same_attributes_as_arc():
+    candidate = build(ARCS)
+
+    assert candidate.valid.all()
+    for i, (start, end, start_tangent, end_tangent) in enumerate(ARCS):
+        arc = Arc(start, end, start_tangent, end_tangent)
+        assert candidate.center[i] == arc.center
+        assert candidate.end_tangent[i] == arc.end_tangent
+        assert math.isclose(candidate.radius[i], arc.radius)
+        assert math.isclose(candidate.angle[i], arc.angle)
+        assert math.isclose(candidate.length[i], arc.length)
+        assert math.isclose(candidate.length[i], math.fabs(arc.angle * arc.radius))
+        assert candidate.direction[i] == arc.direction
+
+
+def test_end_tangents_are_computed_as_arc():
+    candidate = ArcBatch([Point(1, 0), Point(1, 0)], [Point(0, 1), Point(0, 1)], [Point(0, 1), Point(0, -1)])
+
+    assert candidate.end_tangent[0] == Point(-1, 0)
+    assert candidate.end_tangent[1] == Point(1, 0)
+    assert candidate.direction.tolist() == [Arc.DIRECT, Arc.INDIRECT]
+
+
+def test_errors_are_flagged_per_element():
+    starts = [Point(1, 0), Point(1, 0), Point(0, 0), Point(1, 0)]
+    ends = [Point(0, 1), Point(0, 1), Point(4, 0), Point(0, 1)]
+    start_tangents = [Point(0, 1), Point(0, 0), Point(1, 0), Point(0, 1)]
+    end_tangents = [Point(-1, 0), Point(-1, 0), Point(0, 1), Point(1, 0)]
+
+    with pytest.raises(ZeroDivisionError):
+        Arc(starts[1], ends[1], start_tangents[1], end_tangents[1])
+    with pytest.raises(AssertionError):
+        Arc(starts[2], ends[2], start_tangents[2], end_tangents[2])
+    with pytest.raises(ValueError):
+        Arc(starts[3], ends[3], start_tangents[3], end_tangents[3])
+
+    candidate = ArcBatch(starts, ends, start_tangents, end_tangents)
+
+    assert candidate.errors.tolist() == [ArcBatch.OK, ArcBatch.DEGENERATE,
+                                         ArcBatch.NOT_EQUIDISTANT, ArcBatch.INCOHERENT_TANGENTS]
+    assert candidate.valid.tolist() == [True, False, False, False]
+    assert np.isnan(candidate.radius[1:]).all()
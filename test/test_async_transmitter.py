@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+
+from ex02.robot import AsyncTransmitter
+from ex02.telecom import Telecom, Command
+
+
+class TestAsyncTransmitter:
+
+    @pytest.fixture()
+    def init_transmitter(self, mocker):
+        robot = mocker.Mock()
+        robot.is_moving.return_value = False
+        transmitter = AsyncTransmitter()
+        transmitter.register(robot)
+        return robot, transmitter
+
+    def test_send_tc_ready_for_loading(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        # when
+        tm = asyncio.run(tr.exchange(Telecom(command=Command.READY_FOR_LOADING)))
+        # then
+        assert tm.command == Command.READY_FOR_LOADING
+
+    def test_send_tc_on_loading_with_payload(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        # when
+        tm = asyncio.run(tr.exchange(Telecom(command=Command.LOADING, payload=['foo'])))
+        # then
+        assert tm.command == Command.LOADED_OK
+        robot.load_positions.assert_called_once_with(['foo'])
+
+    def test_queries_are_answered_while_moving(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        started = threading.Event()
+        release = threading.Event()
+
+        def run():
+            started.set()
+            release.wait(5)
+        robot.run.side_effect = run
+
+        async def scenario():
+            move = asyncio.create_task(tr.exchange(Telecom(command=Command.MOVE)))
+            await asyncio.to_thread(started.wait, 5)
+            queries = await asyncio.gather(*[tr.exchange(Telecom(command=Command.READY_FOR_LOADING))
+                                             for _ in range(10)])
+            loading = await tr.exchange(Telecom(command=Command.LOADING, payload=['foo']))
+            second_move = await tr.exchange(Telecom(command=Command.MOVE))
+            release.set()
+            return await move, queries, loading, second_move
+
+        # when
+        moved, queries, loading, second_move = asyncio.run(scenario())
+
+        # then
+        assert moved.command == Command.MOVED
+        assert all(tm.command == Command.MOVING for tm in queries)
+        assert loading.command == Command.MOVING
+        assert second_move.command == Command.MOVING
+        robot.run.assert_called_once()
+        robot.load_positions.assert_not_called()
+
+    def test_concurrent_moves_run_once(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        loading = threading.Event()
+        release = threading.Event()
+
+        def load_positions(positions):
+            loading.set()
+            release.wait(5)
+        robot.load_positions.side_effect = load_positions
+
+        async def scenario():
+            load = asyncio.create_task(tr.exchange(Telecom(command=Command.LOADING, payload=['foo'])))
+            await asyncio.to_thread(loading.wait, 5)
+            # both wait for the loading to end
+            moves = [asyncio.create_task(tr.exchange(Telecom(command=Command.MOVE))) for _ in range(2)]
+            await asyncio.sleep(0)
+            release.set()
+            return await load, await asyncio.gather(*moves)
+
+        # when
+        loaded, moves = asyncio.run(scenario())
+
+        # then
+        assert loaded.command == Command.LOADED_OK
+        assert sorted(tm.command.name for tm in moves) == ['MOVED', 'MOVING']
+        robot.run.assert_called_once()
+
+    def test_send_tc_move_with_error(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        robot.run.side_effect = ValueError("Mocked Exception")
+        # when
+        tm = asyncio.run(tr.exchange(Telecom(command=Command.MOVE)))
+        # then
+        assert tm.command == Command.INVALID
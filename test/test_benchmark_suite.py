@@ -0,0 +1,30 @@
+import pytest
+
+from benchmark import suite
+
+
+def test_every_case_runs():
+    results = suite.run(repeat=1, min_time=0., sizes=(3,))
+
+    assert set(results) == {f'{name}[3]' for name in suite.CASES}
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path):
+    path = tmp_path / 'baseline.json'
+    suite.save({'a[1]': 1.0, 'b[1]': 1.0, 'c[1]': 1.0}, path)
+    results = {'a[1]': 1.1, 'b[1]': 1.3, 'c[1]': 0.5, 'd[1]': 2.0}
+
+    rows = suite.compare(results, suite.load(path), threshold=0.2)
+
+    assert [(key, regression) for key, *_, regression in rows] \
+        == [('a[1]', False), ('b[1]', True), ('c[1]', False), ('d[1]', False)]
+    text = suite.report(rows)
+    assert 'b[1]' in text and 'REGRESSION' in text
+    assert text.splitlines()[-1] == '1 regression(s) out of 4 cases'
+
+
+@pytest.mark.parametrize("argv", [['--save'], ['--compare']])
+def test_baseline_file_is_required(argv):
+    with pytest.raises(SystemExit):
+        suite.main(argv + ['--filter', 'point_arithmetic'])
@@ -0,0 +1,129 @@
+import pytest
+
+import numpy as np
+
+from ex02.geometry import Point
+from ex02.motion import Translation, Rotation
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel, \
+    EnergyBudgetExceeded
+from ex02.routing import RouteArranger
+
+ROUTE = [(0, 0), (10, 0), (10, 0), (10, 10), (0, 10), (0, 20), (0, 30), (5, 25), (20, 40)]
+
+
+@pytest.fixture()
+def motion_controller():
+    return MotionController(Wheel(), Wheel(), {'wheel_axis_length': 2, 'consumption_per_length_unit': 0.5})
+
+
+def total_energy(motion_controller, positions):
+    return sum(motion_controller.get_step_plan(m).get_required_energy()
+               for m in Navigator(Arranger()).compute_motions(positions))
+
+
+@pytest.mark.parametrize("motion", [
+    Translation(Point(0, 0), Point(3, 4)),
+    Rotation(Point(0, 0), Point(0, 0), Point(1, 0), Point(0, 1)),
+    Rotation(Point(0, 0), Point(10, 10), Point(1, 0), Point(0, 1)),
+])
+def test_energy_for_motion_as_step_plan(motion_controller, motion):
+    assert motion_controller.get_required_energy_for_motion(motion) \
+        == pytest.approx(motion_controller.get_step_plan(motion).get_required_energy())
+
+
+@pytest.mark.parametrize("as_array", [False, True])
+def test_all_positions_reachable(motion_controller, as_array):
+    positions = np.array(ROUTE, dtype=float) if as_array else ROUTE
+    energy = total_energy(motion_controller, ROUTE)
+
+    assert motion_controller.find_unreachable_position(positions, EnergySupplier(energy * 1.001)) is None
+
+
+@pytest.mark.parametrize("as_array", [False, True])
+def test_first_unreachable_position(motion_controller, as_array):
+    positions = np.array(ROUTE, dtype=float) if as_array else [Point(x, y) for x, y in ROUTE]
+
+    for i in range(2, len(ROUTE)):
+        energy = total_energy(motion_controller, ROUTE[:i])
+        if ROUTE[i] == ROUTE[i - 1]:
+            continue
+        assert motion_controller.find_unreachable_position(positions, EnergySupplier(energy * 1.001)) == i
+
+
+def test_energy_for_motions_as_step_plans(motion_controller):
+    motions = Navigator(Arranger()).compute_motions(ROUTE) + [Rotation(Point(0, 0), Point(10, 10), Point(1, 0),
+                                                                       Point(0, 1))]
+
+    assert motion_controller.get_required_energy_for_motions(motions) \
+        == pytest.approx(sum(motion_controller.get_step_plan(m).get_required_energy() for m in motions))
+
+
+def test_load_positions_from_generator(motion_controller):
+    robot = Robot(Transmitter(), motion_controller, Navigator(Arranger()), EnergySupplier(1000.))
+
+    robot.load_positions(xy for xy in ROUTE)
+
+    assert len(robot.motions) == len(Navigator(Arranger()).compute_motions(ROUTE))
+
+
+def test_load_positions_checks_energy_of_the_route_run(motion_controller):
+    energy = total_energy(motion_controller, ROUTE)
+    robot = Robot(Transmitter(), motion_controller, Navigator(Arranger()), EnergySupplier(energy * 0.999))
+
+    with pytest.raises(ValueError):
+        robot.load_positions(ROUTE)
+    robot.energy_supplier.quantity = energy * 1.001
+    robot.load_positions(ROUTE)
+    robot.run()
+    assert robot.energy_supplier.quantity == pytest.approx(energy * 0.001)
+
+
+def test_run_positions_checks_energy_of_the_route_run(motion_controller):
+    energy = total_energy(motion_controller, ROUTE)
+    robot = Robot(Transmitter(), motion_controller, Navigator(Arranger()), EnergySupplier(energy * 0.999))
+
+    with pytest.raises(EnergyBudgetExceeded):
+        robot.run_positions(ROUTE)
+    assert robot.energy_supplier.quantity == energy * 0.999
+    robot.energy_supplier.quantity = energy * 1.001
+    robot.run_positions([Point(*xy) for xy in ROUTE])
+    assert robot.energy_supplier.quantity == pytest.approx(energy * 0.001)
+
+
+def test_reordered_route_is_not_estimated_in_payload_order(motion_controller):
+    positions = [(0, 0), (10, 0), (1, 0), (11, 0)]
+    in_order = total_energy(motion_controller, positions)
+    robot = Robot(Transmitter(), motion_controller, Navigator(RouteArranger()), EnergySupplier(in_order / 2))
+
+    robot.load_positions(positions)
+
+    assert [t.end for t in robot.motions] == [(1, 0), (10, 0), (11, 0)]
+
+
+def test_load_positions_rejected_before_computing_motions(mocker, motion_controller):
+    navigator = Navigator(Arranger())
+    robot = Robot(Transmitter(), motion_controller, navigator, EnergySupplier(25.))
+    compute_motions = mocker.spy(navigator, 'compute_motions')
+
+    with pytest.raises(EnergyBudgetExceeded) as error:
+        robot.load_positions(ROUTE)
+
+    assert error.value.index == 4
+    assert compute_motions.call_count == 0
+    assert robot.motions == []
+
+
+def test_route_rejected_for_energy_is_not_replanned_from(mocker, motion_controller):
+    navigator = Navigator(Arranger())
+    robot = Robot(Transmitter(), motion_controller, navigator, EnergySupplier(1000.))
+    robot.load_positions(ROUTE)
+    route = navigator.route
+    # rejected on total energy only
+    mocker.patch.object(motion_controller, 'find_unreachable_position', return_value=None)
+    robot.energy_supplier.quantity = 1.
+
+    with pytest.raises(ValueError):
+        robot.load_positions(ROUTE[:-1])
+
+    assert navigator.route is route
+    assert robot.motions is route.motions
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from ex02.geometry import Point
+from ex02.ledger import EnergyLedger
+from ex02.motion import Translation, Rotation
+from ex02.robot import MotionController, EnergySupplier, Wheel
+from ex02.simulation import SimulationClock
+
+
+def ledger_of(quantities, capacity=8):
+    ledger = EnergyLedger(capacity)
+    for i, quantity in enumerate(quantities):
+        ledger.open(at=10. * i)
+        ledger.debit(quantity / 2)
+        ledger.debit(quantity / 2)
+    return ledger
+
+
+def test_consumed_by_motions():
+    ledger = ledger_of([1., 2., 4., 8.])
+
+    assert ledger.consumed(0) == 15.
+    assert ledger.consumed(1, 3) == 6.
+    assert ledger.consumed(3) == 8.
+    assert ledger.consumed(2, 2) == 0.
+
+
+def test_ring_keeps_last_motions():
+    quantities = [float(i) for i in range(20)]
+    ledger = ledger_of(quantities, capacity=8)
+
+    indices, times, consumed = ledger.history()
+    assert list(indices) == list(range(12, 20))
+    assert list(times) == [10. * i for i in range(12, 20)]
+    assert list(consumed) == quantities[12:]
+    assert ledger.total == sum(quantities)
+    assert ledger.consumed(14, 17) == 14. + 15. + 16.
+    with pytest.raises(IndexError):
+        ledger.consumed(11)
+
+
+def test_consumed_between_times():
+    ledger = ledger_of([float(i) for i in range(20)], capacity=8)
+
+    assert ledger.find(125.) == 13
+    assert ledger.find(1000.) == 20
+    assert ledger.consumed_between(125., 165.) == 13. + 14. + 15. + 16.
+    assert ledger.consumed_between(185., 1000.) == 19.
+
+
+def test_extend_as_open_and_debit():
+    quantities = np.arange(1., 21.)
+    times = np.arange(20) * 10.
+    extended = ledger_of([1., 2.])
+    extended.extend(quantities, times + 20.)
+    expected = ledger_of([1., 2.] + quantities.tolist())
+
+    for candidate, reference in zip(extended.history(), expected.history()):
+        assert list(candidate) == list(reference)
+    assert extended.total == expected.total
+    assert extended.consumed(15, 20) == pytest.approx(expected.consumed(15, 20))
+
+
+def test_energy_supplier_records_motions():
+    clock = SimulationClock()
+    for macro_step in (False, True):
+        supplier = EnergySupplier(100., ledger=EnergyLedger())
+        controller = MotionController(Wheel(), Wheel(), {'macro_step': macro_step, 'speed': 1.})
+        controller.use_clock(clock)
+        motions = [Translation(Point(0, 0), Point(3, 0)),
+                   Rotation(Point(3, 0), Point(3, 0), Point(1, 0), Point(0, 1)),
+                   Translation(Point(3, 0), Point(3, 4))]
+
+        for motion in motions:
+            controller.move(motion, supplier)
+
+        indices, times, quantities = supplier.ledger.history()
+        assert list(times) == [record.start for record in controller.trace]
+        assert quantities == pytest.approx([record.get_required_energy() for record in controller.trace])
+        assert supplier.ledger.total == pytest.approx(100. - supplier.quantity)
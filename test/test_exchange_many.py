@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from ex02.robot import Transmitter, AsyncTransmitter
+from ex02.telecom import Telecom, Command
+
+
+class TestExchangeMany:
+
+    @pytest.fixture()
+    def init_transmitter(self, mocker):
+        robot = mocker.Mock()
+        robot.is_moving.return_value = False
+        transmitter = Transmitter()
+        transmitter.register(robot)
+        return robot, transmitter
+
+    def test_exchange_many_in_order(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        tcs = [Telecom(command=Command.READY_FOR_LOADING),
+               Telecom(command=Command.LOADING, payload=['foo']),
+               Telecom(command=Command.MOVE)]
+        # when
+        tms = tr.exchange_many(tcs)
+        # then
+        assert [tm.command for tm in tms] == [Command.READY_FOR_LOADING, Command.LOADED_OK, Command.MOVED]
+        robot.load_positions.assert_called_once_with(['foo'])
+        robot.run.assert_called_once()
+
+    def test_exchange_many_stops_on_loaded_invalid(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        tcs = [Telecom(command=Command.LOADING), Telecom(command=Command.MOVE)]
+        # when
+        tms = tr.exchange_many(tcs)
+        # then
+        assert [tm.command for tm in tms] == [Command.LOADED_INVALID]
+        robot.run.assert_not_called()
+
+    def test_exchange_many_stops_on_moving(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        robot.is_moving.return_value = True
+        tcs = [Telecom(command=Command.READY_FOR_LOADING), Telecom(command=Command.MOVE)]
+        # when
+        tms = tr.exchange_many(tcs)
+        # then
+        assert [tm.command for tm in tms] == [Command.MOVING]
+        robot.run.assert_not_called()
+
+    def test_iter_exchange_is_lazy(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        tcs = iter([Telecom(command=Command.LOADING, payload=['foo']), Telecom(command=Command.MOVE)])
+        # when
+        tms = tr.iter_exchange(tcs)
+        first = next(tms)
+        # then
+        assert first.command == Command.LOADED_OK
+        robot.run.assert_not_called()
+        assert [tm.command for tm in tms] == [Command.MOVED]
+
+    def test_exchange_many_same_as_exchange(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        tcs = [Telecom(command=Command.READY_FOR_LOADING), Telecom(command=Command.LOADING, payload=['foo'])]
+        # when
+        batch = tr.exchange_many(tcs)
+        one_by_one = [tr.exchange(tc) for tc in tcs]
+        # then
+        assert [tm.command for tm in batch] == [tm.command for tm in one_by_one]
+        assert [tm.errors for tm in batch] == [tm.errors for tm in one_by_one]
+
+    def test_exchange_many_uses_overridden_exchange(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+
+        class CountingTransmitter(Transmitter):
+            def __init__(self):
+                super().__init__()
+                self.count = 0
+
+            def exchange(self, tc: Telecom) -> Telecom:
+                self.count += 1
+                return super().exchange(tc)
+        counting = CountingTransmitter()
+        counting.register(robot)
+        tcs = [Telecom(command=Command.READY_FOR_LOADING)] * 3
+        # when
+        tms = counting.exchange_many(tcs) + list(counting.iter_exchange(tcs))
+        # then
+        assert len(tms) == counting.count == 6
+
+    def test_async_exchange_many(self, mocker):
+        # given
+        robot = mocker.Mock()
+        robot.is_moving.return_value = False
+        tr = AsyncTransmitter()
+        tr.register(robot)
+        tcs = [Telecom(command=Command.LOADING), Telecom(command=Command.MOVE)]
+        # when
+        tms = asyncio.run(tr.exchange_many(tcs))
+        # then
+        assert [tm.command for tm in tms] == [Command.LOADED_INVALID]
+        robot.run.assert_not_called()
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from ex02.fleet import Fleet, ShardedFleet
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.simulation import SimulationClock
+from ex02.telecom import Telecom, Command
+
+CONFIGURATION = {'speed': 1., 'time_step': 0.1, 'wheel_axis_length': 2.}
+ROUTE = [(0, 0), (10, 0), (10, 0), (10, 10), (0, 10), (0, 20), (0, 30), (3, 40)]
+
+
+def load_and_move(robot, positions):
+    return [robot.exchange(Telecom(command=Command.LOADING, payload=positions)).command,
+            robot.exchange(Telecom(command=Command.MOVE)).command]
+
+
+def random_routes(count, seed):
+    rng = np.random.default_rng(seed)
+    return [np.cumsum(rng.uniform(-10, 10, size=(rng.integers(2, 20), 2)), axis=0) for _ in range(count)]
+
+
+def test_robot_of_fleet_as_robot():
+    controller = MotionController(Wheel(), Wheel(), dict(CONFIGURATION))
+    controller.use_clock(SimulationClock())
+    supplier = EnergySupplier(1000.)
+    robot = Robot(Transmitter(), controller, Navigator(Arranger()), supplier)
+    robot.load_positions(ROUTE)
+    robot.run()
+
+    fleet = Fleet(1, configuration=CONFIGURATION)
+    assert load_and_move(fleet.robot(0), ROUTE) == [Command.LOADED_OK, Command.MOVED]
+    fleet.run(controller.clock.now - 0.01)
+    assert fleet.is_moving(0)
+    fleet.run(controller.clock.now)
+
+    assert not fleet.is_moving(0)
+    assert tuple(fleet.positions[0]) == ROUTE[-1]
+    assert fleet.energy[0] == pytest.approx(supplier.quantity)
+
+
+def test_telecoms():
+    fleet = Fleet(2, energy=50., configuration=CONFIGURATION)
+    robot = fleet.robot(1)
+
+    assert robot.exchange(Telecom(command=Command.MOVE)).command == Command.INVALID
+    assert load_and_move(robot, [(0, 0), (100, 0)]) == [Command.LOADED_INVALID, Command.INVALID]
+    assert load_and_move(robot, [(0, 0), (10, 0)]) == [Command.LOADED_OK, Command.MOVED]
+    assert robot.exchange(Telecom(command=Command.READY_FOR_LOADING)).command == Command.MOVING
+    assert fleet.robot(0).exchange(Telecom(command=Command.READY_FOR_LOADING)).command \
+        == Command.READY_FOR_LOADING
+
+    fleet.run(5.)
+    assert fleet.positions[1] == pytest.approx([5., 0.])
+    assert fleet.energy[1] == pytest.approx(40.)
+    fleet.run(20.)
+    assert robot.exchange(Telecom(command=Command.READY_FOR_LOADING)).command == Command.READY_FOR_LOADING
+    assert list(fleet.status) == [Fleet.STATUS_MOTIONLESS] * 2
+
+
+def test_robot_approaches_route_start():
+    fleet = Fleet(1, energy=100., configuration=CONFIGURATION)
+    robot = fleet.robot(0)
+
+    assert load_and_move(robot, [(10, 0), (10, 10)]) == [Command.LOADED_OK, Command.MOVED]
+    assert robot.exchange(Telecom(command=Command.MOVE)).command == Command.MOVING
+    fleet.run(5.)
+    assert fleet.positions[0] == pytest.approx([5., 0.])
+    fleet.run(100.)
+    assert fleet.positions[0] == pytest.approx([10., 10.])
+    assert fleet.energy[0] == pytest.approx(100. - 2 * 20. - 2 * np.pi / 2)
+
+    # run again, from the end of the route, back to its start
+    assert robot.exchange(Telecom(command=Command.MOVE)).command == Command.MOVED
+    assert fleet.routes[0].start[0] == pytest.approx([10., 10.])
+    fleet.run(200.)
+    assert fleet.positions[0] == pytest.approx([10., 10.])
+    assert fleet.energy[0] == pytest.approx(100. - 2 * 40. - 2 * np.pi / 2 - 2 * np.pi)
+    assert robot.exchange(Telecom(command=Command.MOVE)).command == Command.INVALID
+
+
+def test_robots_are_stepped_independently():
+    routes = random_routes(30, 0)
+    fleet = Fleet(len(routes), configuration=CONFIGURATION)
+    alone = [Fleet(1, configuration=CONFIGURATION) for _ in routes]
+
+    for i, route in enumerate(routes):
+        if i % 3 == 0:
+            fleet.run(fleet.now + 1.)
+            for f in alone:
+                f.run(fleet.now)
+        load_and_move(fleet.robot(i), route)
+        load_and_move(alone[i].robot(0), route)
+    for _ in range(50):
+        fleet.run(fleet.now + 7.)
+        for f in alone:
+            f.run(fleet.now)
+        assert fleet.positions == pytest.approx(np.concatenate([f.positions for f in alone]))
+        assert fleet.energy == pytest.approx(np.concatenate([f.energy for f in alone]))
+        assert list(fleet.status) == [f.status[0] for f in alone]
+
+
+def test_sharded_fleet_as_fleet():
+    routes = random_routes(10, 1)
+    fleet = Fleet(len(routes), configuration=CONFIGURATION)
+    with ShardedFleet(len(routes), configuration=CONFIGURATION, workers=3) as sharded:
+        assert load_and_move(sharded.robot(0), routes[0]) == load_and_move(fleet.robot(0), routes[0])
+        loadings = [(i, Telecom(command=Command.LOADING, payload=route)) for i, route in enumerate(routes)][1:]
+        moves = [(i, Telecom(command=Command.MOVE)) for i in range(1, len(routes))]
+        answers = sharded.exchange_batch(loadings) + sharded.exchange_batch(moves)
+        assert [a.command for a in answers] \
+            == [fleet.exchange(i, tc).command for i, tc in loadings + moves]
+        for until in (5., 50., 500.):
+            sharded.run(until)
+            fleet.run(until)
+            positions, energy, status = sharded.state()
+            assert positions == pytest.approx(fleet.positions)
+            assert energy == pytest.approx(fleet.energy)
+            assert list(status) == list(fleet.status)
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from ex02.drivers import FakeWheelDriver, WheelBuffer
+from ex02.instrumentation import Instrumentation
+from ex02.robot import Robot, Transmitter, AsyncTransmitter, MotionController, Navigator, Arranger, \
+    EnergySupplier, Wheel
+from ex02.telecom import Telecom, Command
+
+ROUTE = [(0, 0), (1, 0), (1, 1)]
+
+
+class MacroWheel(Wheel):
+    MACRO_STEP = True
+
+
+def new_robot(macro_step=False, transmitter=None):
+    controller = MotionController(MacroWheel(), Wheel(), {'macro_step': macro_step, 'speed': 1.})
+    return Robot(transmitter or Transmitter(), controller, Navigator(Arranger()), EnergySupplier())
+
+
+def load_and_move(robot):
+    robot.exchange_many([Telecom(command=Command.READY_FOR_LOADING),
+                         Telecom(command=Command.LOADING, payload=ROUTE),
+                         Telecom(command=Command.MOVE)])
+
+
+def series(snapshot, name, **labels):
+    return next(s for s in snapshot[name] if s['labels'] == labels)
+
+
+@pytest.mark.parametrize("macro_step", [False, True])
+def test_records_commands_motions_and_wheels(macro_step):
+    robot = new_robot(macro_step)
+
+    with Instrumentation().attach(robot) as instrumentation:
+        load_and_move(robot)
+        robot.exchange(Telecom(command=Command.MOVE))
+    snapshot = instrumentation.snapshot()
+
+    assert series(snapshot, 'command_latency_seconds', command='MOVE')['count'] == 2
+    assert series(snapshot, 'command_latency_seconds', command='LOADING')['count'] == 1
+    assert snapshot['load_positions_seconds'][0]['count'] == 1
+    assert snapshot['compute_motions_seconds'][0]['count'] == 1
+    assert series(snapshot, 'motion_seconds', kind='translation')['count'] == 4
+    assert series(snapshot, 'motion_seconds', kind='rotation_on_spot')['count'] == 2
+    steps = sum(s['sum'] for s in snapshot['motion_steps'])
+    assert series(snapshot, 'wheel_steps_total', wheel='left')['value'] == steps
+    runs = series(snapshot, 'wheel_runs_total', wheel='right')['value']
+    assert runs == (6 if macro_step else steps)
+    assert series(snapshot, 'wheel_runs_per_second', wheel='right')['value'] > 0
+
+
+def test_detach_restores_components():
+    robot = new_robot()
+    handlers = dict(robot.transmitter._handlers)
+    instrumentation = Instrumentation().attach(robot)
+    instrumentation.detach()
+
+    load_and_move(robot)
+
+    assert robot.transmitter._handlers == handlers
+    assert 'move' not in vars(robot.motion_controller)
+    assert 'run' not in vars(robot.motion_controller.right_wheel)
+    assert robot.motion_controller.plan_listeners == []
+    assert all(s['count'] == 0 for s in instrumentation.snapshot()['command_latency_seconds'])
+
+
+def test_robot_is_instrumented_once_at_a_time():
+    robot = new_robot()
+    instrumentation = Instrumentation().attach(robot)
+
+    with pytest.raises(ValueError):
+        instrumentation.attach(robot)
+    with pytest.raises(ValueError):
+        Instrumentation().attach(robot)
+    load_and_move(robot)
+    assert series(instrumentation.snapshot(), 'command_latency_seconds', command='MOVE')['count'] == 1
+
+    instrumentation.detach()
+    with Instrumentation().attach(robot) as again:
+        load_and_move(robot)
+    assert series(again.snapshot(), 'command_latency_seconds', command='MOVE')['count'] == 1
+
+
+@pytest.mark.parametrize("configuration", [{}, {'max_acceleration': 0.5}])
+def test_buffered_wheels_are_counted(configuration):
+    buffer = WheelBuffer(FakeWheelDriver())
+    controller = MotionController(buffer.right, buffer.left, dict(configuration, speed=1.))
+    robot = Robot(Transmitter(), controller, Navigator(Arranger()), EnergySupplier())
+
+    with Instrumentation().attach(robot) as instrumentation:
+        load_and_move(robot)
+    snapshot = instrumentation.snapshot()
+
+    steps = sum(s['sum'] for s in snapshot['motion_steps'])
+    assert steps == buffer.driver.rows
+    for wheel in ('right', 'left'):
+        assert series(snapshot, 'wheel_runs_total', wheel=wheel)['value'] == 3
+        assert series(snapshot, 'wheel_steps_total', wheel=wheel)['value'] == steps
+
+
+def test_async_commands_are_timed():
+    robot = new_robot(transmitter=AsyncTransmitter())
+    instrumentation = Instrumentation().attach(robot)
+
+    async def exchange():
+        await robot.exchange(Telecom(command=Command.LOADING, payload=ROUTE))
+        await robot.exchange(Telecom(command=Command.MOVE))
+    asyncio.run(exchange())
+
+    snapshot = instrumentation.snapshot()
+    assert series(snapshot, 'command_latency_seconds', command='MOVE')['count'] == 1
+    assert series(snapshot, 'motion_seconds', kind='translation')['count'] == 2
+
+
+def test_prometheus_text(tmp_path):
+    now = [0.]
+    instrumentation = Instrumentation(timer=lambda: now[0])
+    instrumentation.attach(new_robot(macro_step=True))
+    instrumentation.histogram('command_latency_seconds', command='MOVE').observe(0.002)
+    instrumentation.counter('wheel_runs_total', wheel='right').inc(10)
+    now[0] = 2.
+
+    path = tmp_path / 'robot.prom'
+    instrumentation.write_prometheus(path)
+    lines = path.read_text().splitlines()
+
+    assert '# TYPE ex02_command_latency_seconds histogram' in lines
+    assert 'ex02_command_latency_seconds_bucket{command="MOVE",le="0.001"} 0' in lines
+    assert 'ex02_command_latency_seconds_bucket{command="MOVE",le="0.01"} 1' in lines
+    assert 'ex02_command_latency_seconds_bucket{command="MOVE",le="+Inf"} 1' in lines
+    assert 'ex02_command_latency_seconds_count{command="MOVE"} 1' in lines
+    assert '# TYPE ex02_wheel_runs_total counter' in lines
+    assert 'ex02_wheel_runs_total{wheel="right"} 10' in lines
+    assert 'ex02_wheel_runs_per_second{wheel="right"} 5.0' in lines
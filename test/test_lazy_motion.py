@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from ex02.geometry import Arc, Point
+from ex02.motion import Translation
+
+
+def test_translation_computes_vector_on_access_only():
+    translation = Translation(Point(0, 0), Point(3, 4))
+
+    assert translation.get_length() == 5
+    assert 'vector' not in vars(translation)
+    assert translation.vector == Point(0.6, 0.8)
+    assert translation.vector is translation.vector
+
+
+def test_translation_of_null_length_fails_on_vector_access():
+    translation = Translation(Point(1, 1), Point(1, 1))
+
+    assert translation.get_length() == 0
+    with pytest.raises(ZeroDivisionError):
+        translation.vector
+
+
+def test_arc_computes_angle_on_access_and_keeps_it():
+    arc = Arc(Point(1, 0), Point(0, 1), Point(0, 1))
+
+    assert 'angle' not in vars(arc)
+    assert math.isclose(arc.length, math.fabs(arc.angle * arc.radius))
+    assert vars(arc)['angle'] is arc.angle
+    assert arc.direction == Arc.DIRECT
+
+
+@pytest.mark.parametrize("start_tangent, length", [(Point(0, 1), math.pi), (Point(0, -1), 3 * math.pi)])
+def test_arc_length_is_the_distance_along_it(start_tangent, length):
+    # quarter of a circle of radius 2 counter-clockwise, the rest of it clockwise
+    arc = Arc(Point(2, 0), Point(0, 2), start_tangent)
+
+    assert math.isclose(arc.length, length)
+
+
+def test_arc_on_the_spot_has_null_length_without_angle():
+    arc = Arc(Point(1, 0), Point(1, 0), Point(0, 1), Point(-1, 0))
+
+    assert arc.length == 0
+    assert 'angle' not in vars(arc)
+    assert math.isclose(arc.angle, math.pi / 2)
+
+
+def test_arc_checks_stay_on_construction():
+    with pytest.raises(ValueError):
+        Arc(Point(1, 0), Point(0, 1), Point(0, 1), Point(1, 0))
@@ -206,3 +206,61 @@ class TestMotionController:
         """Extracts values from mock's call_args_list"""
         args = getattr(mock, param).call_args_list
         return get_values_from_call_list(args)
+
+
+class TestMotionControllerMacroStep:
+
+    @pytest.fixture()
+    def init_controller(self, mocker):
+        right_wheel = mocker.Mock(spec=Wheel)
+        left_wheel = mocker.Mock(spec=Wheel)
+        energy_supplier = mocker.Mock(spec=EnergySupplier)
+        ctrl = MotionController(right_wheel=right_wheel,
+                                left_wheel=left_wheel,
+                                configuration={'macro_step': True})
+        return ctrl, right_wheel, left_wheel, energy_supplier
+
+    def test_translation_with_macro_step_components(self, init_controller):
+        # --given--
+        ctrl, right_wheel, left_wheel, energy_supplier = init_controller
+        right_wheel.MACRO_STEP = True
+        left_wheel.MACRO_STEP = True
+        energy_supplier.MACRO_STEP = True
+        tr = Translation(Point(0, 0), Point(10, 0))
+
+        # --when--
+        ctrl.run_translation(tr, energy_supplier)
+
+        # --then--
+        right_wheel.run.assert_not_called()
+        left_wheel.run.assert_not_called()
+        energy_supplier.consume.assert_not_called()
+        right_wheel.run_steps.assert_called_once_with(pytest.approx(10), 1000)
+        left_wheel.run_steps.assert_called_once_with(pytest.approx(10), 1000)
+        energy_supplier.consume_steps.assert_called_once_with(pytest.approx(20), 1000)
+
+    def test_per_step_loop_kept_for_other_components(self, init_controller):
+        # --given--
+        ctrl, right_wheel, left_wheel, energy_supplier = init_controller
+        right_wheel.MACRO_STEP = True
+        tr = Translation(Point(0, 0), Point(10, 0))
+
+        # --when--
+        ctrl.run_translation(tr, energy_supplier)
+
+        # --then--
+        right_wheel.run_steps.assert_called_once()
+        assert left_wheel.run.call_count == 1000
+        assert energy_supplier.consume.call_count == 1000
+
+    def test_energy_supplier_consumes_same_quantity(self):
+        # --given--
+        tr = Translation(Point(0, 0), Point(10, 0))
+        per_step, macro_step = EnergySupplier(), EnergySupplier()
+
+        # --when--
+        MotionController(Wheel(), Wheel(), {}).run_translation(tr, per_step)
+        MotionController(Wheel(), Wheel(), {'macro_step': True}).run_translation(tr, macro_step)
+
+        # --then--
+        assert macro_step.quantity == pytest.approx(per_step.quantity)
@@ -0,0 +1,214 @@
+import math
+import random
+
+import numpy as np
+
+import pytest
+
+from ex02.geometry import Point, PointArray
+from ex02.motion import Translation, Rotation
+from ex02.replanning import diff_positions
+from ex02.robot import Navigator, Arranger
+
+L_SHAPE = [(0, 0), (10, 0), (10, 10)]
+
+
+@pytest.fixture()
+def navigator():
+    return Navigator(Arranger())
+
+
+def test_motions_of_l_shape(navigator):
+    motions = navigator.compute_motions(L_SHAPE)
+
+    assert [type(m) for m in motions] == [Translation, Rotation, Translation]
+    assert motions[0].end == Point(10, 0)
+    assert motions[1].is_on_the_spot()
+    assert math.isclose(motions[1].arc.angle, math.pi / 2)
+    assert motions[2].start == Point(10, 0)
+
+
+def test_repeated_and_aligned_positions_are_skipped(navigator):
+    motions = navigator.compute_motions([(0, 0), (0, 0), (5, 0), (10, 0), (10, 0)])
+
+    assert [type(m) for m in motions] == [Translation, Translation]
+
+
+def test_u_turn(navigator):
+    motions = navigator.compute_motions([(0, 0), (10, 0), (0, 0)])
+
+    assert math.isclose(motions[1].arc.angle, math.pi)
+
+
+def test_total_distance(navigator):
+    motions = navigator.compute_motions(L_SHAPE)
+
+    assert navigator.compute_total_distance(motions) == 20
+    assert navigator.compute_positions_distance(L_SHAPE) == 20
+    assert navigator.compute_positions_distance([Point(*xy) for xy in L_SHAPE]) == 20
+
+
+def test_plan_is_lazy(navigator):
+    consumed = []
+
+    def positions():
+        for xy in [(0, 0), (1, 0), (2, 1), (3, 0), (4, 1)]:
+            consumed.append(xy)
+            yield xy
+
+    plan = navigator.plan(positions(), lookahead=1)
+    first = next(plan)
+
+    assert isinstance(first, Translation)
+    assert len(consumed) == 3
+    assert len([first, *plan]) == 7
+
+
+def motion_attributes(motion):
+    if isinstance(motion, Translation):
+        return ('translation', motion.start.x, motion.start.y, motion.end.x, motion.end.y,
+                motion.length, motion.vector.x, motion.vector.y)
+    arc = motion.arc
+    return ('rotation', arc.start.x, arc.start.y, arc.end.x, arc.end.y,
+            arc.start_tangent.x, arc.start_tangent.y, arc.end_tangent.x, arc.end_tangent.y,
+            arc.center.x, arc.center.y, arc.radius, arc.angle, arc.direction, arc.length)
+
+
+def random_positions(n, seed):
+    rng = random.Random(seed)
+    positions = [(0., 0.)]
+    for _ in range(n):
+        x, y = positions[-1]
+        move = rng.choice(['random', 'repeat', 'straight', 'back', 'drift', 'axis'])
+        if move == 'random':
+            positions.append((rng.uniform(-100, 100), rng.uniform(-100, 100)))
+        elif move == 'repeat':
+            positions.append((x, y))
+        elif move == 'straight' and len(positions) > 1:
+            px, py = positions[-2]
+            positions.append((2 * x - px, 2 * y - py))
+        elif move == 'back' and len(positions) > 1:
+            positions.append(positions[-2])
+        elif move == 'drift':
+            positions.append((x + 6e-10, y))
+        else:
+            positions.append((x + rng.choice([-1, 1]) * rng.randint(1, 5), y))
+    return positions
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_vectorized_motions_as_per_object_ones(navigator, seed):
+    positions = random_positions(2000, seed)
+
+    motions = navigator.compute_motions(positions)
+    expected = list(navigator.iter_motions(positions))
+
+    assert [motion_attributes(m) for m in motions] == [motion_attributes(m) for m in expected]
+    assert navigator.compute_total_distance(motions) == navigator.compute_total_distance(expected)
+
+
+def test_vectorized_motions_from_array_and_points(navigator):
+    positions = random_positions(200, 0)
+    expected = [motion_attributes(m) for m in navigator.iter_motions(positions)]
+
+    from_array = navigator.compute_motions(np.array(positions))
+    from_points = navigator.compute_motions(Point(x, y) for x, y in positions)
+
+    assert [motion_attributes(m) for m in from_array] == expected
+    assert [motion_attributes(m) for m in from_points] == expected
+
+
+def test_reordering_arranger_subclass_is_used():
+    class ReversingArranger(Arranger):
+        def arrange(self, motions):
+            return list(reversed(motions))
+    navigator = Navigator(ReversingArranger())
+
+    motions = navigator.compute_motions([(0, 0), (10, 0), (10, 10)])
+
+    assert not navigator.keeps_order()
+    assert Navigator(Arranger()).keeps_order()
+    assert [(m.start, m.end) for m in motions if isinstance(m, Translation)] == [((10, 0), (10, 10)),
+                                                                                ((0, 0), (10, 0))]
+    assert navigator.route is None
+
+
+def test_drifting_positions_are_compared_to_last_kept_one(navigator):
+    positions = [(0, 10), (0, 0), (6e-10, 0), (12e-10, 0), (18e-10, 0), (5, 5)]
+
+    translations = navigator.to_translations(positions)
+
+    assert [(t.start.x, t.end.x) for t in translations] == [(0, 0), (0, 12e-10), (12e-10, 5)]
+    assert [(t.start.x, t.end.x) for t in translations] \
+        == [(t.start.x, t.end.x) for t in navigator.iter_translations(navigator.iter_points(positions))]
+
+
+def edit_positions(positions, rng):
+    positions = list(positions)
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(positions))
+        edit = rng.choice(['move', 'insert', 'delete', 'repeat', 'replace_run'])
+        if edit == 'move':
+            positions[i] = (rng.uniform(-100, 100), rng.uniform(-100, 100))
+        elif edit == 'insert':
+            positions.insert(i, (rng.uniform(-100, 100), rng.uniform(-100, 100)))
+        elif edit == 'delete' and len(positions) > 3:
+            del positions[i]
+        elif edit == 'repeat':
+            positions.insert(i, positions[i])
+        else:
+            positions[i:i + rng.randint(1, 20)] = random_positions(rng.randint(0, 20), rng.random())[1:]
+    return positions
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_replanned_motions_as_computed_ones(navigator, seed):
+    rng = random.Random(seed)
+    positions = random_positions(500, seed)
+    navigator.compute_motions(positions)
+
+    for _ in range(30):
+        positions = edit_positions(positions, rng)
+        motions = navigator.compute_motions(positions)
+        fresh = Navigator(Arranger())
+        expected = fresh.compute_motions(positions)
+
+        assert [motion_attributes(m) for m in motions] == [motion_attributes(m) for m in expected]
+        # exactly, the total length does not drift with replans
+        assert navigator.compute_total_distance(motions) == fresh.compute_total_distance(expected)
+        assert np.array_equal(navigator.route.kept, Navigator(Arranger()).new_route(PointArray.new(positions)).kept)
+
+
+def test_replan_reuses_unchanged_motions(navigator):
+    positions = [(float(i % 2), float(i)) for i in range(1000)]
+    before = navigator.compute_motions(positions)
+    positions[500] = (5., 500.)
+
+    after = navigator.compute_motions(positions)
+
+    reused = sum(1 for m in after if any(m is b for b in before))
+    assert len(after) == len(before)
+    assert reused >= len(before) - 8
+
+
+def test_uncommitted_route_is_pending(navigator):
+    positions = [(0, 0), (10, 0), (10, 10)]
+    committed = navigator.compute_motions(positions)
+
+    motions = navigator.compute_motions(positions + [(0, 10)], commit=False)
+
+    assert navigator.route.motions is committed
+    assert navigator.pending_route.motions is motions
+    assert navigator.compute_total_distance(motions) == 30
+    navigator.commit_route()
+    assert navigator.route.motions is motions
+    assert navigator.pending_route is None
+
+
+def test_diff_positions():
+    old = np.array([(0, 0), (1, 1), (2, 2), (3, 3)], dtype=float)
+
+    assert diff_positions(old, old) == (4, 0)
+    assert diff_positions(old, old[[0, 1, 3]]) == (2, 1)
+    assert diff_positions(old, old[[0, 0, 1, 2, 3]]) == (1, 3)
+    assert diff_positions(old, old[:2] + 1) == (0, 0)
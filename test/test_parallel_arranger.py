@@ -0,0 +1,63 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.routing import ParallelArranger, RouteArranger, route_cost
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def random_xy(n, seed=0):
+    return np.random.default_rng(seed).uniform(0, 100, (n, 2))
+
+
+@pytest.mark.parametrize('strategy', [ParallelArranger.RESTARTS, ParallelArranger.PARTS])
+def test_routes_are_permutations_from_first_waypoint(executor, strategy):
+    xy = random_xy(1000)
+    order = ParallelArranger(time_budget=0.3, workers=2, strategy=strategy, executor=executor).optimize(xy)
+    assert order[0] == 0
+    assert sorted(order) == list(range(1000))
+    assert route_cost(xy, order) < route_cost(xy, range(1000)) / 5
+
+
+def test_restarts_keep_best_route(executor):
+    xy = random_xy(7)
+    order = ParallelArranger(time_budget=0.1, workers=2, executor=executor).optimize(xy)
+    best = min(route_cost(xy, (0,) + other) for other in itertools.permutations(range(1, 7)))
+    assert route_cost(xy, order) == pytest.approx(best)
+
+
+def test_parts_keep_route_end_free(executor):
+    xy = np.array([(float(x), 0.) for x in (0, 5, 1, 4, 2, 3, 6, 9, 7, 8)])
+    order = ParallelArranger(time_budget=0.3, workers=2, strategy=ParallelArranger.PARTS,
+                             executor=executor).optimize(xy)
+    assert order == list(np.argsort(xy[:, 0]))
+
+
+def test_unknown_strategy(executor):
+    with pytest.raises(ValueError):
+        ParallelArranger(workers=2, strategy='foo', executor=executor)
+
+
+def test_arrange_many(executor):
+    routes = [[Point(0, 0), Point(2, 0), Point(1, 0)],
+              [Translation(Point(5, 5), Point(1, 1)), Translation(Point(1, 1), Point(4, 4))],
+              []]
+    arranged = ParallelArranger(time_budget=0.1, workers=2, executor=executor).arrange_many(routes)
+    assert arranged[0] == [Point(0, 0), Point(1, 0), Point(2, 0)]
+    assert [(t.start, t.end) for t in arranged[1]] == [(Point(5, 5), Point(4, 4)), (Point(4, 4), Point(1, 1))]
+    assert arranged[2] == []
+
+
+def test_one_part_is_at_least_as_good_as_route_arranger():
+    xy = random_xy(200)
+    parallel = ParallelArranger(workers=1, strategy=ParallelArranger.PARTS).optimize(xy)
+    assert route_cost(xy, parallel) <= route_cost(xy, RouteArranger().optimize(xy))
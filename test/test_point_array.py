@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+import pytest
+
+from ex02.geometry import Point, PointArray, PointView
+
+
+@pytest.fixture()
+def points():
+    return [Point(0.5, 0.5), Point(-1, 1), Point(3, -4), Point(0, 2)]
+
+
+def test_new_is_contiguous_float64():
+    candidate = PointArray.new([(1, 2), (3, 4)])
+    assert candidate.xy.dtype == np.float64
+    assert candidate.xy.flags['C_CONTIGUOUS']
+    assert candidate.xy.shape == (2, 2)
+
+
+def test_item_is_a_view(points):
+    candidate = PointArray.from_points(points)
+    view = candidate[2]
+    assert isinstance(view, PointView)
+    assert view == Point(3, -4)
+    candidate.xy[2, 0] = 7
+    assert view.x == 7
+
+
+def test_view_is_read_only(points):
+    view = PointArray.from_points(points)[0]
+    with pytest.raises(AttributeError):
+        view.x = 1.
+
+
+@pytest.mark.parametrize("operation", ['normal', 'reverse', 'normalize'])
+def test_unary_operations_as_point(points, operation):
+    candidate = getattr(PointArray.from_points(points), operation)()
+    expected = [getattr(p, operation)() for p in points]
+    assert candidate.to_points() == expected
+
+
+def test_add_sub_mul_as_point(points):
+    a = PointArray.from_points(points)
+    b = a.normal()
+    assert (a + b).to_points() == [p + p.normal() for p in points]
+    assert (a - b).to_points() == [p - p.normal() for p in points]
+    assert (a * 2.5).to_points() == [p * 2.5 for p in points]
+
+
+def test_products_and_distance_as_point(points):
+    a = PointArray.from_points(points)
+    b = PointArray.from_points(points[::-1])
+    reversed_points = points[::-1]
+    for i, (p, q) in enumerate(zip(points, reversed_points)):
+        assert math.isclose(a.scalar_product(b)[i], p.scalar_product(q))
+        assert math.isclose(a.vectorial_product(b)[i], p.vectorial_product(q))
+        assert PointArray.distance(a, b)[i] == Point.distance(p, q)
+
+
+def test_orthogonal_and_collinear():
+    a = PointArray.new([(0.5, 0.5), (1, 0.7), (0.5, 0.5)])
+    b = PointArray.new([(-1, 1), (0.5, 1), (1, 1)])
+    assert a.is_orthogonal(b).tolist() == [True, False, False]
+    assert a.is_collinear(b).tolist() == [False, False, True]
+
+
+def test_equals_with_tolerance():
+    a = PointArray.new([(1, 1), (1, 4)])
+    approx = 1 + 1e-14
+    assert a.equals(PointArray.new([(approx, approx), (1, 4.1)])).tolist() == [True, False]
+    assert a == PointArray.new([(approx, approx), (1, 4)])
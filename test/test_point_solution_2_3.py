@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from ex02.geometry import Point
 from math import sin, pi, cos, exp, log
 
@@ -42,3 +46,35 @@ def test_are_collinear():
     a = Point(0.5, 0.5)
     b = Point(1, 1)
     assert a.is_collinear(b)
+
+
+def test_point_is_immutable():
+    a = Point(1, 2)
+    with pytest.raises(AttributeError):
+        a.x = 3
+
+
+def test_point_is_not_hashable():
+    with pytest.raises(TypeError):
+        hash(Point(1, 2))
+
+
+def test_point_key():
+    assert len({Point(1, 2).key(), Point(1, 2 + 1e-12).key(), Point(2, 1).key()}) == 2
+    assert Point(0.123456, 2).key(3) == (0.123, 2.)
+
+
+def test_from_floats():
+    a = Point.from_floats(1., 2.)
+    assert a == Point(1, 2)
+    assert Point.new(a) is a
+
+
+def test_not_equal():
+    assert Point(1, 2) != Point(1, 3)
+    assert not Point(1, 2) != (1, 2)
+
+
+def test_pickle():
+    a = Point(1, 2)
+    assert pickle.loads(pickle.dumps(a)) == a
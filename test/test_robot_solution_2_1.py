@@ -15,6 +15,7 @@ class TestRobotSolution_2_1:
     def init_robot(self, mocker):
         transmitter = mocker.Mock(spec=Transmitter)
         motion_controller = mocker.Mock(spec=MotionController)
+        motion_controller.find_unreachable_position.return_value = None
         navigator = mocker.Mock(spec=Navigator)
         energy_supplier = mocker.Mock(spec=EnergySupplier)
 
@@ -50,6 +51,15 @@ class TestRobotSolution_2_1:
         # -- then --
         transmitter.exchange.assert_called_once()
 
+    def test_exchange_many_through_transmitter(self, init_robot):
+        # -- given --
+        robot, transmitter, *_ = init_robot
+        tcs = [Telecom(command=Command.READY_FOR_LOADING), Telecom(command=Command.MOVE)]
+        # -- when --
+        robot.exchange_many(tcs)
+        # -- then --
+        transmitter.exchange_many.assert_called_once_with(tcs)
+
     def test_load_positions_when_energy_supplier_has_enough_energy(self, init_robot):
         # -- given --
         robot, _, _, navigator, energy_supplier = init_robot
@@ -108,3 +118,28 @@ class TestRobotSolution_2_1:
         # -- then --
         # - get the arguments
         assert motion_controller.move.call_count == 3
+
+    def test_run_positions(self, mocker, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        translation = mocker.Mock(spec=Translation)
+        navigator.plan.return_value = iter([translation, translation])
+        # -- when--
+        robot.run_positions([(0, 0), (1, 0), (2, 0)])
+        # -- then --
+        motion_controller.find_unreachable_position.assert_called_once_with([(0, 0), (1, 0), (2, 0)],
+                                                                            energy_supplier)
+        motion_controller.move.assert_called_with(translation, energy_supplier)
+        assert motion_controller.move.call_count == 2
+        assert not robot.is_moving()
+
+    def test_run_positions_without_enough_energy(self, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        motion_controller.find_unreachable_position.return_value = 1
+        # -- when--
+        with pytest.raises(ValueError):
+            robot.run_positions([(0, 0), (1, 0)])
+        # -- then --
+        navigator.plan.assert_not_called()
+        motion_controller.move.assert_not_called()
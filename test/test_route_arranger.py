@@ -0,0 +1,90 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.robot import Navigator
+from ex02.routing import RouteArranger, route_cost
+from ex02.spatial import PointIndex
+
+
+def random_xy(n, seed=0):
+    return np.random.default_rng(seed).uniform(0, 100, (n, 2))
+
+
+def brute_force_cost(xy, turn_weight):
+    return min(route_cost(xy, (0,) + order, turn_weight) for order in itertools.permutations(range(1, len(xy))))
+
+
+@pytest.mark.parametrize('turn_weight', [0., 20.])
+def test_small_routes_are_optimal(turn_weight):
+    for seed in range(5):
+        xy = random_xy(7, seed)
+        order = RouteArranger(turn_weight=turn_weight).optimize(xy)
+        assert order[0] == 0
+        assert sorted(order) == list(range(7))
+        assert route_cost(xy, order, turn_weight) == pytest.approx(brute_force_cost(xy, turn_weight))
+
+
+@pytest.mark.parametrize('n', [500, 3000])
+def test_large_routes_are_permutations_shorter_than_payload_order(n):
+    xy = random_xy(n)
+    order = RouteArranger(time_budget=0.5).optimize(xy)
+    assert order[0] == 0
+    assert sorted(order) == list(range(n))
+    assert route_cost(xy, order) < route_cost(xy, range(n)) / 5
+
+
+def test_arrange_points_on_a_line():
+    points = [Point(0, 0), Point(3, 0), Point(1, 0), Point(2, 0)]
+    assert RouteArranger().arrange(points) == [Point(0, 0), Point(1, 0), Point(2, 0), Point(3, 0)]
+
+
+def test_arrange_xy_pairs():
+    assert RouteArranger().arrange([(0, 0), (2, 0), (1, 0)]) == [(0, 0), (1, 0), (2, 0)]
+
+
+def test_arrange_translations():
+    translations = [Translation(Point(0, 0), Point(3, 0)),
+                    Translation(Point(3, 0), Point(1, 0)),
+                    Translation(Point(1, 0), Point(2, 0))]
+    arranged = RouteArranger().arrange(translations)
+    assert [(t.start, t.end) for t in arranged] == [(Point(0, 0), Point(1, 0)),
+                                                    (Point(1, 0), Point(2, 0)),
+                                                    (Point(2, 0), Point(3, 0))]
+
+
+def test_turn_weight_prefers_straight_routes():
+    # a zigzag is shorter than the detour, but turns a lot
+    xy = np.array([(0, 0), (10, 1), (20, 0), (10, -1), (30, 1), (30, -1)], dtype=np.float64)
+    straight = RouteArranger(turn_weight=100.).optimize(xy)
+    short = RouteArranger().optimize(xy)
+    assert route_cost(xy, straight, 100.) <= route_cost(xy, short, 100.)
+    assert route_cost(xy, short) <= route_cost(xy, straight)
+
+
+def test_navigator_runs_arranged_route():
+    navigator = Navigator(RouteArranger())
+    motions = navigator.compute_motions([(0, 0), (3, 0), (1, 0), (2, 0)])
+    assert [type(m) for m in motions] == [Translation] * 3
+    assert [m.end for m in motions] == [Point(1, 0), Point(2, 0), Point(3, 0)]
+
+
+def test_point_index_nearest_neighbours_as_brute_force():
+    xy = random_xy(300)
+    index = PointIndex(xy)
+    d = np.hypot(xy[:, np.newaxis, 0] - xy[np.newaxis, :, 0], xy[:, np.newaxis, 1] - xy[np.newaxis, :, 1])
+    np.fill_diagonal(d, np.inf)
+    assert np.array_equal(index.nearest_neighbours(5), np.argsort(d, axis=1, kind='stable')[:, :5])
+
+
+def test_point_index_nearest_with_mask():
+    xy = random_xy(300)
+    index = PointIndex(xy)
+    mask = np.array([random.Random(i).random() < 0.1 for i in range(300)])
+    distances = np.hypot(xy[:, 0] - 50, xy[:, 1] - 50)
+    distances[~mask] = np.inf
+    assert index.nearest(Point(50, 50), 3, mask=mask) == np.argsort(distances)[:3].tolist()
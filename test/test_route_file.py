@@ -0,0 +1,118 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from ex02.fleet import Fleet
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.routefile import RouteFile
+from ex02.telecom import Telecom, Command
+
+ROUTE = [(0, 0), (10, 0), (10, 0), (10, 10), (0, 10), (0, 20)]
+
+
+@pytest.fixture()
+def robot():
+    return Robot(Transmitter(), MotionController(Wheel(), Wheel(), {}), Navigator(Arranger()), EnergySupplier(1000.))
+
+
+def test_positions_are_a_read_only_view_of_the_file(tmp_path):
+    route_file = RouteFile.write(tmp_path / 'route.bin', ROUTE)
+
+    xy = route_file.open()
+
+    assert xy.tolist() == [list(p) for p in ROUTE]
+    assert not xy.flags.writeable
+    assert route_file.open() is xy
+    assert len(route_file) == len(ROUTE)
+    assert (tmp_path / 'route.bin').stat().st_size == RouteFile.HEADER.size + len(ROUTE) * 16
+
+
+@pytest.mark.parametrize("data", [b'', b'EX2R', b'EX3R\x01\x00\x00\x00' + bytes(8),
+                                  RouteFile.HEADER.pack(RouteFile.MAGIC, RouteFile.VERSION, 0, 2) + bytes(16)])
+def test_invalid_files_are_rejected(tmp_path, mocker, data):
+    path = tmp_path / 'route.bin'
+    path.write_bytes(data)
+    mappings = []
+    new_mapping = mmap.mmap
+
+    def recording_mapping(*args, **kwargs):
+        mappings.append(new_mapping(*args, **kwargs))
+        return mappings[-1]
+    mocker.patch('ex02.routefile.mmap.mmap', side_effect=recording_mapping)
+
+    with pytest.raises(ValueError):
+        RouteFile(path).open()
+    assert all(mapping.closed for mapping in mappings)
+
+
+def test_loading_route_file_as_list(tmp_path, robot):
+    expected = Robot(Transmitter(), MotionController(Wheel(), Wheel(), {}), Navigator(Arranger()),
+                     EnergySupplier(1000.))
+    expected.load_positions(ROUTE)
+
+    answer = robot.exchange(Telecom(command=Command.LOADING, payload=RouteFile.write(tmp_path / 'route.bin', ROUTE)))
+
+    assert answer.command == Command.LOADED_OK
+    assert [repr(m) for m in robot.motions] == [repr(m) for m in expected.motions]
+
+
+def test_route_copies_file_positions(tmp_path, robot):
+    route_file = RouteFile.write(tmp_path / 'route.bin', ROUTE)
+
+    robot.exchange(Telecom(command=Command.LOADING, payload=route_file))
+
+    assert not np.shares_memory(robot.navigator.route.xy, route_file.open())
+
+
+def test_file_modified_in_place_keeps_loaded_route(tmp_path, robot):
+    path = tmp_path / 'route.bin'
+    route_file = RouteFile.write(path, ROUTE)
+    robot.exchange(Telecom(command=Command.LOADING, payload=route_file))
+    motions = [repr(m) for m in robot.motions]
+
+    xy = np.memmap(path, dtype=RouteFile.DTYPE, mode='r+', offset=RouteFile.HEADER.size, shape=(len(ROUTE), 2))
+    xy[-1] = (0, 1000)
+    xy.flush()
+    del xy
+
+    assert route_file.open()[-1].tolist() == [0, 1000]
+    assert robot.navigator.route.xy.tolist() == [list(p) for p in ROUTE]
+    assert [repr(m) for m in robot.motions] == motions
+    # the modification is replanned, and checked for energy, when loaded again
+    answer = robot.exchange(Telecom(command=Command.LOADING, payload=route_file))
+    assert answer.command == Command.LOADED_INVALID
+    assert robot.navigator.route.xy.tolist() == [list(p) for p in ROUTE]
+
+
+def test_rewritten_file_keeps_previous_route_positions(tmp_path, robot):
+    path = tmp_path / 'route.bin'
+    robot.exchange(Telecom(command=Command.LOADING, payload=RouteFile.write(path, ROUTE)))
+
+    moved = ROUTE[:-1] + [(0, 30)]
+    answer = robot.exchange(Telecom(command=Command.LOADING, payload=RouteFile.write(path, moved)))
+
+    assert answer.command == Command.LOADED_OK
+    assert robot.navigator.route.xy.tolist() == [list(p) for p in moved]
+    assert robot.navigator.compute_total_distance(robot.motions) == pytest.approx(50.)
+
+
+@pytest.mark.parametrize("payload", ['missing.bin', 'empty.bin'])
+def test_loading_invalid_route_file(tmp_path, robot, payload):
+    RouteFile.write(tmp_path / 'empty.bin', np.zeros((0, 2)))
+
+    answer = robot.exchange(Telecom(command=Command.LOADING, payload=RouteFile(tmp_path / payload)))
+
+    assert answer.command == Command.LOADED_INVALID
+
+
+def test_fleet_loading_route_file(tmp_path):
+    fleet = Fleet(2)
+
+    route_file = RouteFile.write(tmp_path / 'route.bin', ROUTE)
+
+    answer = fleet.exchange(1, Telecom(command=Command.LOADING, payload=route_file))
+
+    assert answer.command == Command.LOADED_OK
+    assert fleet.routes[1].energy == fleet.compile_route(ROUTE).energy
+    assert not np.shares_memory(fleet.routes[1].positions.xy, route_file.open())
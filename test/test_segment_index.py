@@ -0,0 +1,85 @@
+import itertools
+import random
+
+import numpy as np
+
+from ex02.geometry import Point, Line
+from ex02.motion import Translation
+from ex02.spatial import SegmentIndex, segments_intersect
+
+#  square path, closed, with a diagonal crossing it
+SQUARE = [Translation(Point(0, 0), Point(4, 0)),
+          Translation(Point(4, 0), Point(4, 4)),
+          Translation(Point(4, 4), Point(0, 4)),
+          Translation(Point(0, 4), Point(0, 0)),
+          Translation(Point(0, 0), Point(5, 5))]
+
+
+def brute_force_intersections(index):
+    pairs = [(i, j) for i, j in itertools.combinations(range(len(index)), 2) if j != i + 1]
+    a, b = (list(column) for column in zip(*pairs))
+    hits = segments_intersect(index.xy[a], index.xy[b])
+    return [pair for pair, hit in zip(pairs, hits) if hit]
+
+
+def test_intersecting():
+    index = SegmentIndex(SQUARE)
+    assert index.intersecting(Translation(Point(2, -1), Point(2, 1))) == [0]
+    assert index.intersecting(Translation(Point(-1, 2), Point(5, 2))) == [1, 3, 4]
+    assert index.intersecting(Translation(Point(10, 10), Point(11, 11))) == []
+
+
+def test_intersecting_line():
+    index = SegmentIndex(SQUARE)
+    assert index.intersecting(Line(Point(2, 100), Point(0, 1))) == [0, 2, 4]
+    assert index.intersecting(Line(Point(100, 100), Point(0, 1))) == []
+
+
+def test_within():
+    index = SegmentIndex(SQUARE)
+    assert index.within(Point(2, 0.5), 0.5) == [0]
+    assert index.within(Point(2, 0.5), 1.5) == [0, 4]
+    assert index.within(Point(2, 2), 0.1) == [4]
+
+
+def test_self_intersections():
+    index = SegmentIndex(SQUARE)
+    assert index.self_intersections() == [(0, 3), (0, 4), (1, 4), (2, 4)]
+    assert index.self_intersections(path=False) == [(0, 1), (0, 3), (0, 4), (1, 2), (1, 4),
+                                                    (2, 3), (2, 4), (3, 4)]
+
+
+def test_self_intersections_as_brute_force():
+    random.seed(2)
+    points = [Point(random.uniform(0, 20), random.uniform(0, 20)) for _ in range(200)]
+    index = SegmentIndex([Translation(a, b) for a, b in zip(points, points[1:])], cell_size=1.5)
+    assert index.self_intersections() == brute_force_intersections(index)
+
+
+def test_intersecting_as_brute_force():
+    random.seed(3)
+    points = [Point(random.uniform(0, 20), random.uniform(0, 20)) for _ in range(100)]
+    index = SegmentIndex([Translation(a, b) for a, b in zip(points, points[1:])], cell_size=0.7)
+    for _ in range(50):
+        a, b = (Point(random.uniform(-10, 30), random.uniform(-10, 30)) for _ in range(2))
+        query = Translation(a, b)
+        expected = segments_intersect(index.xy, np.array([[a.x, a.y, b.x, b.y]]))
+        assert index.intersecting(query) == np.flatnonzero(expected).tolist()
+
+
+def test_segments_are_only_in_cells_they_cross():
+    index = SegmentIndex([Translation(Point(0, 0), Point(100, 100)), Translation(Point(0, 100), Point(100, 0))],
+                         cell_size=1.)
+
+    # a diagonal crosses about 100 cells, and the 2 other cells around each grid corner it goes through,
+    # out of the 101 x 101 cells of its bounding box
+    assert len(index.ids) <= 2 * 3 * 101
+    assert index.self_intersections(path=False) == [(0, 1)]
+    assert index.intersecting(Translation(Point(1.5, 0), Point(1.5, 100))) == [0, 1]
+    assert index.intersecting(Translation(Point(50.5, 49), Point(51, 48.5))) == []
+
+
+def test_empty_index():
+    index = SegmentIndex([])
+    assert index.self_intersections() == []
+    assert index.within(Point(0, 0), 1) == []
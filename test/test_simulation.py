@@ -0,0 +1,92 @@
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import Translation, Rotation
+from ex02.robot import MotionController, Wheel, EnergySupplier
+from ex02.simulation import SimulationClock
+
+
+class ClockedWheel(Wheel):
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.runs = []
+
+    def run(self, length):
+        self.runs.append((self.clock.now, length))
+
+
+class MacroWheel(ClockedWheel):
+    MACRO_STEP = True
+
+    def run_steps(self, length, steps):
+        self.runs.append((self.clock.now, length))
+
+
+MOTIONS = [Translation(Point(0, 0), Point(1, 0)),
+           Rotation(Point(1, 0), Point(1, 0), Point(1, 0), Point(0, 1)),
+           Translation(Point(1, 0), Point(1, 2))]
+
+
+def test_events_in_time_then_scheduling_order():
+    clock = SimulationClock()
+    done = []
+    clock.schedule_at(2., done.append, 'c')
+    clock.schedule_at(1., done.append, 'a')
+    clock.schedule_at(1., done.append, 'b')
+    clock.schedule_at(3., done.append, 'd')
+
+    clock.run(until=2.5)
+
+    assert done == ['a', 'b', 'c']
+    assert clock.now == 2.5
+    assert len(clock) == 1
+    with pytest.raises(ValueError):
+        clock.schedule_at(2., done.append, 'e')
+
+
+def test_paced_clock_sleeps_until_event_wall_time():
+    wall = [100.]
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        wall[0] += delay
+
+    clock = SimulationClock(pace=10., timer=lambda: wall[0], sleep=sleep)
+    clock.schedule_at(5., lambda: None)
+    clock.schedule_at(20., lambda: None)
+    clock.run()
+
+    assert sleeps == [pytest.approx(0.5), pytest.approx(1.5)]
+    assert clock.now == 20.
+
+
+@pytest.mark.parametrize("macro_step", [False, True])
+def test_motions_are_traced_on_clock(macro_step):
+    clock = SimulationClock()
+    right, left = MacroWheel(clock), ClockedWheel(clock)
+    supplier = EnergySupplier(100.)
+    controller = MotionController(right, left, {'macro_step': macro_step, 'speed': 1., 'time_step': 0.1})
+    controller.use_clock(clock)
+
+    for motion in MOTIONS:
+        controller.move(motion, supplier)
+
+    trace = controller.trace
+    assert [r.motion for r in trace] == MOTIONS
+    assert trace[0].start == 0.
+    assert all(a.end == b.start for a, b in zip(trace, trace[1:]))
+    assert all(r.end - r.start == pytest.approx(r.plan.steps * 0.1) for r in trace)
+    assert clock.now == trace[-1].end
+    assert supplier.quantity == pytest.approx(100. - sum(r.get_required_energy() for r in trace))
+
+    assert sum(length for _, length in left.runs) == pytest.approx(sum(r.plan.steps * r.plan.left_len_step
+                                                                       for r in trace))
+    assert sum(length for _, length in right.runs) == pytest.approx(sum(r.plan.steps * r.plan.right_len_step
+                                                                        for r in trace))
+    assert len(left.runs) == sum(r.plan.steps for r in trace)
+    assert len(right.runs) == (len(trace) if macro_step else len(left.runs))
+    times = [at for at, _ in left.runs]
+    assert times == sorted(times)
+    assert times[:2] == [0., pytest.approx(0.1)]
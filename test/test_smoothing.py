@@ -0,0 +1,102 @@
+import math
+
+import pytest
+
+from ex02.geometry import Arc, Point
+from ex02.motion import Translation, Rotation
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.smoothing import PathSmoother, SmoothNavigator
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+
+
+def kinds(motions):
+    return ['T' if isinstance(m, Translation) else 'S' if m.is_on_the_spot() else 'A' for m in motions]
+
+
+def test_corners_are_rounded_by_tangent_arcs():
+    motions = PathSmoother(1.).compute_motions(SQUARE)
+
+    assert kinds(motions) == ['T', 'A', 'T', 'A', 'T', 'A', 'T']
+    assert [m.get_length() for m in motions[::2]] == pytest.approx([9, 8, 8, 9])
+    for translation, rotation in zip(motions[::2], motions[1::2]):
+        assert rotation.arc.start == translation.end
+        assert rotation.arc.start_tangent == translation.vector
+    for rotation, translation in zip(motions[1::2], motions[2::2]):
+        assert rotation.arc.end == translation.start
+        assert rotation.arc.end_tangent == translation.vector
+
+
+@pytest.mark.parametrize("positions", [SQUARE, SQUARE[::-1], [(0, 0), (3, 1), (5, -4), (9, -1)]])
+def test_arcs_have_the_attributes_arc_computes(positions):
+    for motion in PathSmoother(0.5).compute_motions(positions):
+        if isinstance(motion, Rotation):
+            arc = motion.arc
+            expected = Arc(arc.start, arc.end, arc.start_tangent, arc.end_tangent)
+            assert arc.center == expected.center
+            assert math.isclose(arc.radius, expected.radius)
+            assert arc.direction == expected.direction
+            turn = math.acos(arc.start_tangent.scalar_product(arc.end_tangent))
+            if arc.direction == Arc.DIRECT:
+                assert math.isclose(arc.angle, expected.angle)
+            else:
+                # the fillet itself, not the rest of the circle Arc gives
+                assert math.isclose(expected.angle, turn - 2 * math.pi)
+            assert math.isclose(arc.angle, turn if arc.direction == Arc.DIRECT else -turn)
+            assert math.isclose(arc.length, math.fabs(arc.angle * arc.radius))
+
+
+def test_distance_is_along_the_fillets():
+    navigator = SmoothNavigator(1.)
+    motions = navigator.compute_motions(SQUARE)
+
+    assert navigator.compute_total_distance(motions) == pytest.approx(34 + 3 * math.pi / 2)
+
+
+def test_corners_without_room_rotate_on_the_spot():
+    motions = PathSmoother(1.).compute_motions([(0, 0), (10, 0), (10, 1.5), (20, 1.5), (0, 1.5)])
+
+    assert kinds(motions) == ['T', 'S', 'T', 'S', 'T', 'S', 'T']
+    assert [m.get_length() for m in motions] == [m.get_length() for m in
+                                                 Navigator(Arranger()).compute_motions(
+                                                     [(0, 0), (10, 0), (10, 1.5), (20, 1.5), (0, 1.5)])]
+
+
+def test_translations_trimmed_to_nothing_are_removed():
+    motions = PathSmoother(1.).compute_motions([(0, 0), (10, 0), (10, 2), (20, 2)])
+
+    assert kinds(motions) == ['T', 'A', 'A', 'T']
+
+
+def test_straight_lines_and_repeated_points_are_kept_as_translations():
+    motions = PathSmoother(1.).compute_motions([(0, 0), (5, 0), (5, 0), (10, 0)])
+
+    assert kinds(motions) == ['T', 'T']
+
+
+def test_min_radius_is_positive():
+    with pytest.raises(ValueError):
+        PathSmoother(0.)
+
+
+@pytest.mark.parametrize("positions", [SQUARE, SQUARE[::-1]])
+def test_smooth_path_is_faster_to_run(positions):
+    controller = MotionController(Wheel(), Wheel(), {'wheel_axis_length': 1., 'time_step': 0.01})
+
+    def duration(motions):
+        return sum(controller.get_step_plan(m).steps for m in motions)
+
+    smooth = duration(PathSmoother(1.).compute_motions(positions))
+    sharp = duration(Navigator(Arranger()).compute_motions(positions))
+
+    assert smooth < sharp
+
+
+def test_robot_runs_smooth_path():
+    robot = Robot(Transmitter(), MotionController(Wheel(), Wheel(), {}), SmoothNavigator(1.), EnergySupplier(1000.))
+
+    robot.load_positions(SQUARE)
+    robot.run()
+
+    assert kinds(robot.motions) == ['T', 'A', 'T', 'A', 'T', 'A', 'T']
+    assert robot.energy_supplier.quantity < 1000.
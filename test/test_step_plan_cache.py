@@ -0,0 +1,97 @@
+import math
+
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import Translation, Rotation
+from ex02.planning import StepPlan, StepPlanCache
+from ex02.robot import MotionController, Wheel
+
+
+def plan(steps):
+    return StepPlan(steps, 0.1, 0.1, 0.2)
+
+
+def test_lru_eviction():
+    cache = StepPlanCache(max_size=2)
+    cache.put('a', plan(1))
+    cache.put('b', plan(2))
+    cache.get('a')
+    cache.put('c', plan(3))
+
+    assert cache.get('b') is None
+    assert cache.get('a').steps == 1
+    assert cache.get('c').steps == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_disabled_cache():
+    cache = StepPlanCache(max_size=0)
+    cache.put('a', plan(1))
+    assert len(cache) == 0
+
+
+def test_cleared_on_configuration_change():
+    cache = StepPlanCache(max_size=2)
+    cache.use_configuration((0.1, 0.1))
+    cache.put('a', plan(1))
+    cache.use_configuration((0.1, 0.1))
+    assert len(cache) == 1
+    cache.use_configuration((0.2, 0.1))
+    assert len(cache) == 0
+
+
+class TestMotionControllerStepPlans:
+
+    @pytest.fixture()
+    def ctrl(self):
+        return MotionController(Wheel(), Wheel(), {})
+
+    def test_same_geometry_hits_cache(self, ctrl):
+        first = ctrl.get_step_plan(Translation(Point(0, 0), Point(10, 0)))
+        second = ctrl.get_step_plan(Translation(Point(5, 5), Point(5, 15)))
+
+        assert second is first
+        assert first.steps == 1000
+        assert math.isclose(first.right_len_step, 0.01)
+        assert (ctrl.step_plans.hits, ctrl.step_plans.misses) == (1, 1)
+
+    def test_rotation_plan(self, ctrl):
+        rot = Rotation(start=Point(10, 0), end=Point(0, 10), start_vector=Point(0, 1), end_vector=Point(-1, 0))
+
+        step_plan = ctrl.get_step_plan(rot)
+
+        assert step_plan.steps == 1649
+        assert step_plan.left_len_step / step_plan.right_len_step == pytest.approx(9.5 / 10.5)
+
+    def test_motion_shorter_than_a_time_step_runs_in_one_step(self, ctrl):
+        translation = Translation(Point(0, 0), Point(0.005, 0))
+
+        step_plan = ctrl.get_step_plan(translation)
+
+        assert step_plan.steps == 1
+        assert math.isclose(step_plan.right_len_step, 0.005)
+        assert math.isclose(step_plan.get_required_energy(), ctrl.get_required_energy_for_motion(translation))
+
+    def test_configuration_change_invalidates_plans(self, ctrl):
+        translation = Translation(Point(0, 0), Point(10, 0))
+        ctrl.get_step_plan(translation)
+
+        ctrl.configuration['speed'] = 0.2
+        step_plan = ctrl.get_step_plan(translation)
+
+        assert ctrl.speed == 0.2
+        assert step_plan.steps == 500
+        assert ctrl.step_plans.misses == 2
+        assert len(ctrl.step_plans) == 1
+
+    def test_energy_estimates_follow_configuration_changes(self, ctrl):
+        rot = Rotation(start=Point(10, 0), end=Point(0, 10), start_vector=Point(0, 1), end_vector=Point(-1, 0))
+        assert ctrl.get_required_energy_for(10.) == 10.
+        rotation_energy = ctrl.get_required_energy_for_rotation(1.)
+
+        ctrl.configuration['consumption_per_length_unit'] = 2
+
+        assert ctrl.get_required_energy_for(10.) == 20.
+        assert ctrl.get_required_energy_for_rotation(1.) == 2 * rotation_energy
+        assert ctrl.get_required_energy_for_motion(rot) == pytest.approx(ctrl.get_step_plan(rot).get_required_energy())
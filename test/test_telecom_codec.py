@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from ex02.geometry import Point, PointArray
+from ex02.telecom import Telecom, TelecomCodec, Command
+
+POSITIONS = [(0, 0), (1.5, 2), (-3, 4.25)]
+
+
+@pytest.mark.parametrize("command", list(Command))
+def test_every_command(command):
+    candidate = TelecomCodec.decode(TelecomCodec.encode(Telecom(command=command)))
+    assert candidate.command == command
+    assert candidate.payload is None
+    assert candidate.errors is None
+
+
+def test_header_is_compact():
+    assert len(TelecomCodec.encode(Telecom(command=Command.MOVE))) == 10
+
+
+@pytest.mark.parametrize("payload_type", [TelecomCodec.FLOAT32, TelecomCodec.FLOAT64])
+def test_positions(payload_type):
+    data = TelecomCodec.encode(Telecom(command=Command.LOADING, payload=POSITIONS), payload_type)
+
+    candidate = TelecomCodec.decode(data)
+
+    assert candidate.payload.tolist() == [list(xy) for xy in POSITIONS]
+    assert len(data) == 10 + len(POSITIONS) * 2 * (4 if payload_type == TelecomCodec.FLOAT32 else 8)
+
+
+def test_points_as_payload():
+    points = [Point(*xy) for xy in POSITIONS]
+    for payload in (points, PointArray.from_points(points)):
+        candidate = TelecomCodec.decode(TelecomCodec.encode(Telecom(command=Command.LOADING, payload=payload)))
+        assert PointArray(candidate.payload).to_points() == points
+
+
+def test_decoded_positions_share_memory():
+    data = bytearray(TelecomCodec.encode(Telecom(command=Command.LOADING, payload=POSITIONS)))
+
+    positions = PointArray(TelecomCodec.decode(data).payload)
+    memoryview(data)[8:24] = np.array([7., 8.]).tobytes()
+
+    assert positions[0] == Point(7, 8)
+
+
+def test_float32_positions_are_copied_by_point_array():
+    data = TelecomCodec.encode(Telecom(command=Command.LOADING, payload=POSITIONS), TelecomCodec.FLOAT32)
+    payload = TelecomCodec.decode(data).payload
+
+    assert np.shares_memory(payload, np.frombuffer(data, dtype=np.uint8))
+    assert not np.shares_memory(PointArray(payload).xy, payload)
+
+
+def test_errors():
+    tc = Telecom(command=Command.LOADED_INVALID, errors=['no payload', 'énergie insuffisante'])
+
+    candidate = TelecomCodec.decode(TelecomCodec.encode(tc))
+
+    assert candidate.command == Command.LOADED_INVALID
+    assert candidate.errors == ['no payload', 'énergie insuffisante']
+
+
+def test_invalid_payload():
+    with pytest.raises(ValueError):
+        TelecomCodec.encode(Telecom(command=Command.LOADING, payload=['foo']))
+
+
+def test_invalid_data():
+    with pytest.raises(ValueError):
+        TelecomCodec.decode(b'{"command": "move"}')
+
+
+@pytest.mark.parametrize("tc", [Telecom(command=Command.LOADING, payload=POSITIONS),
+                                Telecom(command=Command.LOADED_INVALID, errors=['no payload'])])
+def test_truncated_or_oversized_data(tc):
+    data = TelecomCodec.encode(tc)
+    for size in range(len(data)):
+        with pytest.raises(ValueError):
+            TelecomCodec.decode(data[:size])
+    with pytest.raises(ValueError):
+        TelecomCodec.decode(data + b'\x00')
+
+
+def test_unknown_payload_type():
+    data = bytearray(TelecomCodec.encode(Telecom(command=Command.LOADING, payload=POSITIONS)))
+    data[3] = 9
+    with pytest.raises(ValueError):
+        TelecomCodec.decode(data)
@@ -85,6 +85,17 @@ class TestTransmitter:
         # then
         assert tm.command == Command.INVALID
 
+    def test_send_tc_move_when_moving(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        # when
+        robot.is_moving.return_value = True
+        tc = Telecom(command=Command.MOVE)
+        tm = tr.exchange(tc)
+        # then
+        assert tm.command == Command.MOVING
+        robot.run.assert_not_called()
+
     def test_send_tc_move(self, init_transmitter):
         # given
         robot, tr = init_transmitter
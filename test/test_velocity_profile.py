@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.planning import StepPlan, ProfilePlan, trapezoidal_profile
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+from ex02.simulation import SimulationClock
+from ex02.smoothing import PathSmoother
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+CONFIGURATION = {'speed': 1., 'time_step': 0.01, 'max_acceleration': 0.5, 'wheel_axis_length': 1.}
+
+
+class RecordingWheel(Wheel):
+
+    def __init__(self):
+        self.lengths = []
+
+    def run(self, length: float):
+        self.lengths.append(length)
+
+
+@pytest.mark.parametrize("length, start, end", [(10., 0., 0.), (0.5, 0., 0.), (4., 0.8, 0.2), (1., 1., 1.)])
+def test_trapezoidal_profile_respects_limits(length, start, end):
+    steps = trapezoidal_profile(length, start, end, 1., 0.5, 0.01)
+    speeds = steps / 0.01
+
+    assert steps.sum() == pytest.approx(length)
+    assert (speeds[:-1] <= 1. + 1e-9).all()
+    assert (np.fabs(np.diff(speeds[:-1])) <= 0.5 * 0.01 + 1e-9).all()
+    assert speeds[0] == pytest.approx(start + 0.5 * 0.01 / 2 if start < 1. else start)
+
+
+def test_trapezoidal_profile_cruises_at_max_speed():
+    speeds = trapezoidal_profile(10., 0., 0., 1., 0.5, 0.01) / 0.01
+
+    assert speeds.max() == pytest.approx(1.)
+    assert len(speeds) == 1200
+
+
+@pytest.mark.parametrize("max_speed, acceleration, time_step", [(0., 0.5, 0.01), (1., 0., 0.01), (1., -0.5, 0.01),
+                                                               (1., 0.5, 0.)])
+def test_trapezoidal_profile_rejects_non_positive_limits(max_speed, acceleration, time_step):
+    with pytest.raises(ValueError):
+        trapezoidal_profile(10., 0., 0., max_speed, acceleration, time_step)
+
+
+def test_no_profile_without_acceleration():
+    controller = MotionController(Wheel(), Wheel(), {})
+    motions = Navigator(Arranger()).compute_motions(SQUARE)
+
+    assert controller.plan_route(motions) is None
+    assert isinstance(controller.get_step_plan(motions[0]), StepPlan)
+
+
+def test_profiles_consume_as_step_plans():
+    controller = MotionController(Wheel(), Wheel(), dict(CONFIGURATION))
+    motions = Navigator(Arranger()).compute_motions(SQUARE)
+    expected = [controller.get_step_plan(m).get_required_energy() for m in motions]
+
+    profile = controller.plan_route(motions)
+
+    assert all(isinstance(controller.get_step_plan(m), ProfilePlan) for m in motions)
+    assert [plan.get_required_energy() for plan in profile.plans] == pytest.approx(expected)
+
+
+def test_robot_stops_for_rotations_on_the_spot():
+    controller = MotionController(Wheel(), Wheel(), dict(CONFIGURATION))
+    motions = Navigator(Arranger()).compute_motions(SQUARE)
+
+    profile = controller.plan_route(motions)
+
+    # 10 long translations: 2s accelerating, 8s cruising, 2s decelerating
+    assert profile.plans[0].steps == 1200
+    assert profile.plans[0].right_len_steps[[0, -1]] == pytest.approx([0.5 * 0.01 ** 2 / 2] * 2)
+    assert profile.duration == pytest.approx(sum(plan.steps for plan in profile.plans) * 0.01)
+
+
+def test_robot_keeps_moving_through_arcs_and_straight_lines():
+    controller = MotionController(Wheel(), Wheel(), dict(CONFIGURATION, max_lateral_acceleration=0.2))
+    motions = PathSmoother(1.).compute_motions(SQUARE) + [Translation(Point(0, 1), Point(0, 0))]
+    motions[-2] = Translation(Point(0, 9), Point(0, 1))
+
+    controller.plan_route(motions)
+    first, arc, last = (controller.get_step_plan(m) for m in (motions[0], motions[1], motions[-1]))
+
+    # entering the arc at the speed allowed by lateral acceleration
+    assert first.right_len_steps[-2] / 0.01 == pytest.approx(math.sqrt(0.2), abs=0.01)
+    assert arc.right_len_steps[0] > arc.left_len_steps[0] > 0
+    assert last.right_len_steps[0] / 0.01 > 0.9
+
+
+def test_profiles_are_forgotten_when_configuration_changes():
+    configuration = dict(CONFIGURATION)
+    controller = MotionController(Wheel(), Wheel(), configuration)
+    motions = Navigator(Arranger()).compute_motions(SQUARE)
+    controller.plan_route(motions)
+
+    configuration['speed'] = 2.
+
+    assert isinstance(controller.get_step_plan(motions[0]), StepPlan)
+
+
+@pytest.mark.parametrize("macro_step", [False, True])
+def test_robot_runs_profiles(macro_step):
+    right, left = RecordingWheel(), RecordingWheel()
+    controller = MotionController(right, left, dict(CONFIGURATION, macro_step=macro_step))
+    robot = Robot(Transmitter(), controller, Navigator(Arranger()), EnergySupplier(1000.))
+
+    robot.load_positions(SQUARE)
+    robot.run()
+
+    assert robot.route_profile.duration == pytest.approx(sum(p.steps for p in robot.route_profile.plans) * 0.01)
+    assert robot.energy_supplier.quantity == pytest.approx(1000. - robot.route_profile.get_required_energy())
+    expected = np.concatenate([plan.right_len_steps for plan in robot.route_profile.plans])
+    assert sum(right.lengths) == pytest.approx(expected.sum())
+    if not macro_step:
+        assert right.lengths == expected.tolist()
+
+
+def test_profiles_run_on_simulation_clock():
+    right, left = RecordingWheel(), RecordingWheel()
+    controller = MotionController(right, left, dict(CONFIGURATION))
+    controller.use_clock(SimulationClock())
+    robot = Robot(Transmitter(), controller, Navigator(Arranger()), EnergySupplier(1000.))
+
+    robot.load_positions(SQUARE)
+    robot.run()
+
+    assert controller.clock.now == pytest.approx(robot.route_profile.duration)
+    assert left.lengths == np.concatenate([plan.left_len_steps for plan in robot.route_profile.plans]).tolist()
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from ex02.drivers import FakeWheelDriver, WheelBuffer
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, Arranger, EnergySupplier, Wheel
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+
+
+class RecordingWheel(Wheel):
+
+    def __init__(self):
+        self.lengths = []
+
+    def run(self, length: float):
+        self.lengths.append(length)
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+def test_rows_are_flushed_when_buffer_is_full():
+    driver = FakeWheelDriver()
+    buffer = WheelBuffer(driver, capacity=4)
+
+    for i in range(10):
+        buffer.right.run(i)
+        buffer.left.run(-i)
+
+    assert [len(flush) for flush in driver.flushes] == [4, 4]
+    assert len(buffer) == 2
+    buffer.close()
+    assert driver.commands().tolist() == [[i, -i] for i in range(10)]
+
+
+def test_rows_are_flushed_after_window():
+    driver = FakeWheelDriver()
+    timer = FakeTimer()
+    buffer = WheelBuffer(driver, capacity=100, window=0.5, timer=timer)
+
+    buffer.run(1., 1.)
+    timer.now = 0.4
+    buffer.run(2., 2.)
+    assert driver.flushes == []
+    timer.now = 0.5
+    buffer.run(3., 3.)
+
+    assert [len(flush) for flush in driver.flushes] == [3]
+
+
+def test_wheel_run_alone_leaves_other_wheel_still():
+    driver = FakeWheelDriver()
+    with WheelBuffer(driver) as buffer:
+        buffer.right.run(1.)
+        buffer.right.run(2.)
+        buffer.left.run(3.)
+        buffer.left.run(4.)
+
+    assert driver.commands().tolist() == [[1., 0.], [2., 3.], [0., 4.]]
+
+
+def test_fill_and_extend_split_rows_by_capacity():
+    driver = FakeWheelDriver()
+    buffer = WheelBuffer(driver, capacity=4)
+
+    buffer.right.run(9.)
+    buffer.fill(5, 1., 2.)
+    buffer.extend(np.arange(3.), -np.arange(3.))
+    buffer.flush()
+
+    assert [len(flush) for flush in driver.flushes] == [4, 4, 1]
+    assert driver.commands().tolist() == [[9., 0.]] + [[1., 2.]] * 5 + [[0., 0.], [1., -1.], [2., -2.]]
+
+
+@pytest.mark.parametrize("configuration", [{}, {'macro_step': True}, {'max_acceleration': 0.05}])
+def test_controller_writes_the_commands_wheels_would_run(configuration):
+    right, left = RecordingWheel(), RecordingWheel()
+    expected = Robot(Transmitter(), MotionController(right, left, dict(configuration)), Navigator(Arranger()),
+                     EnergySupplier(1000.))
+    expected.load_positions(SQUARE)
+    expected.run()
+
+    driver = FakeWheelDriver()
+    buffer = WheelBuffer(driver, capacity=256)
+    robot = Robot(Transmitter(), MotionController(buffer.right, buffer.left, dict(configuration)),
+                  Navigator(Arranger()), EnergySupplier(1000.))
+    robot.load_positions(SQUARE)
+    robot.run()
+
+    assert driver.commands() == pytest.approx(np.array([right.lengths, left.lengths]).T)
+    assert len(driver.flushes) == -(-len(right.lengths) // 256)
+    assert len(buffer) == 0
+    assert robot.energy_supplier.quantity == pytest.approx(expected.energy_supplier.quantity)
+
+
+@pytest.mark.parametrize("window, flushes", [(None, 1), (1000., 7)])
+def test_streaming_run_flushes_windowed_buffer_at_each_motion(window, flushes):
+    driver = FakeWheelDriver()
+    buffer = WheelBuffer(driver, capacity=100_000, window=window, timer=FakeTimer())
+    robot = Robot(Transmitter(), MotionController(buffer.right, buffer.left, {}), Navigator(Arranger()),
+                  EnergySupplier(1000.))
+
+    robot.run_positions(SQUARE)
+
+    assert len(driver.flushes) == flushes
+    assert len(buffer) == 0